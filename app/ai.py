@@ -0,0 +1,350 @@
+"""
+Módulo responsável pelo jogador controlado pelo computador.
+
+A fase é resumida em um grafo de navegação de cada elemento: os nós são os
+pontos em que o jogador fica parado sobre um bloco ou plataforma, e as arestas
+são movimentos curtos (andar até a próxima coluna, pular com ou sem direção e
+cair de uma borda) simulados com as mesmas regras de ``Player`` por meio do
+``PlayerBatch``. Movimentos que matam ou ferem o jogador ficam de fora, então o
+grafo já evita o tile perigoso para o elemento. Montar o grafo leva algum
+tempo, por isso ele é guardado em disco com o hash da fase como chave.
+
+O ``AIController`` calcula uma única vez, com Dijkstra a partir da porta, qual
+movimento tomar em cada nó. Durante o jogo basta seguir o movimento atual e,
+ao chegar a um nó, consultar a tabela, com custo constante por frame. As ações
+são as mesmas de um jogador humano (bits de ``Actions``).
+
+Uso pela linha de comando::
+
+    python -m app.ai level1 --element water
+"""
+
+
+import hashlib
+import heapq
+import numpy as np
+from os import makedirs, path
+from time import perf_counter
+from .config import Map, PlayerConfig, Actions, AIConfig
+from .batch import PlayerBatch, STILL, ELEMENT_CODES
+from .level import Level, load_level
+
+
+# Movimentos entre nós: (direção, se pula, frames subindo reto antes de seguir na direção)
+MACROS = ((Actions.LEFT, False, 0), (Actions.RIGHT, False, 0), (Actions.NONE, True, 0)) + tuple(
+    (direction, True, delay) for direction in (Actions.LEFT, Actions.RIGHT) for delay in AIConfig.JUMP_DELAYS)
+
+# Muda quando o formato do grafo ou a forma de montá-lo mudam, invalidando o cache
+GRAPH_VERSION = 1
+
+
+def macro_action(macro: int, frame: int) -> int:
+    """
+    Ação do movimento ``macro`` no frame ``frame`` (contado a partir de 0).
+    """
+    direction, jump, delay = MACROS[macro]
+    action = direction if frame >= delay else Actions.NONE
+    if jump and frame == 0:
+        action |= Actions.JUMP
+    return action
+
+
+class NavGraph:
+    """
+    Grafo de navegação de um elemento em uma fase.
+
+    Atributes:
+    ----------
+    element : str
+        Elemento do jogador ('fire' ou 'water').
+    tile_size : int
+        Tamanho, em pixels, de cada célula.
+    nodes : numpy.ndarray
+        Matriz (N, 3) com x, y e ``highest_y`` do jogador parado em cada nó.
+    edges : numpy.ndarray
+        Matriz (M, 4) com nó de origem, nó de destino, movimento e duração em frames de cada aresta.
+    """
+
+    def __init__(self, element: str, tile_size: int, nodes: np.ndarray, edges: np.ndarray):
+        self.element = element
+        self.tile_size = tile_size
+        self.nodes = nodes
+        self.edges = edges
+        self.index = {tuple(node): number for number, node in enumerate(nodes.tolist())}
+
+        # Nós por posição (ignorando highest_y) e posições x de cada altura, para se recuperar fora do grafo
+        self.by_position = {}
+        rows = {}
+        for number, (x, y, _) in enumerate(nodes.tolist()):
+            self.by_position.setdefault((x, y), number)
+            rows.setdefault(y, set()).add(x)
+        self.rows = {y: np.array(sorted(xs)) for y, xs in rows.items()}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def find(self, x: int, y: int, highest_y: int):
+        """
+        Nó do jogador parado nessa posição, ou None se ela não estiver no grafo.
+        """
+        node = self.index.get((x, y, highest_y))
+        return self.by_position.get((x, y)) if node is None else node
+
+    def goals(self, door: tuple) -> list:
+        """
+        Nós em que o jogador está na porta (mesmo teste de vitória de ``Simulation``).
+        """
+        distance = np.hypot(self.nodes[:, 0] - door[0], self.nodes[:, 1] - door[1])
+        return np.flatnonzero(distance < 5).tolist()
+
+    def save(self, filename: str):
+        np.savez_compressed(filename, element=self.element, tile_size=self.tile_size, nodes=self.nodes, edges=self.edges)
+
+    @classmethod
+    def load(cls, filename: str):
+        data = np.load(filename)
+        return cls(str(data['element']), int(data['tile_size']), data['nodes'], data['edges'])
+
+
+def build_graph(level: Level, element: str) -> NavGraph:
+    """
+    Monta o grafo de navegação de um elemento a partir do ponto de início.
+
+    A cada rodada, todos os movimentos de todos os nós novos são simulados
+    juntos em um ``PlayerBatch``. Um movimento termina quando o jogador fica
+    parado alinhado a uma coluna (ou encostado em uma parede) e é descartado se
+    o jogador morrer, perder vida ou não parar em ``AIConfig.MACRO_FRAMES`` frames.
+    """
+    tile_size = level.tile_size
+    spawn = level.fireboy_spawn if element == 'fire' else level.watergirl_spawn
+    start = PlayerBatch(level.tiles, [element], [spawn[0]], [spawn[1]], tile_size)
+    nodes = [(int(start.x[0]), int(start.y[0]), int(start.highest_y[0]))]
+    index = {nodes[0]: 0}
+    edges = []
+
+    frontier = [0]
+    directions = np.array([macro[0] for macro in MACROS], dtype=np.int8)
+    jumps = np.array([macro[1] for macro in MACROS])
+    delays = np.array([macro[2] for macro in MACROS])
+    while frontier:
+        sources = np.repeat(frontier, len(MACROS))
+        macros = np.tile(np.arange(len(MACROS)), len(frontier))
+        states = np.array([nodes[source] for source in frontier], dtype=np.int32).repeat(len(MACROS), axis=0)
+
+        batch = PlayerBatch(level.tiles, np.full(len(sources), ELEMENT_CODES[element]), 0, 0, tile_size)
+        batch.x[:], batch.y[:], batch.highest_y[:] = states[:, 0], states[:, 1], states[:, 2]
+        health = batch.health.copy()
+        finished = np.zeros(len(sources), dtype=np.int32)
+        valid = np.ones(len(sources), dtype=bool)
+        ends = np.zeros((len(sources), 3), dtype=np.int32)
+
+        for frame in range(AIConfig.MACRO_FRAMES):
+            actions = np.where(frame >= delays[macros], directions[macros], Actions.NONE)
+            if frame == 0:
+                actions = actions | np.where(jumps[macros], Actions.JUMP, Actions.NONE)
+            previous_x = batch.x.copy()
+            batch.step(actions)
+
+            valid &= batch.life & (batch.health == health)
+            done = (finished == 0) & valid & (batch.state == STILL) & (
+                (batch.x % tile_size == 0) | (batch.x == previous_x))
+            finished[done] = frame + 1
+            ends[done] = np.stack([batch.x[done], batch.y[done], batch.highest_y[done]], axis=1)
+            if not ((finished == 0) & valid).any():
+                break
+
+        frontier = []
+        for source, macro, cost, end in zip(sources.tolist(), macros.tolist(), finished.tolist(), ends.tolist()):
+            if not cost:
+                continue
+            end = tuple(end)
+            target = index.get(end)
+            if target is None:
+                target = index[end] = len(nodes)
+                nodes.append(end)
+                frontier.append(target)
+            if target != source:
+                edges.append((source, target, macro, cost))
+
+    return NavGraph(element, tile_size, np.array(nodes, dtype=np.int32).reshape(-1, 3),
+                    np.array(edges, dtype=np.int32).reshape(-1, 4))
+
+
+def graph_path(level: Level, element: str, cache_dir: str = AIConfig.CACHE_DIR) -> str:
+    """
+    Arquivo do cache do grafo, com o hash da fase, do elemento e da física do jogador no nome.
+    """
+    physics = (GRAPH_VERSION, MACROS, AIConfig.MACRO_FRAMES, Map.GRAVITY, PlayerConfig.SPEED_X,
+               PlayerConfig.JUMP_SIZE, PlayerConfig.TERMINAL_VELOCITY, PlayerConfig.PLAYER_WIDTH,
+               PlayerConfig.PLAYER_HEIGHT)
+    key = hashlib.sha1(f'{level.digest()}{element}{physics}'.encode()).hexdigest()
+    return path.join(path.dirname(__file__), '..', cache_dir, f'{element}_{key[:20]}.npz')
+
+
+def load_graph(level: Level, element: str, cache_dir: str = AIConfig.CACHE_DIR) -> NavGraph:
+    """
+    Lê o grafo do cache em disco, montando e guardando se ele ainda não existir.
+    """
+    filename = graph_path(level, element, cache_dir)
+    if path.exists(filename):
+        try:
+            return NavGraph.load(filename)
+        except (OSError, ValueError, KeyError):
+            pass
+    graph = build_graph(level, element)
+    makedirs(path.dirname(filename), exist_ok=True)
+    graph.save(filename)
+    return graph
+
+
+class AIController:
+    """
+    Decide as ações de um jogador seguindo o grafo de navegação até a porta.
+
+    Atributes:
+    ----------
+    graph : NavGraph
+        Grafo do elemento do jogador.
+    cost : numpy.ndarray
+        Frames que faltam de cada nó até a porta (infinito se ela não for alcançável).
+    next_edge : numpy.ndarray
+        Aresta a seguir em cada nó (-1 na porta ou se ela não for alcançável).
+    """
+
+    def __init__(self, graph: NavGraph, door: tuple):
+        """
+        Parameters
+        ----------
+        graph : NavGraph
+            Grafo do elemento do jogador.
+        door : tuple
+            Retângulo (x, y, largura, altura) da porta do jogador.
+        """
+        self.graph = graph
+        self.plan(door)
+        self.reset()
+
+    def plan(self, door: tuple):
+        """
+        Calcula, com Dijkstra a partir da porta pelas arestas invertidas, o melhor movimento de cada nó.
+        """
+        count = len(self.graph)
+        self.cost = np.full(count, np.inf)
+        self.next_edge = np.full(count, -1, dtype=np.int64)
+        incoming = [[] for _ in range(count)]
+        for number, (source, target, _, frames) in enumerate(self.graph.edges.tolist()):
+            incoming[target].append((source, frames, number))
+
+        queue = []
+        for goal in self.graph.goals(door):
+            self.cost[goal] = 0
+            queue.append((0, goal))
+        heapq.heapify(queue)
+        while queue:
+            cost, node = heapq.heappop(queue)
+            if cost > self.cost[node]:
+                continue
+            for source, frames, number in incoming[node]:
+                if cost + frames < self.cost[source]:
+                    self.cost[source] = cost + frames
+                    self.next_edge[source] = number
+                    heapq.heappush(queue, (cost + frames, source))
+        self._next = self.next_edge.tolist()
+        self._macros = self.graph.edges[:, 2].tolist()
+
+    def reset(self):
+        """
+        Esquece o movimento em andamento, por exemplo ao recomeçar a fase.
+        """
+        self._macro = None
+        self._frame = 0
+        self._previous_x = None
+
+    def act(self, player) -> int:
+        """
+        Ações do jogador neste frame, a partir do seu estado atual.
+        """
+        if not player.life:
+            return Actions.NONE
+        x, y = player.rect.x, player.rect.y
+        still = player.state == PlayerConfig.STILL
+
+        # O movimento atual termina quando o jogador para alinhado a uma coluna ou encostado em uma parede
+        if self._macro is not None:
+            arrived = still and self._frame and (x % self.graph.tile_size == 0 or x == self._previous_x)
+            if arrived or self._frame >= AIConfig.MACRO_FRAMES:
+                self._macro = None
+
+        if self._macro is None:
+            if not still:
+                return Actions.NONE
+            node = self.graph.find(x, y, player.highest_y)
+            if node is None:
+                return self.__recover(x, y)
+            edge = self._next[node]
+            if edge < 0:
+                return Actions.NONE
+            self._macro = self._macros[edge]
+            self._frame = 0
+
+        action = macro_action(self._macro, self._frame)
+        self._frame += 1
+        self._previous_x = x
+        return action
+
+    def __recover(self, x: int, y: int) -> int:
+        """
+        Fora do grafo, anda em direção ao nó mais próximo na mesma altura.
+        """
+        xs = self.graph.rows.get(y)
+        if xs is None:
+            return Actions.NONE
+        nearest = xs[np.abs(xs - x).argmin()]
+        return Actions.RIGHT if nearest > x else Actions.LEFT if nearest < x else Actions.NONE
+
+
+def controller_for(level: Level, element: str) -> AIController:
+    """
+    Controlador do jogador de um elemento, com o grafo lido do cache.
+    """
+    door = level.firedoor if element == 'fire' else level.waterdoor
+    return AIController(load_graph(level, element), door)
+
+
+if __name__ == '__main__':
+    import argparse
+    from .simulation import Simulation
+
+    parser = argparse.ArgumentParser(description='Monta o grafo de navegação e testa o jogador controlado pelo computador.')
+    parser.add_argument('level', nargs='?', help='nome da fase (padrão: a fase padrão)')
+    parser.add_argument('--element', choices=('fire', 'water'), default='water', help='elemento do jogador')
+    parser.add_argument('--frames', type=int, default=3600, help='limite de frames da partida de teste')
+    args = parser.parse_args()
+
+    level = load_level(args.level) if args.level else load_level()
+    start = perf_counter()
+    graph = build_graph(level, args.element)
+    built = perf_counter() - start
+    graph_file = graph_path(level, args.element)
+    makedirs(path.dirname(graph_file), exist_ok=True)
+    graph.save(graph_file)
+    start = perf_counter()
+    controller = controller_for(level, args.element)
+    loaded = perf_counter() - start
+    print(f'{len(graph)} nós, {len(graph.edges)} arestas; montagem {built * 1000:.1f} ms, '
+          f'cache + planejamento {loaded * 1000:.1f} ms')
+
+    simulation = Simulation(level)
+    player = simulation.watergirl if args.element == 'water' else simulation.fireboy
+    slot = simulation.players.index(player)
+    times = []
+    while simulation.running_phase and simulation.frame < args.frames:
+        start = perf_counter()
+        action = controller.act(player)
+        times.append(perf_counter() - start)
+        actions = [Actions.NONE] * len(simulation.players)
+        actions[slot] = action
+        simulation.step(actions)
+    times = np.array(times) * 1000
+    print(f'resultado: {simulation.result} em {simulation.frame} frames; decisão por frame: '
+          f'média {times.mean():.4f} ms, p99 {np.percentile(times, 99):.4f} ms, máximo {times.max():.4f} ms')
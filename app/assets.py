@@ -1,42 +1,324 @@
 '''
 Módulo responsável pelo gerenciamento dos recursos visuais do jogo.
+
+As imagens são carregadas sob demanda e guardadas em um cache único do processo
+(``asset_manager``), de forma que qualquer tela pode pedir um asset quantas vezes
+quiser sem decodificar o arquivo novamente. As versões escaladas (tiles e
+personagens no tamanho da célula) são criadas uma vez por par (chave, tamanho)
+dentro de um ``TextureAtlas`` e compartilhadas por todos os sprites.
+
+Com o cache de ``app.bake`` ligado, as versões escaladas vêm de pixels crus já
+prontos em disco (refeitos automaticamente quando a imagem original muda), sem
+decodificar nem escalar as imagens na inicialização, e são copiadas para as
+folhas do mesmo ``TextureAtlas``.
 '''
 
 
 import pygame
 from os import path
-from .config import Map, PlayerConfig, InitialScreenSettings, EndScreenSettings, ModeScreenSettings
+from threading import RLock
+from .config import Map, PlayerConfig, InitialScreenSettings, EndScreenSettings, ModeScreenSettings, AtlasConfig, BakeConfig
+from .bake import BakedCache, bake_targets
+
 
-    
 # Define o diretório que contém as imagens.
 img_dir = path.join('..', 'img')
 
+# Associa cada chave de asset ao arquivo de imagem e se ela possui transparência.
+ASSET_FILES = {
+    PlayerConfig.WATERGIRL_IMG: ('watergirlpenut.png', True),
+    PlayerConfig.FIREBOY_IMG: ('fireboypenut_resized.png', True),
+    Map.BLOCK: ('dirtblock.png', False),
+    Map.PLATF: ('tile-wood.png', False),
+    Map.LAVA: ('lavablock.png', False),
+    Map.WATER: ('waterblock.png', False),
+    InitialScreenSettings.BACKGROUND_IMG: ('startscream_resized.jpg', False),
+    EndScreenSettings.WIN_IMG: ('youwin_resized.jpg', False),
+    EndScreenSettings.GAMEOVER_IMG: ('gameover_resized.jpg', False),
+    ModeScreenSettings.BACKGROUND_IMG: ('mode_resized.jpg', False),
+}
+
+
+class TextureAtlas:
+    """
+    Folhas grandes onde imagens pequenas são empacotadas lado a lado, em prateleiras.
+
+    Cada imagem adicionada vira uma subsuperfície de uma folha, então muitas
+    imagens pequenas ocupam poucas superfícies grandes.
+
+    Atributes:
+    ----------
+    pages : list
+        As folhas criadas até agora.
+    alpha : bool
+        Indica se as folhas têm transparência.
+    """
+
+    def __init__(self, alpha: bool = False, page_size: int = AtlasConfig.PAGE_SIZE):
+        """
+        Parameters
+        ----------
+        alpha : bool
+            Se as imagens empacotadas possuem transparência.
+        page_size : int
+            Lado de cada folha, em pixels.
+        """
+        self.alpha = alpha
+        self.page_size = page_size
+        self.pages = []
+        self._x = self._y = self._shelf_height = 0
+
+    def __new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA if self.alpha else 0)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha() if self.alpha else page.convert()
+        self.pages.append(page)
+        self._x = self._y = self._shelf_height = 0
+
+    def add(self, image: pygame.Surface, size: tuple) -> pygame.Surface:
+        """
+        Escala a imagem diretamente para um espaço livre de uma folha (ou só a
+        copia, se ela já estiver no tamanho pedido).
+
+        Parameters
+        ----------
+        image : pygame.Surface
+            A imagem original, no mesmo formato das folhas.
+        size : tuple
+            Largura e altura desejadas.
+
+        Returns
+        -------
+        pygame.Surface
+            Subsuperfície da folha com a imagem escalada. Imagens maiores que
+            uma folha são devolvidas como superfícies próprias.
+        """
+        width, height = size
+        if width > self.page_size or height > self.page_size:
+            return image if image.get_size() == (width, height) else pygame.transform.scale(image, size)
+
+        # Prateleira cheia: começa outra logo abaixo; folha cheia: começa outra folha
+        if self._x + width > self.page_size:
+            self._x, self._y, self._shelf_height = 0, self._y + self._shelf_height, 0
+        if not self.pages or self._y + height > self.page_size:
+            self.__new_page()
+
+        region = self.pages[-1].subsurface((self._x, self._y, width, height))
+        pygame.transform.scale(image, size, region)
+        self._x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return region
+
+
+class AssetManager:
+    """
+    Cache de assets indexado por chave.
+
+    Cada imagem só é decodificada na primeira vez em que é pedida; os pedidos
+    seguintes devolvem a mesma superfície. O cache vive até que as entradas
+    sejam descartadas explicitamente com ``evict`` ou ``clear``.
+
+    Pode ser usado de mais de uma thread (o ``SceneManager`` prepara a próxima
+    cena em segundo plano): as entradas já carregadas são lidas sem espera, e
+    carregar, escalar ou descartar entradas acontece sob uma trava única.
+
+    Atributes:
+    ----------
+    hits : int
+        Quantidade de pedidos atendidos pelo cache.
+    misses : int
+        Quantidade de pedidos que precisaram carregar a imagem do disco.
+    """
+
+    def __init__(self, img_dir: str = img_dir, files: dict = ASSET_FILES, cache_dir: str = BakeConfig.CACHE_DIR):
+        """
+        Inicializa o gerenciador sem carregar nenhuma imagem.
+
+        Parameters
+        ----------
+        img_dir : str
+            O caminho, relativo a este módulo, do diretório que contém as imagens.
+        files : dict
+            Dicionário que associa cada chave ao par (nome do arquivo, possui transparência).
+        cache_dir : str
+            Diretório das imagens pré-processadas (ver ``app.bake``), ou None para
+            decodificar e escalar as imagens originais.
+        """
+        self._img_dir = img_dir
+        self._files = dict(files)
+        self._cache_dir = cache_dir
+        self._baked = BakedCache(cache_dir) if cache_dir else None
+        self._cache = {}
+        self._scaled = {}
+        self._atlases = {False: TextureAtlas(False), True: TextureAtlas(True)}
+        self.hits = 0
+        self.misses = 0
+        self._lock = RLock()
 
-def load_assets(img_dir: str) -> dict:
+    def get(self, key) -> pygame.Surface:
+        """
+        Devolve o asset associado à chave, carregando-o apenas se necessário.
+
+        Parameters
+        ----------
+        key : str or int
+            Chave do asset (por exemplo ``Map.BLOCK`` ou ``PlayerConfig.FIREBOY_IMG``).
+
+        Returns
+        -------
+        pygame.Surface
+            A imagem convertida para o formato da tela.
+        """
+        surface = self._cache.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        with self._lock:
+            # Outra thread pode ter carregado a chave enquanto esta esperava a trava
+            surface = self._cache.get(key)
+            if surface is None:
+                self.misses += 1
+                surface = self._load(key)
+                self._cache[key] = surface
+        return surface
+
+    def scaled(self, key, size: tuple) -> pygame.Surface:
+        """
+        Devolve o asset no tamanho pedido, escalando-o só na primeira vez.
+
+        Todos os pedidos com a mesma chave e o mesmo tamanho recebem a mesma
+        superfície (uma região do atlas, ou uma superfície própria para imagens
+        maiores que uma folha), que não deve ser modificada. Com o cache
+        pré-processado, a imagem já escalada é lida dele e só copiada para o atlas.
+
+        Parameters
+        ----------
+        key : str or int
+            Chave do asset.
+        size : tuple
+            Largura e altura desejadas.
+        """
+        size = (int(size[0]), int(size[1]))
+        surface = self._scaled.get((key, size))
+        if surface is not None:
+            return surface
+
+        with self._lock:
+            surface = self._scaled.get((key, size))
+            if surface is None and self._baked is not None:
+                image = self._baked.load(self._path(key), size, self._files[key][1])
+                surface = self._atlases[self._files[key][1]].add(image, size)
+                self._scaled[(key, size)] = surface
+            elif surface is None:
+                image = self.get(key)
+                if image.get_size() == size:
+                    surface = image
+                else:
+                    surface = self._atlases[self._files[key][1]].add(image, size)
+                self._scaled[(key, size)] = surface
+        return surface
+
+    def __getitem__(self, key) -> pygame.Surface:
+        return self.get(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._cache
+
+    def _path(self, key) -> str:
+        """
+        Caminho da imagem original associada à chave.
+        """
+        return path.join(path.dirname(__file__), self._img_dir, self._files[key][0])
+
+    def _load(self, key) -> pygame.Surface:
+        """
+        Decodifica a imagem associada à chave e a converte para o formato da tela.
+        """
+        image = pygame.image.load(self._path(key))
+        return image.convert_alpha() if self._files[key][1] else image.convert()
+
+    def preload(self, keys=None):
+        """
+        Carrega antecipadamente as chaves informadas (todas, se nenhuma for dada).
+        """
+        for key in (self._files if keys is None else keys):
+            if key not in self._cache:
+                self.get(key)
+
+    def evict(self, key) -> bool:
+        """
+        Remove uma entrada do cache, junto com todas as suas versões escaladas.
+
+        O próximo pedido da chave carrega a imagem de novo. O espaço ocupado no
+        atlas pelas versões escaladas não é reaproveitado até ``clear``.
+
+        Returns
+        -------
+        bool
+            True se a chave estava carregada (em qualquer tamanho), False caso contrário.
+        """
+        with self._lock:
+            scaled = [entry for entry in self._scaled if entry[0] == key]
+            for entry in scaled:
+                del self._scaled[entry]
+            return self._cache.pop(key, None) is not None or bool(scaled)
+
+    def clear(self):
+        """
+        Descarta todas as entradas do cache, as versões escaladas e zera os contadores.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._scaled.clear()
+            self._atlases = {False: TextureAtlas(False), True: TextureAtlas(True)}
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        """
+        Resumo do estado do cache: entradas carregadas, versões escaladas, folhas do atlas, acertos e faltas.
+        """
+        return {'loaded': len(self._cache), 'scaled': len(self._scaled),
+                'atlas_pages': sum(len(atlas.pages) for atlas in self._atlases.values()),
+                'baked_loads': self._baked.loads if self._baked else 0,
+                'baked_builds': self._baked.builds if self._baked else 0,
+                'hits': self.hits, 'misses': self.misses}
+
+
+# Cache compartilhado por todas as telas do jogo.
+asset_manager = AssetManager(img_dir)
+
+# Gerenciadores criados por ``load_assets`` para outros diretórios, por (imagens, cache)
+_managers = {}
+
+
+def load_assets(img_dir: str, cache_dir: str = BakeConfig.CACHE_DIR) -> dict:
     '''
-    Carrega e armazena as imagens dos blocos e personagens do jogo.
+    Carrega e armazena as imagens dos blocos e personagens do jogo, nos tamanhos em que são usadas.
+
+    Mantida por compatibilidade: as imagens vêm do cache compartilhado (ou de um
+    gerenciador guardado para cada par de diretórios diferente), então chamadas
+    repetidas não decodificam os arquivos de novo.
 
     Parameters
     ----------
     img_dir : str
         O caminho para o diretório que contém as imagens.
+    cache_dir : str
+        Diretório das imagens pré-processadas, ou None para decodificar as originais.
 
     Returns
     -------
     assets : dict
-        Um dicionário onde as chaves representam nomes significativos para blocos e personagens, 
+        Um dicionário onde as chaves representam nomes significativos para blocos e personagens,
         e os valores são as imagens carregadas dos blocos e personagens.
     '''
-    assets = {}
-    assets[PlayerConfig.WATERGIRL_IMG] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'watergirlpenut.png')).convert_alpha()
-    assets[PlayerConfig.FIREBOY_IMG] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'fireboypenut_resized.png')).convert_alpha()
-    assets[Map.BLOCK] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'dirtblock.png')).convert()
-    assets[Map.PLATF] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'tile-wood.png')).convert()
-    assets[Map.LAVA] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'lavablock.png')).convert()
-    assets[Map.WATER] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'waterblock.png')).convert()
-    assets[InitialScreenSettings.BACKGROUND_IMG] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'startscream_resized.jpg')).convert()
-    assets[EndScreenSettings.WIN_IMG] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'youwin_resized.jpg')).convert()
-    assets[EndScreenSettings.GAMEOVER_IMG] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'gameover_resized.jpg')).convert()
-    assets[ModeScreenSettings.BACKGROUND_IMG] = pygame.image.load(path.join(path.dirname(__file__), img_dir, 'mode_resized.jpg')).convert()
-
-    return assets
\ No newline at end of file
+    if img_dir == asset_manager._img_dir and cache_dir == asset_manager._cache_dir:
+        manager = asset_manager
+    else:
+        manager = _managers.get((img_dir, cache_dir))
+        if manager is None:
+            manager = _managers[(img_dir, cache_dir)] = AssetManager(img_dir, cache_dir=cache_dir)
+    return {key: manager.scaled(key, size) for key, size in bake_targets(ASSET_FILES)}
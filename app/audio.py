@@ -0,0 +1,203 @@
+"""
+Módulo responsável pelas músicas de fundo.
+
+Decodificar um MP3 inteiro leva um tempo visível, então o ``AudioManager`` lê e
+decodifica as músicas de ``msc/`` em uma thread separada, antes de serem
+pedidas, e mantém as usadas mais recentemente na memória. Trocar de música só
+inicia o som já decodificado em outro canal, com a anterior sumindo aos poucos
+(crossfade), sem travar o loop do jogo. Cada troca tem sua duração registrada.
+"""
+
+
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from os import path
+from threading import Lock
+from time import perf_counter
+from .config import AudioConfig
+
+
+# Define o diretório que contém as músicas.
+msc_dir = path.join('..', 'msc')
+
+# Chave de cada música e o arquivo correspondente
+MUSIC_FILES = {
+    AudioConfig.MENU_TRACK: 'caillou_theme_song.mp3',
+    AudioConfig.GAME_TRACK: 'bglmudou.mp3',
+}
+
+
+class AudioManager:
+    """
+    Músicas de fundo pré-carregadas, tocadas com crossfade entre dois canais.
+
+    Atributes:
+    ----------
+    current : str
+        Chave da música tocando, ou None.
+    volume : float
+        Volume das músicas, entre 0 e 1.
+    transitions : list
+        Uma entrada por troca de música: a chave, o tempo esperando a decodificação
+        terminar e o tempo total gasto na troca, em milissegundos (e o erro, se a
+        música não pôde ser carregada).
+    """
+
+    def __init__(self, msc_dir: str = msc_dir, files: dict = MUSIC_FILES,
+                 warm: int = AudioConfig.WARM_TRACKS, volume: float = AudioConfig.VOLUME):
+        """
+        Parameters
+        ----------
+        msc_dir : str
+            O caminho, relativo a este módulo, do diretório que contém as músicas.
+        files : dict
+            Dicionário que associa cada chave ao nome do arquivo.
+        warm : int
+            Quantidade de músicas decodificadas mantidas na memória.
+        volume : float
+            Volume inicial.
+        """
+        self._msc_dir = msc_dir
+        self._files = dict(files)
+        self._warm = warm
+        self._volume = volume
+        self._sounds = OrderedDict()
+        self._pending = {}
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='audio')
+        self._channels = None
+        self._active = 0
+        self.current = None
+        self.transitions = []
+
+    def __decode(self, key) -> pygame.mixer.Sound:
+        """
+        Lê o arquivo e o decodifica. Roda na thread de carregamento.
+
+        Se a leitura ou a decodificação falhar, a chave sai de ``_pending`` do mesmo
+        jeito, para que um pedido seguinte tente de novo.
+        """
+        try:
+            with open(path.join(path.dirname(__file__), self._msc_dir, self._files[key]), 'rb') as file:
+                data = file.read()
+            sound = pygame.mixer.Sound(BytesIO(data))
+            with self._lock:
+                self._sounds[key] = sound
+            return sound
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def preload(self, keys=None):
+        """
+        Agenda o carregamento das chaves informadas (todas, se nenhuma for dada) sem esperar por ele.
+        """
+        for key in (self._files if keys is None else keys):
+            with self._lock:
+                if key in self._sounds or key in self._pending:
+                    continue
+                self._pending[key] = self._executor.submit(self.__decode, key)
+
+    def ready(self, key) -> bool:
+        """
+        Indica se a música já está decodificada, ou seja, se pode tocar sem espera.
+        """
+        with self._lock:
+            return key in self._sounds
+
+    def __sound(self, key) -> pygame.mixer.Sound:
+        """
+        Devolve a música decodificada, esperando o carregamento se ele ainda não terminou.
+        """
+        self.preload([key])
+        with self._lock:
+            sound = self._sounds.get(key)
+            future = self._pending.get(key)
+        if sound is None:
+            # Sem música e sem carregamento pendente: o carregamento já terminou com erro
+            sound = future.result() if future is not None else self.__decode(key)
+
+        # Marca como usada recentemente e descarta as mais antigas que não estão tocando
+        with self._lock:
+            self._sounds.move_to_end(key)
+            for old in list(self._sounds):
+                if len(self._sounds) <= self._warm:
+                    break
+                if old not in (key, self.current):
+                    del self._sounds[old]
+        return sound
+
+    def play(self, key, fade_ms: int = AudioConfig.FADE_MS, restart: bool = False):
+        """
+        Toca a música em loop, trocando com crossfade pela que estiver tocando.
+
+        Se a música não puder ser lida ou decodificada, a atual é interrompida e o
+        jogo segue em silêncio; o erro fica registrado em ``transitions``.
+
+        Parameters
+        ----------
+        key : str
+            Chave da música.
+        fade_ms : int
+            Duração do crossfade, em milissegundos.
+        restart : bool
+            Se a música já estiver tocando, recomeça do início; caso contrário ela continua.
+        """
+        playing = self._channels is not None and self._channels[self._active].get_busy()
+        if key == self.current and playing and not restart:
+            return
+
+        start = perf_counter()
+        try:
+            sound = self.__sound(key)
+        except (OSError, pygame.error) as error:
+            self.stop(fade_ms)
+            self.transitions.append({'track': key, 'wait_ms': 0.0, 'total_ms': (perf_counter() - start) * 1000,
+                                     'error': str(error)})
+            return
+        waited = perf_counter() - start
+
+        if self._channels is None:
+            pygame.mixer.set_reserved(2)
+            self._channels = (pygame.mixer.Channel(0), pygame.mixer.Channel(1))
+        if playing:
+            self._channels[self._active].fadeout(fade_ms)
+            self._active = 1 - self._active
+        channel = self._channels[self._active]
+        channel.set_volume(self._volume)
+        channel.play(sound, loops=-1, fade_ms=fade_ms)
+        self.current = key
+
+        self.transitions.append({'track': key, 'wait_ms': waited * 1000, 'total_ms': (perf_counter() - start) * 1000})
+
+    def stop(self, fade_ms: int = AudioConfig.FADE_MS):
+        """
+        Faz a música atual sumir aos poucos.
+        """
+        if self._channels is not None:
+            self._channels[self._active].fadeout(fade_ms)
+        self.current = None
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    @volume.setter
+    def volume(self, value: float):
+        self._volume = min(1.0, max(0.0, value))
+        if self._channels is not None:
+            self._channels[self._active].set_volume(self._volume)
+
+    def report(self) -> list:
+        """
+        Linhas de texto com a duração de cada troca de música.
+        """
+        return [f'{entry["track"]}: falhou ({entry["error"]})' if 'error' in entry else
+                f'{entry["track"]}: {entry["total_ms"]:.2f} ms (esperando carregamento: {entry["wait_ms"]:.2f} ms)'
+                for entry in self.transitions]
+
+
+# Músicas compartilhadas por todas as telas do jogo.
+audio_manager = AudioManager(msc_dir)
@@ -0,0 +1,291 @@
+"""
+Módulo responsável pelo pré-processamento das imagens do jogo.
+
+Decodificar PNG/JPEG e escalar cada imagem para o tamanho da célula, do
+jogador ou da tela custa bem mais do que o jogo gasta com elas depois. Este
+módulo faz esse trabalho uma única vez e guarda o resultado em pixels crus
+(``BGRA``, a mesma ordem das superfícies com transparência do Pygame) em um
+diretório de cache. Cada arquivo tem no nome o hash do conteúdo da imagem
+original e o tamanho de destino, então uma imagem alterada gera outra entrada
+e a antiga é descartada; a entrada é refeita automaticamente na primeira vez
+em que for pedida. Para não ler as imagens originais a cada execução, o hash
+de cada uma fica guardado em um índice (``INDEX``) junto com o tamanho e a data
+de modificação do arquivo, e só é recalculado quando eles mudam.
+
+Na execução, ``AssetManager`` lê esses arquivos e cria as superfícies com
+``pygame.image.frombuffer``, sobre os próprios bytes lidos, sem decodificar nem
+escalar nada.
+
+Uso pela linha de comando (gera as entradas que faltam e remove as antigas)::
+
+    python -m app.bake
+    python -m app.bake --force
+"""
+
+
+import glob
+import hashlib
+import os
+import json
+import re
+import tempfile
+import threading
+import pygame
+from os import path
+from .config import Map, PlayerConfig, TilesConfig, ScreenSettings, BakeConfig
+
+
+# Ordem dos bytes de cada pixel nos arquivos do cache
+PIXEL_FORMAT = 'BGRA'
+
+# Muda quando o formato dos arquivos mudar, invalidando todas as entradas antigas
+VERSION = 1
+
+# Extensão dos arquivos do cache
+EXTENSION = '.bgra'
+
+# Arquivo, dentro do diretório do cache, com o hash de cada imagem original
+INDEX = 'index.json'
+
+
+def bake_targets(files: dict) -> list:
+    """
+    Tamanhos em que cada asset é usado pelo jogo.
+
+    Os tiles são usados no tamanho da célula, os jogadores no tamanho do
+    jogador e as demais imagens (fundos das telas) no tamanho da tela.
+
+    Parameters
+    ----------
+    files : dict
+        Dicionário que associa cada chave ao par (nome do arquivo, possui transparência).
+
+    Returns
+    -------
+    list
+        Pares (chave, (largura, altura)).
+    """
+    tiles = (Map.BLOCK, Map.PLATF, Map.LAVA, Map.WATER)
+    players = (PlayerConfig.WATERGIRL_IMG, PlayerConfig.FIREBOY_IMG)
+    targets = []
+    for key in files:
+        if key in tiles:
+            size = (TilesConfig.TILE_SIZE, TilesConfig.TILE_SIZE)
+        elif key in players:
+            size = (PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT)
+        else:
+            size = (ScreenSettings.WIDTH, ScreenSettings.HEIGHT)
+        targets.append((key, (int(size[0]), int(size[1]))))
+    return targets
+
+
+class BakedCache:
+    """
+    Diretório de imagens já escaladas, em pixels crus, indexadas pelo hash da imagem original e pelo tamanho.
+
+    Atributes:
+    ----------
+    directory : str
+        Caminho do diretório do cache.
+    loads : int
+        Quantidade de entradas lidas do disco.
+    builds : int
+        Quantidade de entradas (re)feitas a partir da imagem original.
+    hashes : int
+        Quantidade de imagens originais lidas para calcular o hash do conteúdo.
+    """
+
+    def __init__(self, cache_dir: str = BakeConfig.CACHE_DIR):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            Diretório do cache, relativo à raiz do projeto.
+        """
+        self.directory = path.join(path.dirname(__file__), '..', cache_dir)
+        self.loads = 0
+        self.builds = 0
+        self.hashes = 0
+        self._index = None
+        self._lock = threading.Lock()
+
+    def digest(self, source: str, force: bool = False) -> str:
+        """
+        Hash do conteúdo da imagem original.
+
+        O hash só é recalculado se o tamanho ou a data de modificação do arquivo
+        mudaram desde a última vez (ou com ``force``); senão vem do índice.
+        """
+        status = os.stat(source)
+        stamp = [status.st_mtime_ns, status.st_size]
+        key = path.abspath(source)
+        with self._lock:
+            if self._index is None:
+                self._index = self.__read_index()
+            entry = self._index.get(key)
+        if not force and entry is not None and entry[:2] == stamp:
+            return entry[2]
+
+        with open(source, 'rb') as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        with self._lock:
+            self._index[key] = stamp + [digest]
+            self.__write_index()
+        self.hashes += 1
+        return digest
+
+    def __read_index(self) -> dict:
+        try:
+            with open(path.join(self.directory, INDEX)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False) as file:
+            json.dump(self._index, file)
+        os.replace(file.name, path.join(self.directory, INDEX))
+
+    def entry_path(self, source: str, size: tuple, force: bool = False) -> str:
+        """
+        Arquivo da entrada de uma imagem em um tamanho, com o hash do conteúdo atual da imagem no nome.
+        """
+        digest = hashlib.sha1(f'{VERSION}:{size[0]}x{size[1]}:{self.digest(source, force)}'.encode())
+        return path.join(self.directory, f'{self.__prefix(source, size)}{digest.hexdigest()[:16]}{EXTENSION}')
+
+    @staticmethod
+    def __prefix(source: str, size: tuple) -> str:
+        stem = re.sub(r'[^\w-]', '_', path.splitext(path.basename(source))[0])
+        return f'{stem}_{size[0]}x{size[1]}_'
+
+    def build(self, source: str, size: tuple, force: bool = False) -> str:
+        """
+        Decodifica e escala a imagem, grava os pixels crus e remove as entradas antigas da mesma imagem e tamanho.
+
+        Com ``force``, o hash da imagem é recalculado mesmo que o arquivo pareça não ter mudado.
+
+        Returns
+        -------
+        str
+            O arquivo gravado.
+        """
+        filename = self.entry_path(source, size, force)
+        image = pygame.image.load(source)
+        if image.get_size() != tuple(size):
+            image = pygame.transform.scale(image, size)
+
+        # Um arquivo temporário próprio por chamada, pois duas threads podem refazer a mesma entrada
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as file:
+            file.write(pygame.image.tobytes(image, PIXEL_FORMAT))
+        os.replace(file.name, filename)
+
+        for stale in glob.glob(path.join(glob.escape(self.directory), glob.escape(self.__prefix(source, size)) + '*' + EXTENSION)):
+            if stale != filename:
+                os.remove(stale)
+        self.builds += 1
+        return filename
+
+    def load(self, source: str, size: tuple, alpha: bool) -> pygame.Surface:
+        """
+        Devolve a imagem no tamanho pedido a partir do cache, refazendo a entrada se ela não existir.
+
+        Com uma janela aberta, a superfície é convertida para o formato da tela
+        (com ``convert_alpha`` se tiver transparência), como as imagens carregadas
+        por ``AssetManager``, para que cada cópia na tela não precise converter os
+        pixels. Sem janela, ela usa diretamente os bytes lidos do arquivo.
+
+        Parameters
+        ----------
+        source : str
+            Caminho da imagem original.
+        size : tuple
+            Largura e altura desejadas.
+        alpha : bool
+            Se a imagem possui transparência.
+        """
+        size = (int(size[0]), int(size[1]))
+        filename = self.entry_path(source, size)
+        if not path.exists(filename):
+            filename = self.build(source, size)
+
+        data = bytearray(path.getsize(filename))
+        with open(filename, 'rb') as file:
+            file.readinto(data)
+        self.loads += 1
+        surface = pygame.image.frombuffer(data, size, PIXEL_FORMAT)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface
+
+    def prune(self, keep) -> int:
+        """
+        Remove do cache os arquivos de imagens que não estão em ``keep``.
+
+        Returns
+        -------
+        int
+            Quantidade de arquivos removidos.
+        """
+        keep = {path.abspath(filename) for filename in keep}
+        removed = 0
+        for filename in glob.glob(path.join(glob.escape(self.directory), '*' + EXTENSION)):
+            if path.abspath(filename) not in keep:
+                os.remove(filename)
+                removed += 1
+        return removed
+
+
+def bake(files: dict = None, img_dir: str = None, cache_dir: str = BakeConfig.CACHE_DIR, force: bool = False) -> list:
+    """
+    Gera as entradas que faltam de todos os assets, nos tamanhos de ``bake_targets``, e remove as que sobraram.
+
+    Parameters
+    ----------
+    files : dict, optional
+        Assets a processar. Se None, ``ASSET_FILES``.
+    img_dir : str, optional
+        Diretório das imagens, relativo ao módulo ``assets``. Se None, o padrão.
+    cache_dir : str
+        Diretório do cache, relativo à raiz do projeto.
+    force : bool
+        Refaz todas as entradas, mesmo as que já existem.
+
+    Returns
+    -------
+    list
+        Tuplas (chave, tamanho, arquivo, se foi refeito).
+    """
+    from . import assets
+    files = assets.ASSET_FILES if files is None else files
+    img_dir = assets.img_dir if img_dir is None else img_dir
+
+    cache = BakedCache(cache_dir)
+    entries = []
+    for key, size in bake_targets(files):
+        source = path.join(path.dirname(assets.__file__), img_dir, files[key][0])
+        filename = cache.entry_path(source, size, force)
+        built = force or not path.exists(filename)
+        if built:
+            filename = cache.build(source, size)
+        entries.append((key, size, filename, built))
+    cache.prune(filename for _, _, filename, _ in entries)
+    return entries
+
+
+if __name__ == '__main__':
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description='Pré-processa as imagens do jogo para o cache de pixels crus.')
+    parser.add_argument('--force', action='store_true', help='refaz todas as entradas')
+    parser.add_argument('--cache-dir', default=BakeConfig.CACHE_DIR, help='diretório do cache')
+    args = parser.parse_args()
+
+    start = perf_counter()
+    entries = bake(cache_dir=args.cache_dir, force=args.force)
+    elapsed = perf_counter() - start
+    for key, size, filename, built in entries:
+        print(f'{"gerado " if built else "em dia "} {str(key):<26} {size[0]:>4}x{size[1]:<4} {path.basename(filename)}')
+    print(f'{sum(built for *_, built in entries)} de {len(entries)} entradas geradas em {elapsed * 1000:.1f} ms')
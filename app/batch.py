@@ -0,0 +1,279 @@
+"""
+Módulo responsável pela física vetorizada de muitos jogadores ao mesmo tempo.
+
+``PlayerBatch`` guarda posição, velocidade, estado, ``highest_y`` e vida de N
+jogadores independentes em arrays NumPy e aplica, em um único passo vetorizado,
+as mesmas regras de ``Player.update``: gravidade, blocos, plataformas, lava,
+água e limites laterais do mapa. Serve para treinar bots e testar fases rodando milhares
+de simulações em paralelo.
+"""
+
+
+import numpy as np
+from .config import Map, PlayerConfig, TilesConfig, Actions
+
+
+# Códigos numéricos dos estados do jogador
+STILL = 0
+JUMPING = 1
+FALLING = 2
+STATE_CODES = {PlayerConfig.STILL: STILL, PlayerConfig.JUMPING: JUMPING, PlayerConfig.FALLING: FALLING}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+# Códigos numéricos dos elementos
+FIRE = 0
+WATER = 1
+ELEMENT_CODES = {'fire': FIRE, 'water': WATER}
+
+
+class PlayerBatch:
+    """
+    Conjunto de N jogadores simulados em paralelo sobre a mesma grade de tiles.
+
+    Atributes:
+    ----------
+    grid : numpy.ndarray
+        Matriz (linhas, colunas) com o tipo de tile de cada célula.
+    element : numpy.ndarray
+        Elemento de cada jogador (``FIRE`` ou ``WATER``).
+    x, y : numpy.ndarray
+        Canto superior esquerdo do retângulo de cada jogador, em pixels.
+    speedx, speedy : numpy.ndarray
+        Velocidades horizontal e vertical de cada jogador.
+    state : numpy.ndarray
+        Estado de cada jogador (``STILL``, ``JUMPING`` ou ``FALLING``).
+    highest_y : numpy.ndarray
+        Maior altura alcançada por cada jogador antes de começar a cair.
+    health : numpy.ndarray
+        Vida de cada jogador.
+    life : numpy.ndarray
+        Indica se cada jogador está vivo.
+    """
+
+    def __init__(self, grid, elements, rows, columns, tile_size: int = TilesConfig.TILE_SIZE):
+        """
+        Cria N jogadores nas posições iniciais informadas.
+
+        Parameters
+        ----------
+        grid : array_like
+            Matriz no formato de ``Map.MAP``.
+        elements : array_like
+            Elemento de cada jogador, como código (``FIRE``/``WATER``) ou string ('fire'/'water').
+        rows : array_like
+            Linha inicial de cada jogador (o pé fica na borda superior dessa linha).
+        columns : array_like
+            Coluna inicial de cada jogador.
+        tile_size : int
+            Tamanho, em pixels, de cada célula.
+        """
+        self.grid = np.asarray(grid, dtype=np.int8)
+        self.tile_size = tile_size
+        self.width = PlayerConfig.PLAYER_WIDTH
+        self.height = PlayerConfig.PLAYER_HEIGHT
+        self.world_width = self.grid.shape[1] * tile_size
+        self.death_y = self.grid.shape[0] * tile_size + self.height - 1
+        self._max_step_x = tile_size + self.width - 1
+        self._max_step_y = tile_size + self.height - 1
+
+        # Linhas e colunas da grade que o retângulo do jogador pode ocupar ao mesmo
+        # tempo (3 e 2 no tamanho padrão), percorridas linha a linha em ``__window``
+        window_rows = (self.height - 1) // tile_size + 2
+        window_columns = (self.width - 1) // tile_size + 2
+        self._window_rows = np.repeat(np.arange(window_rows), window_columns)
+        self._window_columns = np.tile(np.arange(window_columns), window_rows)
+
+        elements = [ELEMENT_CODES.get(element, element) for element in np.atleast_1d(elements)]
+        self.element = np.asarray(elements, dtype=np.int8)
+        n = len(self.element)
+        rows = np.broadcast_to(np.asarray(rows, dtype=np.int32), (n,))
+        columns = np.broadcast_to(np.asarray(columns, dtype=np.int32), (n,))
+
+        self.x = columns * tile_size
+        self.y = rows * tile_size - self.height
+        self.speedx = np.zeros(n, dtype=np.int32)
+        self.speedy = np.zeros(n, dtype=np.int32)
+        self.state = np.full(n, STILL, dtype=np.int8)
+        self.highest_y = self.y + self.height
+        self.health = np.full(n, 5, dtype=np.int32)
+        self.life = np.ones(n, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.element)
+
+    @classmethod
+    def from_players(cls, players, grid=Map.MAP):
+        """
+        Cria um lote copiando o estado atual de objetos ``Player``.
+        """
+        batch = cls(grid, [player.element for player in players], 0, 0, players[0].tiles.tile_size)
+        for index, player in enumerate(players):
+            batch.set_state(index, player)
+        return batch
+
+    def set_state(self, index: int, player):
+        """
+        Copia o estado de um ``Player`` para a posição ``index`` do lote.
+        """
+        self.x[index] = player.rect.x
+        self.y[index] = player.rect.y
+        self.speedx[index] = player.speedx
+        self.speedy[index] = player.speedy
+        self.state[index] = STATE_CODES[player.state]
+        self.highest_y[index] = player.highest_y
+        self.health[index] = player.health
+        self.life[index] = player.life
+
+    def get_state(self, index: int) -> dict:
+        """
+        Devolve o estado do jogador ``index`` com os mesmos nomes dos atributos de ``Player``.
+        """
+        return {
+            'rect': (int(self.x[index]), int(self.y[index]), self.width, self.height),
+            'speedx': int(self.speedx[index]),
+            'speedy': int(self.speedy[index]),
+            'state': STATE_NAMES[int(self.state[index])],
+            'highest_y': int(self.highest_y[index]),
+            'health': int(self.health[index]),
+            'life': bool(self.life[index]),
+        }
+
+    def step(self, actions, dt: int = 1):
+        """
+        Aplica as ações de um frame e atualiza todos os jogadores.
+
+        Parameters
+        ----------
+        actions : array_like
+            Ações (bits de ``Actions``) de cada jogador.
+        dt : int
+            Duração do passo, em frames.
+        """
+        self.apply_actions(actions)
+        self.update(dt)
+
+    def apply_actions(self, actions):
+        """
+        Equivalente vetorizado de ``Player.apply_actions``.
+        """
+        actions = np.asarray(actions)
+        right = (actions & Actions.RIGHT) != 0
+        left = (actions & Actions.LEFT) != 0
+        self.speedx[:] = PlayerConfig.SPEED_X * (right.astype(np.int32) - left)
+
+        jump = ((actions & Actions.JUMP) != 0) & (self.state == STILL)
+        self.speedy[jump] -= PlayerConfig.JUMP_SIZE
+        self.state[jump] = JUMPING
+
+    def update(self, dt: int = 1):
+        """
+        Equivalente vetorizado de ``Player.update``, na mesma ordem de etapas.
+
+        Cada jogador é varrido no mesmo número de subpassos que ``Player.update``
+        usaria; os que já terminaram os seus ficam de fora dos subpassos seguintes.
+        """
+        self.speedy = np.minimum(self.speedy + Map.GRAVITY * dt, PlayerConfig.TERMINAL_VELOCITY)
+        self.state[self.speedy > 0] = FALLING
+
+        dx = self.speedx * dt
+        dy = self.speedy * dt
+        steps = np.maximum(np.maximum(-(-np.abs(dx) // self._max_step_x), -(-np.abs(dy) // self._max_step_y)), 1)
+        for step in range(int(steps.max())):
+            active = step < steps
+            self.__update_movement_y(np.where(active, dy * (step + 1) // steps - dy * step // steps, 0), active)
+            self.__check_block_collision(active)
+            self.__check_platform_collision(active)
+            self.__check_hazard_collision(Map.LAVA, WATER, active)
+            self.x += np.where(active, dx * (step + 1) // steps - dx * step // steps, 0)
+            self.__check_screen_limit(active)
+            self.__check_horizontal_collision(active)
+            self.__death(active)
+            self.__check_hazard_collision(Map.WATER, FIRE, active)
+
+    def __window(self):
+        """
+        Tipos e posições dos tiles nas células que cada jogador ocupa.
+
+        Returns
+        -------
+        tuple
+            Arrays (N, k) com o tipo, o topo e a esquerda de cada célula, em
+            ordem linha a linha. Células fora do retângulo ou do mapa valem ``Map.EMPTY``.
+        """
+        size = self.tile_size
+        first_row = self.y // size
+        first_column = self.x // size
+        last_row = (self.y + self.height - 1) // size
+        last_column = (self.x + self.width - 1) // size
+
+        rows = first_row[:, None] + self._window_rows
+        columns = first_column[:, None] + self._window_columns
+        valid = ((rows <= last_row[:, None]) & (columns <= last_column[:, None])
+                 & (rows >= 0) & (rows < self.grid.shape[0])
+                 & (columns >= 0) & (columns < self.grid.shape[1]))
+
+        types = self.grid[np.clip(rows, 0, self.grid.shape[0] - 1), np.clip(columns, 0, self.grid.shape[1] - 1)]
+        types = np.where(valid, types, Map.EMPTY)
+        return types, rows * size, columns * size
+
+    def __update_movement_y(self, distance, active):
+        # Quem bateu em um bloco ou pousou (velocidade zerada) não se move mais neste passo
+        self.y += np.where(self.speedy != 0, distance, 0)
+        not_falling = (self.state != FALLING) & active
+        self.highest_y[not_falling] = self.y[not_falling] + self.height
+
+    def __check_block_collision(self, active):
+        # Depois da primeira colisão a velocidade zera, então só o primeiro bloco importa
+        types, tops, _ = self.__window()
+        hits = types == Map.BLOCK
+        first = hits.argmax(axis=1)
+        hit = hits.any(axis=1) & active
+        tile_top = np.take_along_axis(tops, first[:, None], axis=1)[:, 0]
+
+        down = hit & (self.speedy > 0)
+        up = hit & (self.speedy < 0)
+        self.y[down] = tile_top[down] - self.height
+        self.y[up] = tile_top[up] + self.tile_size
+        stop = down | up
+        self.speedy[stop] = 0
+        self.state[stop] = STILL
+
+    def __check_platform_collision(self, active):
+        # As plataformas são percorridas de cima para baixo, então a última a
+        # parar o jogador é a mais baixa entre as que ele toca
+        types, tops, _ = self.__window()
+        lowest_top = np.where(types == Map.PLATF, tops, np.iinfo(np.int32).min).max(axis=1)
+        land = (self.speedy > 0) & (lowest_top >= self.highest_y) & active
+
+        self.y[land] = lowest_top[land] - self.height
+        self.highest_y[land] = lowest_top[land]
+        self.speedy[land] = 0
+        self.state[land] = STILL
+
+    def __check_hazard_collision(self, tile_type: int, element: int, active):
+        types, tops, _ = self.__window()
+        deadly = ((types == tile_type) & (tops >= self.highest_y[:, None])).any(axis=1)
+        self.health[deadly & (self.element == element) & active] = 0
+
+    def __check_screen_limit(self, active):
+        self.x[(self.x < 0) & active] = 0
+        beyond = (self.x + self.width >= self.world_width) & active
+        self.x[beyond] = self.world_width - 1 - self.width
+
+    def __check_horizontal_collision(self, active):
+        # A posição final vem da última colisão encontrada, linha a linha
+        types, _, lefts = self.__window()
+        hits = types == Map.BLOCK
+        last = hits.shape[1] - 1 - hits[:, ::-1].argmax(axis=1)
+        hit = hits.any(axis=1) & active
+        tile_left = np.take_along_axis(lefts, last[:, None], axis=1)[:, 0]
+
+        right = hit & (self.speedx > 0)
+        left = hit & (self.speedx < 0)
+        self.x[right] = tile_left[right] - self.width
+        self.x[left] = tile_left[left] + self.tile_size
+
+    def __death(self, active):
+        # Mesmo limite de queda usado em Player
+        dead = ((self.y + self.height >= self.death_y) | (self.health == 0)) & active
+        self.life[dead] = False
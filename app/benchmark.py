@@ -0,0 +1,308 @@
+"""
+Módulo responsável pelos benchmarks dos trechos mais executados do jogo.
+
+Cada benchmark mede um trecho (``Player.update``, cada verificação de colisão
+do jogador, a montagem e o recomeço da fase em ``Game``, o carregamento dos
+assets, a criação de ``Tiles`` e um frame completo do ``Game``) na fase padrão e
+em mapas gerados de vários tamanhos. Tudo roda sem janela e sem som (drivers ``dummy``
+do SDL). Os resultados são gravados em JSON e comparados com uma referência
+gravada antes: se algum trecho ficar mais lento que o limite, a execução falha.
+
+Uso pela linha de comando::
+
+    python -m app.benchmark --save-baseline      # grava a referência
+    python -m app.benchmark --threshold 1.3      # compara com a referência
+"""
+
+
+import json
+import os
+import platform
+import statistics
+import sys
+import numpy as np
+import pygame
+from time import perf_counter_ns
+from .config import Map, ScreenSettings, PlayerConfig, DoorConfig, TilesConfig, BenchmarkConfig
+from .assets import AssetManager, ASSET_FILES, asset_manager, load_assets, img_dir
+from .bake import bake_targets
+from .collision import TileGrid
+from .level import Level, compute_masks, load_level
+from .player import Player
+from .tiles import Tiles
+from .game import Game, InitialScreen
+from .audio import audio_manager
+
+
+# Verificações de colisão de Player medidas uma a uma (métodos privados)
+COLLISION_CHECKS = {
+    'block': '_Player__check_block_collision',
+    'platform': '_Player__check_platform_collision',
+    'horizontal': '_Player__check_horizontal_collision',
+    'lava': '_Player__check_lava_collision',
+    'water': '_Player__check_water_collision',
+    'screen_limit': '_Player__check_screen_limit',
+}
+
+
+def generate_level(size: int, seed: int = 0) -> Level:
+    """
+    Gera uma fase quadrada com bordas de blocos e trechos aleatórios de tiles.
+
+    Os jogadores começam no chão, no canto inferior esquerdo, e as portas ficam
+    no canto inferior direito. A densidade de tiles é parecida com a da fase padrão.
+
+    Parameters
+    ----------
+    size : int
+        Quantidade de linhas e de colunas.
+    seed : int
+        Semente do gerador aleatório, para que o mapa seja sempre o mesmo.
+    """
+    rng = np.random.default_rng(seed)
+    tiles = np.full((size, size), Map.EMPTY, dtype=np.int8)
+    tiles[-1, :] = Map.BLOCK
+    tiles[:, 0] = Map.BLOCK
+    tiles[:, -1] = Map.BLOCK
+
+    # Trechos de 1 a 4 tiles a cada 3 linhas, longe do ponto de início
+    kinds = np.array([Map.BLOCK, Map.PLATF, Map.LAVA, Map.WATER], dtype=np.int8)
+    for row in range(3, size - 4, 3):
+        for _ in range(max(1, size // 50)):
+            column = int(rng.integers(2, size - 6))
+            tiles[row, column:column + int(rng.integers(1, 5))] = rng.choice(kinds, p=(0.4, 0.4, 0.1, 0.1))
+
+    size_px = TilesConfig.TILE_SIZE
+    door_y = (size - 1) * size_px - DoorConfig.DOOR_HEIGHT
+    return Level(f'generated{size}', tiles, compute_masks(tiles), size_px, (size - 1, 1), (size - 1, 2),
+                 ((size - 3) * size_px, door_y, DoorConfig.DOOR_WIDTH, DoorConfig.DOOR_HEIGHT),
+                 ((size - 2) * size_px, door_y, DoorConfig.DOOR_WIDTH, DoorConfig.DOOR_HEIGHT))
+
+
+def measure(func, number: int = 1, repeat: int = BenchmarkConfig.REPEAT, setup=None) -> dict:
+    """
+    Mede o tempo de uma chamada de ``func``.
+
+    Parameters
+    ----------
+    func : callable
+        Trecho medido, chamado sem argumentos.
+    number : int
+        Chamadas seguidas em cada repetição; o tempo de uma repetição é dividido por ele.
+    repeat : int
+        Quantidade de repetições.
+    setup : callable, optional
+        Chamado antes de cada repetição, fora da medição.
+
+    Returns
+    -------
+    dict
+        Mediana e mínimo do tempo por chamada (ns), e os valores de ``number`` e ``repeat``.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter_ns()
+        for _ in range(number):
+            func()
+        times.append((perf_counter_ns() - start) / number)
+    return {'median_ns': statistics.median(times), 'min_ns': min(times), 'number': number, 'repeat': repeat}
+
+
+def _spawn_player(level: Level, element: str = 'fire') -> Player:
+    """
+    Cria um jogador sem imagem no ponto de início da fase.
+    """
+    spawn = level.fireboy_spawn if element == 'fire' else level.watergirl_spawn
+    return Player(None, *spawn, TileGrid(level.tiles, level.tile_size), element)
+
+
+def bench_player(level: Level, repeat: int) -> dict:
+    """
+    ``Player.update`` andando para a direita, e cada verificação de colisão isolada.
+    """
+    results = {}
+    holder = []
+
+    def setup():
+        holder[:] = [_spawn_player(level)]
+        holder[0].speedx = PlayerConfig.SPEED_X
+
+    setup()
+    results['player_update'] = measure(lambda: holder[0].update(), 1000, repeat, setup)
+
+    player = _spawn_player(level)
+    for check, method in COLLISION_CHECKS.items():
+        results[f'collision_{check}'] = measure(getattr(player, method), 10000, repeat)
+    return results
+
+
+def bench_game(screen: pygame.Surface, level: Level, repeat: int, frames: int = 100) -> dict:
+    """
+    Montagem da fase (``Game.__create_sprites``), recomeço da fase já montada
+    e frames completos do ``Game``, sem limite de FPS.
+    """
+    game = Game(screen, level=level)
+    game.set_screen()
+    game.fps = 0
+    game.tick_rate = 0
+    game._running = game._running_phase = True
+
+    results = {'create_sprites': measure(game._Game__create_sprites, 1, min(repeat, 3), game._Game__initialize)}
+
+    # A última montagem ficou com grupos novos e a fase inteira; tentar de novo só recomeça o estado
+    results['restart'] = measure(game.set_screen, 100, repeat)
+    game.step()
+    results['game_frame'] = measure(game.step, frames, repeat)
+    audio_manager.stop(0)
+    return results
+
+
+def bench_assets(repeat: int) -> dict:
+    """
+    ``load_assets`` com o cache vazio (decodificando as imagens originais ou lendo as
+    pré-processadas) e já preenchido, e a criação de ``Tiles``.
+    """
+    # ``load_assets`` guarda o gerenciador sem cache pré-processado; este é esvaziado a cada repetição
+    decoder = AssetManager(img_dir, cache_dir=None)
+    results = {
+        'load_assets_decode': measure(lambda: [decoder.scaled(key, size) for key, size in bake_targets(ASSET_FILES)],
+                                      1, repeat, decoder.clear),
+        'load_assets_cold': measure(lambda: load_assets(img_dir), 1, repeat, asset_manager.clear),
+        'load_assets_warm': measure(lambda: load_assets(img_dir), 100, repeat),
+    }
+    image = asset_manager.scaled(Map.BLOCK, (TilesConfig.TILE_SIZE, TilesConfig.TILE_SIZE))
+    results['tiles_construction'] = measure(lambda: Tiles(image, 3, 4, TilesConfig.TILE_SIZE), 1000, repeat)
+    return results
+
+
+def bench_idle(screen: pygame.Surface, seconds: float = 1.0) -> dict:
+    """
+    CPU usada pela tela inicial parada durante ``seconds``, até um 'Enter' simulado.
+
+    Fora do padrão dos outros resultados, ``median_ns`` aqui é o tempo de CPU
+    gasto por segundo de relógio (1e9 seria um núcleo inteiro ocupado), e
+    ``max_ns`` é o limite absoluto usado por ``compare`` no lugar da referência.
+    """
+    initial = InitialScreen(screen)
+    initial.set_screen()
+    pygame.event.clear()
+    pygame.time.set_timer(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN), int(seconds * 1000), 1)
+    initial.run()
+    audio_manager.stop(0)
+    cpu_ns = initial.idle_cpu * 1e9
+    return {'static_screen_idle': {'median_ns': cpu_ns, 'min_ns': cpu_ns, 'number': 1, 'repeat': 1,
+                                   'max_ns': BenchmarkConfig.IDLE_CPU_CEILING * 1e9,
+                                   'draws': initial.draws, 'wakeups': initial.wakeups}}
+
+
+def run(sizes=BenchmarkConfig.MAP_SIZES, repeat: int = BenchmarkConfig.REPEAT, only: str = None) -> dict:
+    """
+    Executa todos os benchmarks.
+
+    Parameters
+    ----------
+    sizes : sequence
+        Lados dos mapas gerados, além da fase padrão.
+    repeat : int
+        Quantidade de repetições de cada medição.
+    only : str, optional
+        Se informado, só roda os mapas cujo nome contém este texto.
+
+    Returns
+    -------
+    dict
+        ``meta`` (ambiente da execução) e ``results``, que associa ``"nome[mapa]"`` às medições.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((ScreenSettings.WIDTH, ScreenSettings.HEIGHT))
+
+    results = {}
+
+    def report(group: dict, map_name: str):
+        for name, result in group.items():
+            results[f'{name}[{map_name}]'] = result
+            print(f'{name:<24}{map_name:<14}{result["median_ns"] / 1000:12.1f} us', flush=True)
+
+    report(bench_assets(repeat), '-')
+    report(bench_idle(screen), '-')
+    for level in [load_level()] + [generate_level(size) for size in sizes]:
+        if only and only not in level.name:
+            continue
+        report(bench_player(level, repeat), level.name)
+        report(bench_game(screen, level, repeat), level.name)
+
+    meta = {'python': platform.python_version(), 'pygame': pygame.version.ver,
+            'numpy': np.__version__, 'machine': platform.machine(), 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def compare(results: dict, baseline: dict, threshold: float = BenchmarkConfig.THRESHOLD) -> list:
+    """
+    Compara as medianas com as da referência.
+
+    Returns
+    -------
+    list
+        Trios (nome, mediana da referência, mediana atual) dos benchmarks mais
+        lentos que ``threshold`` vezes a referência. Benchmarks ausentes na referência são ignorados.
+        Resultados com ``max_ns`` são comparados só com esse limite absoluto, que
+        aparece no lugar da mediana da referência.
+    """
+    regressions = []
+    for name, result in results['results'].items():
+        if 'max_ns' in result:
+            if result['median_ns'] > result['max_ns']:
+                regressions.append((name, result['max_ns'], result['median_ns']))
+            continue
+        reference = baseline['results'].get(name)
+        if reference is not None and result['median_ns'] > threshold * reference['median_ns']:
+            regressions.append((name, reference['median_ns'], result['median_ns']))
+    return regressions
+
+
+def main(argv=None) -> int:
+    """
+    Executa os benchmarks pela linha de comando. Devolve 1 se houver regressão.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmarks dos trechos mais executados do jogo.')
+    parser.add_argument('--sizes', type=int, nargs='*', default=list(BenchmarkConfig.MAP_SIZES),
+                        help='lados dos mapas gerados')
+    parser.add_argument('--repeat', type=int, default=BenchmarkConfig.REPEAT, help='repetições de cada medição')
+    parser.add_argument('--only', help='só roda os mapas cujo nome contém este texto')
+    parser.add_argument('--out', default=BenchmarkConfig.RESULTS_PATH, help='arquivo JSON dos resultados')
+    parser.add_argument('--baseline', default=BenchmarkConfig.BASELINE_PATH, help='arquivo JSON de referência')
+    parser.add_argument('--save-baseline', action='store_true', help='grava os resultados como nova referência')
+    parser.add_argument('--threshold', type=float, default=BenchmarkConfig.THRESHOLD,
+                        help='razão máxima entre a mediana atual e a da referência')
+    args = parser.parse_args(argv)
+
+    # Sem janela e sem som
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    results = run(args.sizes, args.repeat, args.only)
+    with open(args.out, 'w') as file:
+        json.dump(results, file, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=1)
+        print(f'referência gravada em {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'sem referência em {args.baseline}; use --save-baseline')
+        return 0
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file), args.threshold)
+    for name, reference, current in regressions:
+        print(f'REGRESSÃO {name}: {reference / 1000:.1f} us -> {current / 1000:.1f} us ({current / reference:.2f}x)')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Módulo responsável pela câmera e pela divisão do mapa em pedaços (chunks).
+
+As posições dos jogadores e dos tiles ficam em coordenadas do mundo (pixels a
+partir do canto superior esquerdo do mapa). A ``Camera`` define qual parte do
+mundo aparece na tela, e o ``ChunkCache`` mantém pré-desenhados apenas os chunks
+próximos da câmera, criando e descartando os demais sob demanda. Assim o custo de
+cada frame depende do tamanho da tela, e não do tamanho da fase.
+
+As colisões não precisam de dados por chunk: o ``TileGrid`` consulta a grade da
+fase diretamente, e como ela é mapeada em memória só as páginas perto dos
+jogadores chegam a ser lidas do disco.
+"""
+
+
+import pygame
+from .config import Colors, CameraConfig
+from .tiles import TileMap
+
+
+class Camera:
+    """
+    Janela retangular sobre o mundo que acompanha os jogadores.
+
+    Atributes:
+    ----------
+    rect : pygame.Rect
+        Área do mundo mostrada na tela.
+    world : pygame.Rect
+        Área total do mundo.
+    """
+
+    def __init__(self, view_size: tuple, world_size: tuple):
+        """
+        Parameters
+        ----------
+        view_size : tuple
+            Largura e altura da tela, em pixels.
+        world_size : tuple
+            Largura e altura do mapa, em pixels.
+        """
+        self.rect = pygame.Rect((0, 0), view_size)
+        self.world = pygame.Rect((0, 0), world_size)
+        self.rect.clamp_ip(self.world)
+
+    @property
+    def scrolling(self) -> bool:
+        """
+        Indica se o mundo é maior que a tela, ou seja, se a câmera pode se mover.
+        """
+        return self.world.width > self.rect.width or self.world.height > self.rect.height
+
+    def follow(self, rects) -> bool:
+        """
+        Centraliza a câmera no ponto médio dos retângulos, sem sair do mundo.
+
+        Returns
+        -------
+        bool
+            True se a câmera se moveu.
+        """
+        previous = self.rect.topleft
+        self.rect.center = (sum(rect.centerx for rect in rects) // len(rects),
+                            sum(rect.centery for rect in rects) // len(rects))
+        self.rect.clamp_ip(self.world)
+        return self.rect.topleft != previous
+
+    def apply(self, rect: pygame.Rect) -> pygame.Rect:
+        """
+        Converte um retângulo do mundo para coordenadas da tela.
+        """
+        return rect.move(-self.rect.x, -self.rect.y)
+
+
+class ChunkCache:
+    """
+    Superfícies pré-desenhadas dos chunks do mapa próximos da câmera.
+
+    Atributes:
+    ----------
+    chunk_size : int
+        Lado de um chunk, em pixels.
+    baked : int
+        Quantidade de chunks desenhados desde a criação do cache.
+    evicted : int
+        Quantidade de chunks descartados por estarem longe da câmera.
+    """
+
+    def __init__(self, level, assets, doors=(), chunk_tiles: int = CameraConfig.CHUNK_TILES,
+                 margin: int = CameraConfig.CHUNK_MARGIN):
+        """
+        Parameters
+        ----------
+        level : Level
+            A fase a ser desenhada.
+        assets : AssetManager
+            De onde vêm as imagens dos tiles.
+        doors : sequence
+            Pares (cor, pygame.Rect) das portas, desenhadas junto com o cenário.
+        chunk_tiles : int
+            Quantidade de tiles em cada lado de um chunk.
+        margin : int
+            Quantidade de chunks além da área visível mantidos na memória.
+        """
+        self.level = level
+        self.tile_map = TileMap(level.tiles, level.tile_size)
+        self.assets = assets
+        self.doors = list(doors)
+        self.chunk_tiles = chunk_tiles
+        self.chunk_size = chunk_tiles * level.tile_size
+        self.margin = margin
+        self.columns = -(-level.columns // chunk_tiles)
+        self.rows = -(-level.rows // chunk_tiles)
+        self._chunks = {}
+        self.baked = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __chunk_range(self, view: pygame.Rect, margin: int) -> tuple:
+        """
+        Intervalos de colunas e linhas de chunks que cobrem a área, com margem.
+        """
+        size = self.chunk_size
+        first_column = max(view.left // size - margin, 0)
+        last_column = min((view.right - 1) // size + margin, self.columns - 1)
+        first_row = max(view.top // size - margin, 0)
+        last_row = min((view.bottom - 1) // size + margin, self.rows - 1)
+        return range(first_column, last_column + 1), range(first_row, last_row + 1)
+
+    def update(self, view: pygame.Rect) -> list:
+        """
+        Prepara os chunks visíveis e descarta os que ficaram longe da câmera.
+
+        Parameters
+        ----------
+        view : pygame.Rect
+            Área do mundo mostrada na tela.
+
+        Returns
+        -------
+        list
+            Pares (superfície, posição no mundo) dos chunks visíveis.
+        """
+        columns, rows = self.__chunk_range(view, 0)
+        visible = []
+        for row in rows:
+            for column in columns:
+                surface = self._chunks.get((column, row))
+                if surface is None:
+                    surface = self._chunks[(column, row)] = self.__bake(column, row)
+                visible.append((surface, (column * self.chunk_size, row * self.chunk_size)))
+
+        keep_columns, keep_rows = self.__chunk_range(view, self.margin)
+        for key in [key for key in self._chunks if key[0] not in keep_columns or key[1] not in keep_rows]:
+            del self._chunks[key]
+            self.evicted += 1
+        return visible
+
+    def __bake(self, column: int, row: int) -> pygame.Surface:
+        """
+        Desenha os tiles e as portas de um chunk em uma superfície própria.
+        """
+        size = self.level.tile_size
+        first_column = column * self.chunk_tiles
+        first_row = row * self.chunk_tiles
+        tiles = self.level.tiles[first_row:first_row + self.chunk_tiles, first_column:first_column + self.chunk_tiles]
+
+        surface = pygame.Surface((tiles.shape[1] * size, tiles.shape[0] * size)).convert()
+        surface.fill(Colors.WHITE)
+        origin = (first_column * size, first_row * size)
+        self.tile_map.draw(surface, self.assets, pygame.Rect(origin, surface.get_size()))
+
+        for color, door in self.doors:
+            pygame.draw.rect(surface, color, door.move(-origin[0], -origin[1]))
+        self.baked += 1
+        return surface
@@ -0,0 +1,106 @@
+"""
+Módulo responsável pelo índice espacial usado nas colisões com o cenário.
+
+Como todos os tiles estão alinhados a uma grade de ``TilesConfig.TILE_SIZE``,
+basta olhar as poucas células que o retângulo do jogador ocupa para saber com
+quais tiles ele colide, independente do tamanho do mapa.
+"""
+
+
+import pygame
+from array import array
+from .config import Map, TilesConfig
+
+
+class TileGrid:
+    """
+    Grade uniforme com o tipo de tile de cada célula do mapa.
+
+    Atributes:
+    ----------
+    tile_size : int
+        Tamanho, em pixels, de cada célula da grade.
+    rows : int
+        Quantidade de linhas do mapa.
+    columns : int
+        Quantidade de colunas do mapa.
+    """
+
+    def __init__(self, grid, tile_size: int = TilesConfig.TILE_SIZE):
+        """
+        Constrói o índice a partir de uma matriz de tipos de tile.
+
+        Parameters
+        ----------
+        grid : list or numpy.ndarray
+            Matriz no formato de ``Map.MAP``, ou matriz int8 contígua (como
+            ``Level.tiles``), que é usada sem cópia.
+        tile_size : int
+            Tamanho, em pixels, de cada célula.
+        """
+        self.tile_size = tile_size
+        if isinstance(grid, list):
+            self.rows = len(grid)
+            self.columns = len(grid[0]) if self.rows else 0
+            self._cells = array('b', [tile_type for row in grid for tile_type in row])
+        else:
+            self.rows, self.columns = grid.shape
+            self._cells = memoryview(grid).cast('B').cast('b')
+
+    @property
+    def width(self) -> int:
+        """
+        Largura do mapa em pixels.
+        """
+        return self.columns * self.tile_size
+
+    @property
+    def height(self) -> int:
+        """
+        Altura do mapa em pixels.
+        """
+        return self.rows * self.tile_size
+
+    def tile_at(self, row: int, column: int) -> int:
+        """
+        Devolve o tipo do tile na célula, ou ``Map.EMPTY`` se estiver fora do mapa.
+        """
+        if 0 <= row < self.rows and 0 <= column < self.columns:
+            return self._cells[row * self.columns + column]
+        return Map.EMPTY
+
+    def collide(self, rect: pygame.Rect, tile_types=None) -> list:
+        """
+        Procura os tiles que colidem com o retângulo.
+
+        Os resultados seguem a ordem linha a linha do mapa, a mesma em que os
+        tiles eram adicionados aos grupos de sprites.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            Retângulo a ser testado, em coordenadas da tela.
+        tile_types : tuple, optional
+            Tipos de tile de interesse. Se None, considera todos os tiles não vazios.
+
+        Returns
+        -------
+        list
+            Lista de pares (tipo do tile, pygame.Rect do tile).
+        """
+        size = self.tile_size
+        first_row = max(rect.top // size, 0)
+        last_row = min((rect.bottom - 1) // size, self.rows - 1)
+        first_column = max(rect.left // size, 0)
+        last_column = min((rect.right - 1) // size, self.columns - 1)
+
+        collisions = []
+        cells = self._cells
+        for row in range(first_row, last_row + 1):
+            offset = row * self.columns
+            for column in range(first_column, last_column + 1):
+                tile_type = cells[offset + column]
+                if tile_type == Map.EMPTY or (tile_types is not None and tile_type not in tile_types):
+                    continue
+                collisions.append((tile_type, pygame.Rect(column * size, row * size, size, size)))
+        return collisions
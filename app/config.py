@@ -70,6 +70,14 @@ class ScreenSettings:
     FPS : int
         Número de frames por segundo.
 
+    DIRTY_RECTS : bool
+        Se True, o cenário é pré-desenhado em uma superfície e a cada frame só
+        as áreas cobertas ou descobertas pelos jogadores são atualizadas.
+
+    IDLE_TIMEOUT_MS : int
+        Tempo máximo, em milissegundos, que uma tela estática fica esperando
+        eventos antes de verificar se precisa ser redesenhada.
+
     Example:
     --------
     Acesso às constantes (saída pode ser alterada dependendo da config desejada):
@@ -83,6 +91,8 @@ class ScreenSettings:
     WIDTH = 800 # Largura da tela
     HEIGHT = 800 # Altura da tela
     FPS = 60 # Frames por segundo
+    DIRTY_RECTS = True # Atualiza só as áreas da tela que mudaram
+    IDLE_TIMEOUT_MS = 500 # Espera máxima das telas estáticas por um evento
 
 
 class InitialScreenSettings:
@@ -268,6 +278,43 @@ class TilesConfig:
     TILE_SIZE = 40
 
 
+class AtlasConfig:
+    """
+    Classe responsável por armazenar as configurações do atlas de texturas.
+
+    Constants:
+    ----------
+    PAGE_SIZE : int
+        Lado, em pixels, de cada folha onde as imagens escaladas são empacotadas.
+
+    Example:
+    --------
+    Acesso à constante:
+        >>> print(AtlasConfig.PAGE_SIZE)   # Saída: 512
+    """
+
+    PAGE_SIZE = 512
+
+
+class BakeConfig:
+    """
+    Classe responsável por armazenar as configurações das imagens pré-processadas.
+
+    Constants:
+    ----------
+    CACHE_DIR : str
+        Diretório, relativo à raiz do projeto, onde ficam as imagens já escaladas
+        e convertidas em pixels crus (None para decodificar e escalar a cada execução).
+
+    Example:
+    --------
+    Acesso à constante:
+        >>> print(BakeConfig.CACHE_DIR)   # Saída: '.cache/assets'
+    """
+
+    CACHE_DIR = '.cache/assets'
+
+
 class PlayerConfig:
     """
     Classe responsável por armazenar as configurações do jogador.
@@ -286,6 +333,9 @@ class PlayerConfig:
     JUMP_SIZE : int
         Define a velocidade inicial no pulo. Valor padrão: TILE_SIZE da classe TilesConfig.
 
+    TERMINAL_VELOCITY : int
+        Maior velocidade de queda alcançada com a gravidade. Valor padrão: 2 vezes TILE_SIZE da classe TilesConfig.
+
     WATERGIRL_IMG : str
         Chave do dicionário de assets que representa a imagem da personagem Watergirl.
 
@@ -301,6 +351,12 @@ class PlayerConfig:
     FALLING : str
         Estado do jogador durante a queda.
 
+    FIREBOY_SPAWN : tuple
+        Linha e coluna do mapa onde o Fireboy começa a fase.
+
+    WATERGIRL_SPAWN : tuple
+        Linha e coluna do mapa onde a Watergirl começa a fase.
+
     Example:
     --------
     Acesso às constantes (algumas saídas podem ser alteradas dependendo da config desejada):
@@ -309,6 +365,7 @@ class PlayerConfig:
         >>> print(PlayerConfig.PLAYER_WIDTH)   # Saída: 40
         >>> print(PlayerConfig.PLAYER_HEIGHT)  # Saída: 60
         >>> print(PlayerConfig.JUMP_SIZE)      # Saída: 40
+        >>> print(PlayerConfig.TERMINAL_VELOCITY)  # Saída: 80
         >>> print(PlayerConfig.WATERGIRL_IMG)  # Saída: 'watergirl_img'
         >>> print(PlayerConfig.FIREBOY_IMG)    # Saída: 'fireboy_img'
         >>> print(PlayerConfig.STILL)           # Saída: 'still'
@@ -323,6 +380,8 @@ class PlayerConfig:
 
     JUMP_SIZE = TilesConfig.TILE_SIZE
 
+    TERMINAL_VELOCITY = 2 * TilesConfig.TILE_SIZE
+
     WATERGIRL_IMG = 'watergirl_img'
     FIREBOY_IMG = 'fireboy_img'
 
@@ -330,6 +389,9 @@ class PlayerConfig:
     JUMPING = 'jumping'
     FALLING = 'falling'
 
+    FIREBOY_SPAWN = (20, 0)
+    WATERGIRL_SPAWN = (20, 1)
+
 
 class DoorConfig:
     """
@@ -343,6 +405,12 @@ class DoorConfig:
     DOOR_WIDTH : int
         Largura das portas no jogo.
 
+    FIREDOOR_POS : tuple
+        Posição (x, y), em pixels, da porta do Fireboy.
+
+    WATERDOOR_POS : tuple
+        Posição (x, y), em pixels, da porta da Watergirl.
+
     Example:
     --------
     Acesso às constantes:
@@ -351,4 +419,414 @@ class DoorConfig:
     """
 
     DOOR_HEIGHT = 60
-    DOOR_WIDTH = 40
\ No newline at end of file
+    DOOR_WIDTH = 40
+
+    FIREDOOR_POS = (0, 20)
+    WATERDOOR_POS = (40, 20)
+
+
+class CameraConfig:
+    """
+    Classe responsável por armazenar as configurações da câmera e dos pedaços (chunks) do mapa.
+
+    Constants:
+    ----------
+    CHUNK_TILES : int
+        Quantidade de tiles em cada lado de um chunk.
+
+    CHUNK_MARGIN : int
+        Quantidade de chunks além da área visível que continuam prontos na memória.
+        Chunks mais distantes do que isso são descartados.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(CameraConfig.CHUNK_TILES)    # Saída: 16
+        >>> print(CameraConfig.CHUNK_MARGIN)   # Saída: 1
+    """
+
+    CHUNK_TILES = 16
+    CHUNK_MARGIN = 1
+
+
+class Actions:
+    """
+    Classe que define as ações que um jogador pode executar em um frame.
+
+    As ações são bits que podem ser combinados, de forma que as entradas de um
+    jogador em um frame cabem em um único inteiro.
+
+    Constants:
+    ----------
+    NONE : int
+        Nenhuma ação.
+
+    LEFT : int
+        Anda para a esquerda enquanto estiver ativa.
+
+    RIGHT : int
+        Anda para a direita enquanto estiver ativa.
+
+    JUMP : int
+        Pula (só tem efeito se o jogador estiver parado).
+
+    Example:
+    --------
+    Combinação de ações:
+        >>> print(Actions.RIGHT | Actions.JUMP)   # Saída: 6
+    """
+
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    JUMP = 4
+
+class ControlsConfig:
+    """
+    Classe responsável por armazenar as teclas de controle do jogo.
+
+    As teclas são identificadas pelos nomes usados por ``pygame.key.key_code``,
+    então podem ser trocadas aqui sem mexer no código das telas.
+
+    Constants:
+    ----------
+    BINDINGS : dict
+        Associa o nome de cada tecla ao par (elemento do jogador, ação de ``Actions``).
+
+    VOLUME_UP : str
+        Tecla que aumenta o volume enquanto estiver pressionada.
+
+    VOLUME_DOWN : str
+        Tecla que diminui o volume enquanto estiver pressionada.
+
+    VOLUME_STEP : float
+        Quanto o volume muda a cada frame com a tecla de volume pressionada.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(ControlsConfig.BINDINGS['up'])   # Saída: ('water', 4)
+        >>> print(ControlsConfig.VOLUME_UP)        # Saída: 'k'
+    """
+
+    BINDINGS = {
+        'left': ('water', Actions.LEFT),
+        'right': ('water', Actions.RIGHT),
+        'up': ('water', Actions.JUMP),
+        'a': ('fire', Actions.LEFT),
+        'd': ('fire', Actions.RIGHT),
+        'w': ('fire', Actions.JUMP),
+    }
+
+    VOLUME_UP = 'k'
+    VOLUME_DOWN = 'l'
+    VOLUME_STEP = 0.01
+
+
+class ProfilerConfig:
+    """
+    Classe responsável por armazenar as configurações da medição de tempo dos frames.
+
+    Constants:
+    ----------
+    ENABLED : bool
+        Se as etapas de cada frame são medidas desde o início do jogo.
+
+    WINDOW : int
+        Quantidade de frames recentes usados no cálculo dos percentis.
+
+    MAX_RECORDS : int
+        Quantidade máxima de frames guardados para exportação; os mais antigos são descartados.
+
+    OVERLAY_KEY : str
+        Tecla que liga e desliga o resumo das medições na tela.
+
+    EXPORT_PATH : str
+        Arquivo (.csv ou .json) onde as medições são gravadas ao fechar o jogo.
+        Se None, as medições não são gravadas.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(ProfilerConfig.ENABLED)       # Saída: False
+        >>> print(ProfilerConfig.OVERLAY_KEY)   # Saída: 'f3'
+    """
+
+    ENABLED = False
+    WINDOW = 600
+    MAX_RECORDS = 36000
+    OVERLAY_KEY = 'f3'
+    EXPORT_PATH = None
+
+
+class BenchmarkConfig:
+    """
+    Classe responsável por armazenar as configurações da suíte de benchmarks.
+
+    Constants:
+    ----------
+    MAP_SIZES : tuple
+        Lados (em tiles) dos mapas quadrados gerados, além da fase padrão.
+
+    REPEAT : int
+        Quantidade de repetições de cada medição; a mediana é comparada com a referência.
+
+    THRESHOLD : float
+        Razão máxima entre a mediana atual e a da referência antes de a execução falhar.
+
+    IDLE_CPU_CEILING : float
+        Fração máxima de um núcleo que a tela parada pode usar. É um limite absoluto,
+        verificado sem comparar com a referência, já que perto de zero qualquer
+        ruído do sistema daria uma razão alta.
+
+    RESULTS_PATH : str
+        Arquivo JSON onde os resultados são gravados.
+
+    BASELINE_PATH : str
+        Arquivo JSON com os resultados de referência.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(BenchmarkConfig.MAP_SIZES)   # Saída: (20, 100, 250, 500, 1000)
+        >>> print(BenchmarkConfig.THRESHOLD)   # Saída: 1.25
+    """
+
+    MAP_SIZES = (20, 100, 250, 500, 1000)
+    REPEAT = 5
+    THRESHOLD = 1.25
+    IDLE_CPU_CEILING = 0.05
+    RESULTS_PATH = 'benchmark.json'
+    BASELINE_PATH = 'benchmark_baseline.json'
+
+
+class AudioConfig:
+    """
+    Classe responsável por armazenar as configurações das músicas de fundo.
+
+    Constants:
+    ----------
+    MENU_TRACK : str
+        Chave da música da tela inicial.
+
+    GAME_TRACK : str
+        Chave da música do jogo.
+
+    VOLUME : float
+        Volume inicial das músicas, entre 0 e 1.
+
+    FADE_MS : int
+        Duração do crossfade entre duas músicas, em milissegundos.
+
+    WARM_TRACKS : int
+        Quantidade de músicas decodificadas mantidas na memória.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(AudioConfig.GAME_TRACK)   # Saída: 'game_music'
+        >>> print(AudioConfig.FADE_MS)      # Saída: 500
+    """
+
+    MENU_TRACK = 'menu_music'
+    GAME_TRACK = 'game_music'
+    VOLUME = 0.5
+    FADE_MS = 500
+    WARM_TRACKS = 2
+
+
+class SolverConfig:
+    """
+    Classe responsável por armazenar as configurações da verificação de fases.
+
+    Constants:
+    ----------
+    MAX_FRAMES : int
+        Profundidade máxima da busca, em frames (um minuto de jogo).
+
+    PROCESSES : int
+        Quantidade de processos auxiliares (None para um por CPU, 0 para nenhum).
+
+    CHUNK : int
+        Quantidade de estados da fronteira expandidos por vez em cada processo.
+        Fronteiras menores são expandidas no próprio processo.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(SolverConfig.MAX_FRAMES)  # Saída: 3600
+        >>> print(SolverConfig.CHUNK)       # Saída: 4096
+    """
+
+    MAX_FRAMES = 3600
+    PROCESSES = None
+    CHUNK = 4096
+
+
+class AIConfig:
+    """
+    Classe responsável por armazenar as configurações do jogador controlado pelo computador.
+
+    Constants:
+    ----------
+    PARTNER : str
+        Elemento do jogador controlado pelo computador ('fire' ou 'water'), ou
+        None para que os dois sejam controlados pelo teclado.
+
+    MACRO_FRAMES : int
+        Duração máxima de um movimento (andar, pular ou cair) entre dois pontos do grafo.
+
+    JUMP_DELAYS : tuple
+        Frames em que o pulo sobe reto antes de seguir na direção escolhida.
+
+    CACHE_DIR : str
+        Diretório, relativo à raiz do projeto, onde os grafos de navegação são guardados.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(AIConfig.MACRO_FRAMES)   # Saída: 120
+        >>> print(AIConfig.JUMP_DELAYS)    # Saída: (0, 3, 6)
+    """
+
+    PARTNER = None
+    MACRO_FRAMES = 120
+    JUMP_DELAYS = (0, 3, 6)
+    CACHE_DIR = '.cache/nav'
+
+
+class EnvConfig:
+    """
+    Classe responsável por armazenar as configurações do ambiente de treino de agentes.
+
+    Constants:
+    ----------
+    VIEW_ROWS : int
+        Quantidade de linhas do recorte da grade em volta de cada jogador.
+
+    VIEW_COLUMNS : int
+        Quantidade de colunas do recorte da grade em volta de cada jogador.
+
+    MAX_FRAMES : int
+        Duração máxima de um episódio, em frames.
+
+    WIN_REWARD : float
+        Recompensa de cada jogador quando a fase é vencida.
+
+    LOSS_REWARD : float
+        Recompensa de cada jogador quando a fase é perdida.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(EnvConfig.VIEW_ROWS)     # Saída: 9
+        >>> print(EnvConfig.MAX_FRAMES)    # Saída: 3600
+    """
+
+    VIEW_ROWS = 9
+    VIEW_COLUMNS = 9
+    MAX_FRAMES = 3600
+    WIN_REWARD = 1.0
+    LOSS_REWARD = -1.0
+
+
+class NetworkConfig:
+    """
+    Classe responsável por armazenar as configurações do modo em rede.
+
+    Constants:
+    ----------
+    HOST : str
+        Endereço em que o servidor escuta e ao qual os clientes se conectam.
+
+    PORT : int
+        Porta TCP do servidor.
+
+    TICK_RATE : int
+        Frames simulados por segundo pelo servidor.
+
+    HISTORY : int
+        Quantidade de estados enviados guardados como base da compressão por diferença.
+
+    MAX_QUEUED_INPUTS : int
+        Quantidade máxima de ações de um cliente esperando para serem simuladas
+        pelo servidor; além disso, as mais antigas são descartadas.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(NetworkConfig.PORT)        # Saída: 5555
+        >>> print(NetworkConfig.TICK_RATE)   # Saída: 60
+    """
+
+    HOST = '127.0.0.1'
+    PORT = 5555
+    TICK_RATE = ScreenSettings.FPS
+    HISTORY = 64
+    MAX_QUEUED_INPUTS = 6
+
+
+class RollbackConfig:
+    """
+    Classe responsável por armazenar as configurações da sessão com rollback.
+
+    Constants:
+    ----------
+    MAX_ROLLBACK : int
+        Quantidade máxima de frames que podem ser simulados de novo quando uma
+        previsão da ação remota estiver errada. Também é o quanto a sessão pode
+        avançar sem ter recebido ações do outro jogador.
+
+    PORT : int
+        Porta UDP usada entre as duas máquinas.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(RollbackConfig.MAX_ROLLBACK)   # Saída: 8
+        >>> print(RollbackConfig.PORT)           # Saída: 5556
+    """
+
+    MAX_ROLLBACK = 8
+    PORT = 5556
+
+
+class PacingConfig:
+    """
+    Classe responsável por armazenar as configurações do ritmo da simulação e do desenho.
+
+    Constants:
+    ----------
+    TICK_RATE : int
+        Passos da simulação por segundo, independente de quantos frames são desenhados.
+
+    FRAME_CAP : int
+        Limite de frames desenhados por segundo (0 para não limitar).
+
+    MODE : str
+        Forma de esperar o próximo frame: 'sleep' (dorme até o horário) ou 'busy'
+        (dorme até ``SPIN_MS`` antes e espera o resto verificando o relógio, mais preciso).
+
+    SPIN_MS : float
+        Margem, em milissegundos, esperada verificando o relógio no modo 'busy'.
+
+    MAX_STEPS : int
+        Passos máximos da simulação em um frame; o atraso além disso é descartado
+        para que um frame lento não cause uma sequência de frames cada vez mais lentos.
+
+    WINDOW : int
+        Quantidade de frames recentes usados nas estatísticas de ritmo.
+
+    Example:
+    --------
+    Acesso às constantes:
+        >>> print(PacingConfig.TICK_RATE)   # Saída: 60
+        >>> print(PacingConfig.MODE)        # Saída: 'sleep'
+    """
+
+    TICK_RATE = ScreenSettings.FPS
+    FRAME_CAP = 144
+    MODE = 'sleep'
+    SPIN_MS = 2.0
+    MAX_STEPS = 5
+    WINDOW = 600
@@ -0,0 +1,70 @@
+"""
+Módulo responsável por transformar o estado do teclado em ações dos jogadores.
+
+O teclado é lido uma única vez por frame (``pygame.key.get_pressed``) e a
+tabela de teclas de ``ControlsConfig`` diz qual ação de qual jogador cada tecla
+ativa. O custo por frame depende só da quantidade de teclas configuradas, e não
+da quantidade de eventos ou de jogadores.
+"""
+
+
+import pygame
+from .config import Actions, ControlsConfig
+
+
+class Controls:
+    """
+    Tabela de teclas que gera as ações de cada jogador a partir de um retrato do teclado.
+
+    Atributes:
+    ----------
+    targets : list
+        Elementos dos jogadores controlados, na ordem das ações devolvidas por ``read``.
+    """
+
+    def __init__(self, targets, bindings: dict = ControlsConfig.BINDINGS):
+        """
+        Parameters
+        ----------
+        targets : sequence
+            Elementos dos jogadores (por exemplo ``['water', 'fire']``), na ordem desejada.
+        bindings : dict
+            Associa o nome de cada tecla ao par (elemento do jogador, ação).
+        """
+        self.targets = list(targets)
+        slots = {target: index for index, target in enumerate(self.targets)}
+        self._table = [(pygame.key.key_code(name), slots[target], action)
+                       for name, (target, action) in bindings.items() if target in slots]
+        self._previous = [Actions.NONE] * len(self.targets)
+
+    def reset(self):
+        """
+        Esquece as teclas do frame anterior.
+        """
+        self._previous = [Actions.NONE] * len(self.targets)
+
+    def read(self, pressed) -> list:
+        """
+        Calcula as ações de cada jogador a partir de um retrato do teclado.
+
+        O pulo só é gerado no frame em que a tecla passa a ser pressionada; as
+        direções valem enquanto a tecla estiver segurada.
+
+        Parameters
+        ----------
+        pressed : sequence
+            O retrato do teclado devolvido por ``pygame.key.get_pressed``.
+
+        Returns
+        -------
+        list
+            As ações (bits de ``Actions``) de cada jogador, na ordem de ``targets``.
+        """
+        held = [Actions.NONE] * len(self.targets)
+        for key, slot, action in self._table:
+            if pressed[key]:
+                held[slot] |= action
+
+        actions = [current & ~(previous & Actions.JUMP) for current, previous in zip(held, self._previous)]
+        self._previous = held
+        return actions
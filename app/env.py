@@ -0,0 +1,314 @@
+"""
+Módulo responsável pelo ambiente de treino de agentes.
+
+O ``GameEnv`` expõe a ``Simulation`` com a interface usual de aprendizado por
+reforço (``reset`` e ``step``), sem janela, sem relógio e sem eventos do
+teclado. As observações são arrays NumPy montados direto da grade da fase e do
+estado dos jogadores, sem desenhar nada: um recorte da grade em volta de cada
+jogador e um vetor com o estado de cada um.
+
+O ``VecEnv`` roda N ambientes divididos entre processos. Ações, observações,
+recompensas e fins de episódio ficam em memória compartilhada, então cada passo
+troca só uma mensagem curta com cada processo. A vazão só cresce com a
+quantidade de processos se houver um núcleo livre para cada um; com um único
+núcleo, o ``VecEnv`` é mais lento que um ``GameEnv`` pelo custo das mensagens.
+
+Uso pela linha de comando (mede passos por segundo)::
+
+    python -m app.env --envs 8 --steps 20000
+"""
+
+
+import multiprocessing
+import numpy as np
+from multiprocessing import shared_memory
+from .config import EnvConfig
+from .batch import STATE_CODES
+from .level import Level, load_level
+from .simulation import Simulation
+
+
+# Valor das células do recorte que ficam fora do mapa
+OUTSIDE = -2
+
+# Colunas do vetor de estado de cada jogador
+PLAYER_FEATURES = ('x', 'y', 'speedx', 'speedy', 'state', 'health', 'life', 'door_dx', 'door_dy')
+
+
+class GameEnv:
+    """
+    Ambiente de uma fase, com os dois jogadores controlados pelo agente.
+
+    Atributes:
+    ----------
+    simulation : Simulation
+        Estado e regras da fase.
+    max_frames : int
+        Duração máxima de um episódio, em frames.
+    grid_shape : tuple
+        Formato da observação da grade: (jogadores, linhas, colunas).
+    players_shape : tuple
+        Formato da observação dos jogadores: (jogadores, ``len(PLAYER_FEATURES)``).
+    """
+
+    def __init__(self, level=None, max_frames: int = EnvConfig.MAX_FRAMES,
+                 view: tuple = (EnvConfig.VIEW_ROWS, EnvConfig.VIEW_COLUMNS)):
+        """
+        Parameters
+        ----------
+        level : Level or str, optional
+            A fase ou o nome dela. Se None, a fase padrão.
+        max_frames : int
+            Duração máxima de um episódio, em frames.
+        view : tuple
+            Linhas e colunas do recorte da grade em volta de cada jogador.
+        """
+        if level is None or isinstance(level, str):
+            level = load_level(level) if level else load_level()
+        self.simulation = Simulation(level)
+        self.max_frames = max_frames
+        self._view = view
+        self.grid_shape = (len(self.simulation.players),) + tuple(view)
+        self.players_shape = (len(self.simulation.players), len(PLAYER_FEATURES))
+
+        # Grade com borda, para que o recorte nunca saia do array
+        self._padded = np.pad(np.asarray(level.tiles, dtype=np.int8), ((view[0], view[0]), (view[1], view[1])),
+                              constant_values=OUTSIDE)
+        self._doors = [self.simulation.waterdoor if player.element == 'water' else self.simulation.firedoor
+                       for player in self.simulation.players]
+
+    def reset(self) -> dict:
+        """
+        Recomeça a fase e devolve a primeira observação.
+        """
+        self.simulation.reset()
+        return self.observe()
+
+    def step(self, actions) -> tuple:
+        """
+        Avança um frame com as ações (bits de ``Actions``) de cada jogador, na ordem de ``Simulation.players``.
+
+        Returns
+        -------
+        tuple
+            Observação, recompensa, se o episódio terminou e um dicionário com o
+            resultado e o frame atual.
+        """
+        simulation = self.simulation
+        simulation.step(actions)
+        reward = 0.0
+        if simulation.result == 'win':
+            reward = EnvConfig.WIN_REWARD
+        elif simulation.result == 'lost':
+            reward = EnvConfig.LOSS_REWARD
+        done = not simulation.running_phase or simulation.frame >= self.max_frames
+        return self.observe(), reward, done, {'result': simulation.result, 'frame': simulation.frame}
+
+    def observe(self, grid: np.ndarray = None, players: np.ndarray = None) -> dict:
+        """
+        Monta a observação atual, opcionalmente dentro de arrays já alocados.
+
+        Returns
+        -------
+        dict
+            ``grid``: recorte (int8) da grade centrado em cada jogador, com ``OUTSIDE``
+            fora do mapa; ``players``: estado (float32) de cada jogador, nas
+            colunas de ``PLAYER_FEATURES``.
+        """
+        if grid is None:
+            grid = np.empty(self.grid_shape, dtype=np.int8)
+        if players is None:
+            players = np.empty(self.players_shape, dtype=np.float32)
+
+        rows, columns = self._view
+        tile_size = self.simulation.level.tile_size
+        for index, (player, door) in enumerate(zip(self.simulation.players, self._doors)):
+            rect = player.rect
+            row = min(max(rect.centery // tile_size, -rows // 2), self.simulation.level.rows + rows // 2)
+            column = min(max(rect.centerx // tile_size, -columns // 2), self.simulation.level.columns + columns // 2)
+            top, left = row + rows - rows // 2, column + columns - columns // 2
+            grid[index] = self._padded[top:top + rows, left:left + columns]
+            players[index] = (rect.x, rect.y, player.speedx, player.speedy, STATE_CODES[player.state],
+                              player.health, player.life, door.x - rect.x, door.y - rect.y)
+        return {'grid': grid, 'players': players}
+
+
+def _worker(connection, names: dict, shapes: dict, first: int, count: int, level: Level, max_frames: int):
+    """
+    Roda os ambientes ``first`` a ``first + count`` de um ``VecEnv`` em um processo auxiliar.
+    """
+    memories = {key: shared_memory.SharedMemory(name=name) for key, name in names.items()}
+    arrays = {key: np.ndarray(shapes[key][0], dtype=shapes[key][1], buffer=memories[key].buf) for key in names}
+    envs = [GameEnv(level, max_frames) for _ in range(count)]
+    try:
+        while True:
+            command = connection.recv()
+            if command == 'close':
+                break
+            for offset, env in enumerate(envs):
+                index = first + offset
+                if command == 'reset':
+                    env.simulation.reset()
+                else:
+                    _, arrays['rewards'][index], done, _ = env.step(arrays['actions'][index])
+                    arrays['dones'][index] = done
+                    if done:
+                        env.simulation.reset()
+                env.observe(arrays['grid'][index], arrays['players'][index])
+            connection.send(True)
+    finally:
+        del arrays
+        for memory in memories.values():
+            memory.close()
+
+
+class VecEnv:
+    """
+    N ambientes da mesma fase divididos entre processos auxiliares, com os dados em memória compartilhada.
+
+    Um ambiente cujo episódio termina é recomeçado em seguida, e a observação
+    devolvida para ele já é a do novo episódio.
+
+    Atributes:
+    ----------
+    num_envs : int
+        Quantidade de ambientes.
+    grid, players, actions, rewards, dones : numpy.ndarray
+        Arrays em memória compartilhada com as observações, as ações do próximo
+        passo, as recompensas e os fins de episódio de cada ambiente.
+    """
+
+    def __init__(self, num_envs: int, level=None, processes: int = None, max_frames: int = EnvConfig.MAX_FRAMES):
+        """
+        Parameters
+        ----------
+        num_envs : int
+            Quantidade de ambientes.
+        level : Level or str, optional
+            A fase ou o nome dela. Se None, a fase padrão.
+        processes : int, optional
+            Quantidade de processos auxiliares. Se None, um por CPU (no máximo um por ambiente).
+        max_frames : int
+            Duração máxima de um episódio, em frames.
+        """
+        if level is None or isinstance(level, str):
+            level = load_level(level) if level else load_level()
+        self.num_envs = num_envs
+        sample = GameEnv(level, max_frames)
+        shapes = {
+            'grid': ((num_envs,) + sample.grid_shape, np.int8),
+            'players': ((num_envs,) + sample.players_shape, np.float32),
+            'actions': ((num_envs, len(sample.simulation.players)), np.int8),
+            'rewards': ((num_envs,), np.float32),
+            'dones': ((num_envs,), np.bool_),
+        }
+        self._memories = {}
+        for key, (shape, dtype) in shapes.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self._memories[key] = shared_memory.SharedMemory(create=True, size=size)
+            setattr(self, key, np.ndarray(shape, dtype=dtype, buffer=self._memories[key].buf))
+
+        processes = min(num_envs, processes or multiprocessing.cpu_count())
+        names = {key: memory.name for key, memory in self._memories.items()}
+        self._connections = []
+        self._processes = []
+        bounds = np.linspace(0, num_envs, processes + 1).astype(int)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, daemon=True,
+                                              args=(child, names, shapes, first, last - first, level, max_frames))
+            process.start()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __broadcast(self, command: str):
+        for connection in self._connections:
+            connection.send(command)
+        for connection in self._connections:
+            connection.recv()
+
+    def reset(self) -> dict:
+        """
+        Recomeça todos os ambientes e devolve as observações (vistas sobre a memória compartilhada).
+        """
+        self.__broadcast('reset')
+        return {'grid': self.grid, 'players': self.players}
+
+    def step(self, actions) -> tuple:
+        """
+        Avança todos os ambientes um frame.
+
+        Parameters
+        ----------
+        actions : array_like
+            Matriz (N, jogadores) com as ações de cada jogador de cada ambiente.
+
+        Returns
+        -------
+        tuple
+            Observações, recompensas e fins de episódio. São vistas sobre a
+            memória compartilhada, sobrescritas no passo seguinte.
+        """
+        self.actions[:] = actions
+        self.__broadcast('step')
+        return {'grid': self.grid, 'players': self.players}, self.rewards, self.dones
+
+    def close(self):
+        """
+        Encerra os processos auxiliares e libera a memória compartilhada.
+        """
+        if not self._processes:
+            return
+        for connection in self._connections:
+            connection.send('close')
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        for key, memory in self._memories.items():
+            delattr(self, key)
+            memory.close()
+            memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description='Mede a vazão do ambiente de treino.')
+    parser.add_argument('level', nargs='?', help='nome da fase (padrão: a fase padrão)')
+    parser.add_argument('--envs', type=int, default=8, help='quantidade de ambientes do VecEnv')
+    parser.add_argument('--processes', type=int, help='processos auxiliares (padrão: um por CPU)')
+    parser.add_argument('--steps', type=int, default=20000, help='passos medidos em cada caso')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    env = GameEnv(args.level)
+    env.reset()
+    actions = rng.integers(0, 8, size=(args.steps, 2))
+    start = perf_counter()
+    for step_actions in actions:
+        if env.step(step_actions)[2]:
+            env.reset()
+    single = args.steps / (perf_counter() - start)
+    print(f'GameEnv: {single:.0f} passos/s')
+
+    with VecEnv(args.envs, args.level, args.processes) as vec_env:
+        processes = len(vec_env._processes)
+        vec_env.reset()
+        batches = max(1, args.steps // args.envs)
+        actions = rng.integers(0, 8, size=(batches, args.envs, 2))
+        start = perf_counter()
+        for step_actions in actions:
+            vec_env.step(step_actions)
+        vectorized = batches * args.envs / (perf_counter() - start)
+    print(f'VecEnv ({args.envs} ambientes, {processes} processos): {vectorized:.0f} passos/s '
+          f'({vectorized / single:.1f}x; {vectorized / processes:.0f} passos/s por processo)')
+    cores = multiprocessing.cpu_count()
+    if cores < 2 or processes > cores:
+        print(f'aviso: {cores} núcleo(s) para {processes} processos; a vazão só cresce com um núcleo livre por processo')
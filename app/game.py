@@ -6,12 +6,20 @@ de todas as outras telas possíveis que formam o jogo.
 
 from abc import abstractmethod, ABC
 import pygame
-from .assets import load_assets, img_dir
-from .player import Player
-from .config import Map, Colors, ScreenSettings, PlayerConfig, DoorConfig, InitialScreenSettings, EndScreenSettings,ModeScreenSettings
-from .tiles import Tiles
+from .assets import asset_manager
+from .simulation import Simulation
+from .level import load_level
+from .camera import Camera, ChunkCache
+from .controls import Controls
+from .replay import InputRecorder, REPLAY_EXTENSION
+from .profiler import FrameProfiler
+from .audio import audio_manager
+from .pacing import FixedTimestep, FramePacer
+from .ai import controller_for
+from .config import Map, Colors, ScreenSettings, PlayerConfig, InitialScreenSettings, EndScreenSettings,ModeScreenSettings, Actions, ControlsConfig, ProfilerConfig, AudioConfig, AIConfig, PacingConfig
 from os import path
-from math import dist
+import random
+import time
 
 
 class Screen(ABC):
@@ -20,6 +28,9 @@ class Screen(ABC):
 
     Attributes:
         screen (pygame.display): A interface pygame para renderizar a tela.
+        draws (int): Quantidade de vezes que a tela estática foi desenhada na última execução.
+        wakeups (int): Quantidade de vezes que a tela estática acordou (evento ou tempo esgotado).
+        idle_cpu (float): Fração de um núcleo usada pelo loop (sem a mixagem do áudio) na última execução de ``run``.
 
     Methods:
         __init__(self, screen: pygame.display):
@@ -29,9 +40,20 @@ class Screen(ABC):
             Método abstrato para definir o conteúdo da tela.
 
         run(self):
-            Método abstrato para executar a funcionalidade da tela.
+            Loop das telas estáticas: desenha uma vez e dorme até chegar um evento.
+            Telas animadas, como o jogo, substituem este método.
+
+        preload(self):
+            Prepara em segundo plano o que a tela vai usar, antes de ``set_screen``.
+
+        _draw(self), _handle_event(self, event), _changed(self):
+            Ganchos das telas estáticas: desenhar, tratar um evento e verificar
+            se algo mudou sem nenhum evento.
     """
 
+    # Eventos em que a janela precisa ser repintada mesmo sem mudança no conteúdo
+    REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+
     def __init__(self, screen:pygame.display):
         """
         Construtor para inicializar o objeto que herda de Screen.
@@ -45,6 +67,9 @@ class Screen(ABC):
             Para começar o pygame sempre precisa de uma interface
         """
         self.screen = screen
+        self.draws = 0
+        self.wakeups = 0
+        self.idle_cpu = 0.0
 
     @abstractmethod
     def set_screen(self):
@@ -54,25 +79,85 @@ class Screen(ABC):
         """
         ...
 
-    @abstractmethod
-    def run(self): 
+    def preload(self):
         """
-        Método abstrato para executar a funcionalidade da tela.
-        Este método deve ser implementado por subclasses concretas.
+        Prepara o que a tela vai usar (fase, imagens, músicas) antes de ``set_screen``.
+
+        Chamado pelo ``SceneManager`` em uma thread auxiliar enquanto outra tela
+        roda, então não deve desenhar na tela nem tocar músicas. Por padrão não faz nada.
         """
-        ...
+
+    def run(self):
+        """
+        Executa uma tela estática até ela ser fechada ou concluída.
+
+        A tela é desenhada uma vez e o loop dorme em ``pygame.event.wait``. Ela só
+        é desenhada de novo quando um evento a altera, quando a janela precisa ser
+        repintada ou quando ``_changed`` indicar uma mudança, verificada a cada
+        ``ScreenSettings.IDLE_TIMEOUT_MS`` sem eventos. Parada, a tela não usa a CPU.
+        """
+        self._running = True
+        self._running_phase = True
+        self.draws = self.wakeups = 0
+        start, start_cpu = time.perf_counter(), time.thread_time()
+
+        redraw = True
+        while self._running and self._running_phase:
+            if redraw:
+                self._draw()
+                pygame.display.flip()
+                self.draws += 1
+
+            event = pygame.event.wait(ScreenSettings.IDLE_TIMEOUT_MS)
+            self.wakeups += 1
+            if event.type == pygame.NOEVENT:
+                redraw = self._changed()
+            elif event.type == pygame.QUIT:
+                self._running = False
+            else:
+                redraw = self._handle_event(event) or event.type in self.REDRAW_EVENTS
+
+        elapsed = time.perf_counter() - start
+        self.idle_cpu = (time.thread_time() - start_cpu) / elapsed if elapsed else 0.0
+
+    def _draw(self):
+        """
+        Desenha a tela estática inteira. O ``flip`` é feito por ``run``.
+        """
+
+    def _handle_event(self, event) -> bool:
+        """
+        Trata um evento da tela estática.
+
+        Returns:
+            bool: True se o evento mudou o que está na tela.
+        """
+        return False
+
+    def _changed(self) -> bool:
+        """
+        Indica se a tela mudou sem nenhum evento (por exemplo, uma animação lenta).
+        """
+        return False
 
 
 class Game(Screen):
     """
     Representa a tela principal do jogo.
 
-    Esta classe controla a lógica e a execução do jogo.
+    Esta classe traduz o teclado em ações, avança a simulação da fase e a desenha.
 
     Attributes:
         screen (pygame.Surface): A superfície onde o jogo será renderizado.
-        _countwaterwin (int): Contador de vitórias da água.
-        _countfirewin (int): Contador de vitórias do fogo.
+        simulation (Simulation): Estado e regras da fase, independentes da tela.
+        record_dir (str): Diretório onde as partidas são gravadas, ou None para não gravar.
+        profiler (FrameProfiler): Medição do tempo de cada etapa do frame.
+        fps (int): Limite de frames desenhados por segundo (0 para não limitar).
+        tick_rate (int): Passos da simulação por segundo, independentes dos frames desenhados
+            (0 para um passo por frame desenhado).
+        pacer (FramePacer): Espera de cada frame e medição da regularidade do ritmo.
+        ai (str): Elemento do jogador controlado pelo computador, ou None se os dois usam o teclado.
+        network (NetworkClient): Conexão do modo em rede, ou None para jogar na mesma máquina.
 
     Methods:
         __init__(self, screen):
@@ -90,7 +175,13 @@ class Game(Screen):
 
         __create_sprites(self):
             Cria os sprites do jogo.
-            Esta função cria os jogadores, cria os tiles do mapa e os adiciona aos grupos de sprites.
+            Esta função cria os jogadores e as visões de cada tipo de tile sobre a grade da fase.
+
+        preload(self):
+            Lê a fase e carrega imagens, grafo de navegação e música antes de ``set_screen``.
+
+        __start_phase(self):
+            Coloca a fase já montada no estado inicial.
 
         __play_music(self):
             Toca a música de fundo do jogo.
@@ -116,45 +207,118 @@ class Game(Screen):
 
         __update_events(self):
             Atualiza os eventos do jogo.
-            Este método processa eventos como teclas pressionadas, cliques do mouse, etc.
+            Este método processa eventos como teclas pressionadas, cliques do mouse, etc.,
+            e avança a simulação quantos passos couberem no tempo real do frame.
+
+        __simulate(self, keys):
+            Avança a simulação um passo com as ações do teclado (e do computador, se houver).
 
         result(self):
             Retorna o resultado do jogo.
             Returns:
                 str: O resultado do jogo (ganhou ou perdeu).
 
-        __gameover(self):
-            Verifica se o jogo chegou ao fim (game over).
-
-        __win(self):
-            Verifica se houve vitória no jogo.
+        __check_end(self):
+            Verifica se a simulação terminou a fase, por derrota ou vitória.
 
         __update_screen(self):
             Atualiza a tela do jogo.
             Este método desenha todos os sprites na tela, atualiza a tela e realiza a troca de buffers.
+
+        __bake_background(self):
+            Desenha os tiles e as portas uma única vez em uma superfície de fundo.
+
+        __player_rects(self):
+            Posições de desenho dos jogadores, interpoladas entre os dois últimos passos.
+
+        __draw_full(self), __draw_dirty(self), __draw_scrolling(self):
+            Desenham o frame inteiro, só as áreas que mudaram, ou a parte do mundo vista pela câmera.
+
+        __draw_overlay(self, dirty):
+            Desenha o resumo das medições de desempenho, se estiver ligado.
     """
 
-    def __init__(self, screen):
+    def __init__(self, screen, record_dir=None, level=None, ai=AIConfig.PARTNER, network=None):
         """
         Inicializa a tela do jogo.
 
         Args:
             screen (pygame.Surface): A superfície onde o jogo será renderizado.
+            record_dir (str): Diretório onde gravar as entradas de cada partida, ou None para não gravar.
+            level (Level or str): A fase jogada, ou o nome dela. Se None, a fase padrão.
+            ai (str): Elemento ('fire' ou 'water') do jogador controlado pelo computador, ou None.
+            network (NetworkClient): Cliente já conectado do modo em rede; o teclado controla
+                só o jogador local e a simulação segue o servidor.
         """
         super().__init__(screen)
-        self._countwaterwin = 0
-        self._countfirewin = 0
+        self.record_dir = record_dir
+        self.level_source = level
+        self.ai = ai
+        self.network = network
+
+        # A fase é montada só na primeira vez; as seguintes apenas recomeçam a simulação
+        self.simulation = None
+        self.ai_controller = None
+
+        # A simulação avança em passos fixos; os frames desenhados têm limite próprio (0 para não limitar)
+        self.fps = PacingConfig.FRAME_CAP
+        self.tick_rate = PacingConfig.TICK_RATE
+        self.pacer = None
+        self.timestep = None
+
+        # Medição do tempo de cada etapa do frame, mantida entre as partidas
+        self.profiler = FrameProfiler(('tick', 'events', 'simulation', 'draw', 'present', 'end_check'))
+        self._overlay_key = pygame.key.key_code(ProfilerConfig.OVERLAY_KEY)
+        self._overlay_font = None
+        self._overlay_image = None
+        self._overlay_rect = None
     
     def set_screen(self):
         """
         Configura a tela do jogo.
 
-        Esta função inicializa o Pygame, configura a tela, carrega assets e cria os sprites.
+        Na primeira vez esta função inicializa o Pygame, carrega assets e cria os sprites.
+        Nas seguintes (por exemplo, ao tentar de novo depois de perder) a fase já
+        montada é reaproveitada e só o estado dos jogadores volta ao início.
         """
-        self.__initialize()
-        self.__create_sprites()
+        if self.simulation is None:
+            self.__initialize()
+            self.__create_sprites()
+        self.__start_phase()
         self.__play_music()
+
+        # A tela anterior desenhou por cima de tudo, então o primeiro frame é completo
+        self._full_redraw = True
+        self._overlay_rect = None
     
+    def preload(self):
+        """
+        Lê a fase e carrega as imagens dos tiles e dos jogadores, o grafo de navegação
+        do parceiro controlado pelo computador e a música do jogo.
+
+        Roda em uma thread auxiliar; depois dela, ``set_screen`` só monta o que depende da tela.
+        """
+        if self.simulation is not None:
+            return
+        level = self.__load_level()
+
+        player_size = (PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT)
+        for key in (PlayerConfig.FIREBOY_IMG, PlayerConfig.WATERGIRL_IMG):
+            asset_manager.scaled(key, player_size)
+        for tile in (Map.BLOCK, Map.PLATF, Map.LAVA, Map.WATER):
+            asset_manager.scaled(tile, (level.tile_size, level.tile_size))
+        if self.ai is not None and self.ai_controller is None:
+            self.ai_controller = controller_for(level, self.ai)
+        audio_manager.preload([AudioConfig.GAME_TRACK])
+
+    def __load_level(self):
+        """
+        Lê a fase pedida (pelo nome, ou a padrão) uma única vez e a guarda em ``level_source``.
+        """
+        if self.level_source is None or isinstance(self.level_source, str):
+            self.level_source = load_level(self.level_source) if self.level_source else load_level()
+        return self.level_source
+
     def __initialize(self):
         """
         Inicializa o Pygame e configurações iniciais do jogo.
@@ -166,61 +330,110 @@ class Game(Screen):
         pygame.display.set_caption(ScreenSettings.TITULO)
     
     
-        # Variável para o ajuste de velocidade
-        self.clock = pygame.time.Clock()
-
-        # Carrega assets
-        self.assets = load_assets(img_dir)
+        # Ritmo dos frames desenhados e dos passos da simulação
+        self.pacer = FramePacer(self.fps)
+        self.timestep = FixedTimestep(self.tick_rate or PacingConfig.TICK_RATE)
 
-        # Cria os grupos de Sprite
-        self.all_sprites = pygame.sprite.Group()
-        self.platforms = pygame.sprite.Group()
-        self.blocks = pygame.sprite.Group()
-        self.lava = pygame.sprite.Group()
-        self.water = pygame.sprite.Group()
-
-        # Portas da vitória
-        self.firedoor = pygame.Rect(0,20 , DoorConfig.DOOR_WIDTH, DoorConfig.DOOR_HEIGHT)
-        self.waterdoor = pygame.Rect(40,20 , DoorConfig.DOOR_WIDTH, DoorConfig.DOOR_HEIGHT)
+        # Assets compartilhados, carregados sob demanda
+        self.assets = asset_manager
 
     def __create_sprites(self):
         """
         Cria os sprites do jogo.
 
-        Esta função cria os jogadores, cria os tiles do mapa e os adiciona aos grupos de sprites.
+        Esta função cria os jogadores e as visões de cada tipo de tile sobre a grade da fase.
         """
         
-        self.fireboy = Player(self.assets[PlayerConfig.FIREBOY_IMG], 20, 0, self.platforms, self.blocks,self.lava,self.water,'fire')
-        self.watergirl = Player(self.assets[PlayerConfig.WATERGIRL_IMG], 20, 1, self.platforms, self.blocks,self.lava,self.water ,'water')
-        self.players =[self.watergirl,self.fireboy]
-
-        # Cria tiles de acordo com o mapa
-        for row in range(len(Map.MAP)):
-            for column in range(len(Map.MAP[row])):
-                tile_type = Map.MAP[row][column]
-                if tile_type != Map.EMPTY:
-                    tile = Tiles(self.assets[tile_type], row, column,40)
-                    self.all_sprites.add(tile)
-                    if tile_type == Map.BLOCK:
-                        self.blocks.add(tile)
-                    elif tile_type == Map.PLATF:
-                        self.platforms.add(tile)
-                    elif tile_type == Map.LAVA:
-                        self.lava.add(tile)
-                    elif tile_type == Map.WATER:
-                        self.water.add(tile)
-
-        # Adiciona o jogador no grupo de sprites por último para ser desenhado por cima das plataformas
-        self.all_sprites.add(player for player in self.players)
+        # A simulação guarda a fase, os jogadores, as portas e as regras
+        level = self.__load_level()
+        player_size = (PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT)
+        self.simulation = Simulation(level, self.assets.scaled(PlayerConfig.FIREBOY_IMG, player_size),
+                                     self.assets.scaled(PlayerConfig.WATERGIRL_IMG, player_size))
+        self.level = self.simulation.level
+        self.fireboy = self.simulation.fireboy
+        self.watergirl = self.simulation.watergirl
+        self.players = self.simulation.players
+        self.firedoor = self.simulation.firedoor
+        self.waterdoor = self.simulation.waterdoor
+
+        # Tabela de teclas dos jogadores
+        self.controls = Controls([player.element for player in self.players])
+        self._volume_up = pygame.key.key_code(ControlsConfig.VOLUME_UP)
+        self._volume_down = pygame.key.key_code(ControlsConfig.VOLUME_DOWN)
+
+        # Parceiro controlado pelo computador, que segue o grafo de navegação guardado em disco
+        if self.ai is not None:
+            if self.ai_controller is None:
+                self.ai_controller = controller_for(self.level, self.ai)
+            self._ai_slot = [player.element for player in self.players].index(self.ai)
+
+        # No modo em rede o jogador local é previsto sobre esta simulação
+        if self.network is not None:
+            self.network.attach(self.simulation)
+
+        # Os tiles ficam só na grade da fase; cada tipo é uma visão sobre ela, sem um sprite por tile
+        self.tile_map = self.simulation.tile_grid
+        self.blocks = self.tile_map.layer(Map.BLOCK)
+        self.platforms = self.tile_map.layer(Map.PLATF)
+        self.lava = self.tile_map.layer(Map.LAVA)
+        self.water = self.tile_map.layer(Map.WATER)
+
+        # Os jogadores são os únicos sprites que se movem, então são desenhados à parte,
+        # na posição interpolada entre os dois últimos passos da simulação
+        self._previous_positions = [player.rect.topleft for player in self.players]
+        self._drawn = []
+
+        # Câmera e chunks pré-desenhados do cenário, em coordenadas do mundo
+        self.camera = Camera(self.screen.get_size(), (self.simulation.tile_grid.width, self.simulation.tile_grid.height))
+        self.camera.follow([player.rect for player in self.players])
+        self.chunks = ChunkCache(self.level, self.assets, [(Colors.BLUE, self.waterdoor), (Colors.RED, self.firedoor)])
+        self.__bake_background()
+
+    def __start_phase(self):
+        """
+        Coloca a fase já montada no estado inicial, sem recriar a grade ou as superfícies.
+        """
+        self.simulation.reset()
+
+        # As teclas já seguradas não contam como um novo pulo
+        self.controls.reset()
+        self.controls.read(pygame.key.get_pressed())
+        if self.ai_controller is not None:
+            self.ai_controller.reset()
+
+        # Ações de cada jogador no frame atual, na ordem de self.players
+        self._actions = [Actions.NONE for _ in self.players]
+
+        # Semente da partida e gravação das entradas para reprodução posterior
+        self.seed = random.randrange(2 ** 32)
+        random.seed(self.seed)
+        self.recorder = InputRecorder(self.level.name, self.seed, len(self.players)) if self.record_dir else None
+
+        self.camera.follow([player.rect for player in self.players])
+
+        # O tempo passado antes da fase começar não conta como passos da simulação
+        self._previous_positions = [player.rect.topleft for player in self.players]
+        self._drawn = []
+        self.pacer.reset()
+        self.timestep = FixedTimestep(self.tick_rate or PacingConfig.TICK_RATE)
+
+    def __bake_background(self):
+        """
+        Desenha os tiles e as portas uma única vez em uma superfície de fundo.
+
+        Quando a fase cabe na tela o cenário não se move, então a cada frame
+        basta copiar deste fundo as áreas por onde os jogadores passaram.
+        """
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(Colors.WHITE)
+        for surface, position in self.chunks.update(self.camera.rect):
+            self.background.blit(surface, (position[0] - self.camera.rect.x, position[1] - self.camera.rect.y))
     
     def __play_music(self):
         """
         Toca a música de fundo do jogo.
         """
-        self.music_path = path.join(path.dirname(__file__), '..', 'msc','bglmudou.mp3')
-        pygame.mixer.music.load(self.music_path)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(loops=-1)
+        audio_manager.play(AudioConfig.GAME_TRACK)
 
     @property
     def running(self):
@@ -261,75 +474,92 @@ class Game(Screen):
         self._running_phase = True
         self._running = True
         while self._running and self._running_phase:
-            self.__update_events()
-            self.__update_screen()
-            self.__gameover()
-            self.__win()
+            self.step()
+
+        if self.recorder is not None:
+            filename = f'{self.level.name}_{time.strftime("%Y%m%d_%H%M%S")}_{self.seed}{REPLAY_EXTENSION}'
+            self.recorder.save(path.join(self.record_dir, filename))
+
+    def export_profile(self):
+        """
+        Grava as medições dos frames em ``ProfilerConfig.EXPORT_PATH``, se configurado.
+
+        Chamado uma vez, ao fechar o jogo: as medições se acumulam entre as
+        partidas, então o arquivo traz todas elas.
+        """
+        if ProfilerConfig.EXPORT_PATH and self.profiler.records:
+            self.profiler.export(ProfilerConfig.EXPORT_PATH)
+
+    def step(self):
+        """
+        Executa um frame completo: eventos, simulação, desenho e verificação de fim.
+        """
+        self.profiler.begin_frame()
+        self.__update_events()
+        self.__update_screen()
+        self.__check_end()
+        self.profiler.mark('end_check')
+        self.profiler.end_frame()
 
     def __update_events(self):
         """
         Atualiza os eventos do jogo.
 
-        Este método processa eventos como teclas pressionadas, cliques do mouse, etc.
+        Este método processa eventos como teclas pressionadas, cliques do mouse, etc.,
+        e avança a simulação quantos passos couberem no tempo real do frame.
         """
-        # Ajusta a velocidade do jogo.
-        self.clock.tick(ScreenSettings.FPS)
+        # Espera o horário do frame; o tempo real decorrido define quantos passos simular.
+        self.pacer.cap = self.fps
+        elapsed = self.pacer.wait()
+        self.profiler.mark('tick')
         
         # Processa os eventos (mouse, teclado, botão, etc).
         for event in pygame.event.get():
             # Verifica se foi fechado.
             if event.type == pygame.QUIT:
                 self._running = False
-            for player in self.players:
-                if player.element == 'water':
-                    # Verifica se apertou alguma tecla.
-                    if event.type == pygame.KEYDOWN:
-                        # Dependendo da tecla, altera o estado do jogador.
-                        if event.key == pygame.K_LEFT:
-                            player.walk_to_left()
-                        if event.key == pygame.K_RIGHT:
-                            player.walk_to_right()
-                        if event.key == pygame.K_UP:
-                            player.jump()
-
-                    # Verifica se soltou alguma tecla.
-                    if event.type == pygame.KEYUP:
-                        # Dependendo da tecla, altera o estado do jogador.
-                        if event.key == pygame.K_LEFT:
-                            player.stop_walk_left()
-                        elif event.key == pygame.K_RIGHT:
-                            player.stop_walk_right()
-                
-                elif player.element == 'fire':
-                    # Verifica se apertou alguma tecla.
-                    if event.type == pygame.KEYDOWN:
-                        # Dependendo da tecla, altera o estado do jogador.
-                        if event.key == pygame.K_a:
-                            player.walk_to_left()
-                        if event.key == pygame.K_d:
-                            player.walk_to_right()
-                        if event.key == pygame.K_w:
-                            player.jump()
-
-                    # Verifica se soltou alguma tecla.
-                    if event.type == pygame.KEYUP:
-                        # Dependendo da tecla, altera o estado do jogador.
-                        if event.key == pygame.K_a:
-                            player.stop_walk_left()
-                        elif event.key == pygame.K_d:
-                            player.stop_walk_right()
-                    # Verifica se as teclas 'm', 'k' ou 'l' foram pressionadas.
-                keys = pygame.key.get_pressed()
-
-                # Aumenta o volume se a tecla 'k' for pressionada.
-                if keys[pygame.K_k]:
-                    pygame.mixer.music.set_volume(min(1.0, pygame.mixer.music.get_volume() + 0.01))
-
-                # Diminui o volume se a tecla 'l' for pressionada.
-                if keys[pygame.K_l]:
-                    pygame.mixer.music.set_volume(max(0.0, pygame.mixer.music.get_volume() - 0.01))
-
-        self.all_sprites.update()
+            # Liga ou desliga o resumo de desempenho.
+            elif event.type == pygame.KEYDOWN and event.key == self._overlay_key:
+                self.profiler.toggle_overlay()
+
+        # Um único retrato do teclado por frame serve para todos os passos do frame.
+        keys = pygame.key.get_pressed()
+        self.profiler.mark('events')
+
+        steps = self.timestep.advance(elapsed) if self.tick_rate else 1
+        for _ in range(steps):
+            self.__simulate(keys)
+            if not self.simulation.running_phase:
+                break
+        self.profiler.mark('simulation')
+
+    def __simulate(self, keys):
+        """
+        Avança a simulação um passo com as ações do teclado (e do computador, se houver).
+
+        As ações são lidas a cada passo, e não a cada frame desenhado, para que um
+        pulo seja aplicado uma única vez e o volume mude no mesmo ritmo em qualquer taxa de frames.
+        """
+        self._actions = self.controls.read(keys)
+        if self.ai_controller is not None:
+            self._actions[self._ai_slot] = self.ai_controller.act(self.players[self._ai_slot])
+        if self.recorder is not None:
+            self.recorder.record(self._actions)
+
+        # Aumenta ou diminui o volume enquanto a tecla estiver pressionada.
+        if keys[self._volume_up]:
+            audio_manager.volume += ControlsConfig.VOLUME_STEP
+        if keys[self._volume_down]:
+            audio_manager.volume -= ControlsConfig.VOLUME_STEP
+
+        # Posições antes do passo, usadas na interpolação do desenho
+        self._previous_positions = [player.rect.topleft for player in self.players]
+
+        # Avança a lógica da fase um passo; no modo em rede quem decide é o servidor.
+        if self.network is not None:
+            self.network.step(self._actions[self.network.slot])
+        else:
+            self.simulation.step(self._actions)
 
     @property
     def result(self):
@@ -341,39 +571,14 @@ class Game(Screen):
         """
         return self._result
 
-    def __gameover(self):
+    def __check_end(self):
         """
-        Verifica se o jogo chegou ao fim (game over).
-        """
-        for player in self.players:
-            if not player.life:
-                self._phase_to_go = 2
-                self._running_phase = player.life
-                self._result = 'lost'
-
-    def __win(self):
+        Verifica se a simulação terminou a fase, por derrota ou vitória.
         """
-        Verifica se houve vitória no jogo.
-
-        Com base na distância euclidiana entre o personagem 
-        
-        e a porta da vitória.
-        """
-        coord_watergirl = (self.watergirl.rect.x,self.watergirl.rect.y)
-        coord_waterdoor = (self.waterdoor.x,self.waterdoor.y)
-        coord_fireboy = (self.fireboy.rect.x,self.fireboy.rect.y)
-        coord_firedoor = (self.firedoor.x, self.firedoor.y)
-
-        if dist(coord_watergirl,coord_waterdoor)<5:
-            self._countwaterwin += 1
-        if dist(coord_fireboy, coord_firedoor) < 5:
-            self._countfirewin += 1
-        if self._countwaterwin or self._countfirewin >= 1:
+        if not self.simulation.running_phase:
             self._phase_to_go = 2
             self._running_phase = False
-            self._result = 'win'
-            self._countwaterwin = 0
-            self._countfirewin = 0
+            self._result = self.simulation.result
 
     def __update_screen(self):
         """
@@ -381,19 +586,125 @@ class Game(Screen):
 
         Este método desenha todos os sprites na tela, atualiza a tela e realiza a troca de buffers.
         """
-        
+        if self.camera.scrolling:
+            dirty = self.__draw_scrolling()
+        elif ScreenSettings.DIRTY_RECTS:
+            dirty = self.__draw_dirty()
+        else:
+            dirty = self.__draw_full()
+        dirty = self.__draw_overlay(dirty)
+        self.profiler.mark('draw')
+
+        # Depois de desenhar tudo, atualiza o display (inteiro ou só as áreas que mudaram).
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self.profiler.mark('present')
+
+    def __player_rects(self):
+        """
+        Posições de desenho dos jogadores, entre o passo anterior e o atual da simulação.
+
+        Returns:
+            list: Um retângulo por jogador, na ordem de self.players.
+        """
+        if not self.tick_rate:
+            return [player.rect for player in self.players]
+        alpha = self.timestep.alpha
+        rects = []
+        for player, (x, y) in zip(self.players, self._previous_positions):
+            rect = player.rect.copy()
+            rect.topleft = (round(x + (rect.x - x) * alpha), round(y + (rect.y - y) * alpha))
+            rects.append(rect)
+        return rects
+
+    def __draw_full(self):
+        """
+        Desenha a tela inteira a partir da grade de tiles e dos jogadores.
+        """
         # Preenche o fundo de branco
         self.screen.fill(Colors.WHITE)
         
-        # Desenha todas as sprites na tela
-        self.all_sprites.draw(self.screen)
+        # Desenha os tiles e, por cima deles, os jogadores
+        self.tile_map.draw(self.screen, self.assets)
+        self.screen.blits([(player.image, rect) for player, rect in zip(self.players, self.__player_rects())],
+                          doreturn=False)
 
         # Desenha as portas que tem que chegar
         pygame.draw.rect(self.screen,Colors.BLUE,self.waterdoor)
         pygame.draw.rect(self.screen,Colors.RED,self.firedoor)
+        return None
+
+    def __draw_dirty(self):
+        """
+        Redesenha só as áreas cobertas ou descobertas pelos jogadores.
+
+        Returns:
+            list: As áreas da tela que mudaram, ou None se a tela inteira foi desenhada.
+        """
+        sprites = [(player.image, rect) for player, rect in zip(self.players, self.__player_rects())]
+        if self._full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self._drawn = self.screen.blits(sprites)
+            self._full_redraw = False
+            return None
+
+        dirty = []
+        # Apaga o resumo de desempenho anterior antes de desenhar os jogadores por cima do fundo
+        if self._overlay_rect is not None:
+            self.screen.blit(self.background, self._overlay_rect, self._overlay_rect)
+            dirty.append(self._overlay_rect)
+
+        # Apaga os jogadores com o fundo pré-desenhado e atualiza só essas áreas
+        for rect in self._drawn:
+            self.screen.blit(self.background, rect, rect)
+        dirty.extend(self._drawn)
+        self._drawn = self.screen.blits(sprites)
+        dirty.extend(self._drawn)
+        return dirty
+
+    def __draw_scrolling(self):
+        """
+        Desenha a parte do mundo vista pela câmera, nas fases maiores que a tela.
+
+        Só os chunks visíveis são desenhados, e os distantes são descartados.
+        """
+        rects = self.__player_rects()
+        self.camera.follow(rects)
+        self.screen.fill(Colors.WHITE)
+        for surface, position in self.chunks.update(self.camera.rect):
+            self.screen.blit(surface, (position[0] - self.camera.rect.x, position[1] - self.camera.rect.y))
+        for player, rect in zip(self.players, rects):
+            self.screen.blit(player.image, self.camera.apply(rect))
+        return None
 
-        # Depois de desenhar tudo, inverte o display.
-        pygame.display.flip()
+    def __draw_overlay(self, dirty):
+        """
+        Desenha o resumo das medições de desempenho, se estiver ligado.
+
+        O texto só é refeito a cada meio segundo, para não pesar no próprio frame.
+        """
+        self._overlay_rect = None
+        if not self.profiler.overlay:
+            return dirty
+
+        if self._overlay_image is None or self.profiler.frames % (ScreenSettings.FPS // 2) == 0:
+            if self._overlay_font is None:
+                self._overlay_font = pygame.font.SysFont('monospace', 14)
+            lines = [self._overlay_font.render(line, True, Colors.BLACK, Colors.YELLOW)
+                     for line in self.profiler.summary() + self.pacer.summary()]
+            self._overlay_image = pygame.Surface((max(line.get_width() for line in lines), sum(line.get_height() for line in lines)))
+            self._overlay_image.fill(Colors.YELLOW)
+            y = 0
+            for line in lines:
+                self._overlay_image.blit(line, (0, y))
+                y += line.get_height()
+
+        self._overlay_rect = self.screen.blit(self._overlay_image, (self.screen.get_width() - self._overlay_image.get_width() - 8, 8))
+        if dirty is not None:
+            dirty.append(self._overlay_rect)
+        return dirty
 
 
 class InitialScreen(Screen):
@@ -411,6 +722,9 @@ class InitialScreen(Screen):
             Configura a tela inicial.
             Esta função inicializa o Pygame, configura a tela, e inicia a música de fundo.
 
+        preload(self):
+            Carrega o fundo e a música do menu antes de a tela ser mostrada.
+
         __initialize(self):
             Inicializa o Pygame e configurações iniciais da tela inicial.
 
@@ -427,36 +741,37 @@ class InitialScreen(Screen):
             Returns:
                 bool: True se a fase está em execução, False caso contrário.
 
-        run(self):
-            Inicia o loop principal da tela inicial.
-            Este método atualiza os eventos e a tela da tela inicial.
-
-        __update_events(self):
-            Atualiza os eventos da tela inicial.
-            Este método processa eventos como teclas pressionadas para avançar ou sair do jogo.
+        _handle_event(self, event):
+            Trata um evento da tela inicial.
+            Este método processa a tecla 'Enter' para avançar.
 
         __background(self):
             Define o fundo da tela inicial com uma imagem.
 
-        __update_screen(self):
-            Atualiza a tela inicial.
-            Este método desenha o fundo na tela inicial.
+        _draw(self):
+            Desenha o fundo na tela inicial; o loop de ``Screen.run`` só a redesenha quando necessário.
     """
 
     def set_screen(self):
         self.__initialize()
         self.__play_music()
 
+    def preload(self):
+        # Fundo já no tamanho da tela e música do menu
+        asset_manager.scaled(InitialScreenSettings.BACKGROUND_IMG, self.screen.get_size())
+        audio_manager.preload([AudioConfig.MENU_TRACK])
+
     def __initialize(self):
         pygame.init()
         pygame.mixer.init()
         pygame.display.set_caption(ScreenSettings.TITULO)
 
     def __play_music(self):
-        self.music_path = path.join(path.dirname(__file__), '..','msc','caillou_theme_song.mp3')
-        pygame.mixer.music.load(self.music_path)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(loops=-1)
+        audio_manager.play(AudioConfig.MENU_TRACK)
+
+        # Decodificar trava o dispositivo de áudio, então as outras músicas só são
+        # preparadas depois que a do menu começou; a do jogo fica pronta durante o menu
+        audio_manager.preload()
     
     @property
     def running(self):
@@ -466,32 +781,19 @@ class InitialScreen(Screen):
     def running_phase(self):
         return self._running_phase
     
-    def run(self):
-        self._running = True
-        self._running_phase = True
-        while self.running and self.running_phase:
-            self.__update_events()
-            self.__update_screen()
-    
-
-    def __update_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self._running = False
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    self._running_phase = False
+    def _handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                self._running_phase = False
+        return False
     
     def __background(self):
-        # Carrega assets
-        self.assets = load_assets(img_dir)
-        self.background = self.assets[InitialScreenSettings.BACKGROUND_IMG]
+        # Busca o fundo no cache de assets
+        self.background = asset_manager.scaled(InitialScreenSettings.BACKGROUND_IMG, self.screen.get_size())
         self.screen.blit(self.background, (0,0))
     
-    def __update_screen(self):
+    def _draw(self):
         self.__background()
-        pygame.display.flip()
 
 
 class EndScreen(Screen):
@@ -512,8 +814,11 @@ class EndScreen(Screen):
     set_screen()
         Configura a tela de fim de jogo, inicializando o Pygame, configurando a tela e interrompendo a música de fundo.
 
+    preload()
+        Carrega os fundos de vitória e de derrota antes de a tela ser mostrada.
+
     run()
-        Inicia o loop principal da tela de fim de jogo, atualizando os eventos e a tela da tela de fim de jogo.
+        Herdado de ``Screen``: desenha a tela uma vez e espera os eventos sem ocupar a CPU.
 
     __initialize()
         Inicializa o Pygame e configurações iniciais da tela de fim de jogo.
@@ -524,8 +829,11 @@ class EndScreen(Screen):
     __background()
         Define o fundo da tela de fim de jogo com base no resultado (vitória ou derrota).
 
-    __update_screen()
-        Atualiza a tela da tela de fim de jogo, desenhando o fundo na tela.
+    _draw()
+        Desenha o fundo na tela de fim de jogo.
+
+    _handle_event(event)
+        Trata as teclas que escolhem a próxima fase.
 
     set_result(result: str)
         Define o resultado do jogo.
@@ -551,6 +859,13 @@ class EndScreen(Screen):
         self.__initialize()
         self.__play_music()
 
+    def preload(self):
+        """
+        Carrega os dois fundos possíveis, pois o resultado só é conhecido no fim da partida.
+        """
+        for key in (EndScreenSettings.GAMEOVER_IMG, EndScreenSettings.WIN_IMG):
+            asset_manager.scaled(key, self.screen.get_size())
+
     def __initialize(self):
         """
         Inicializa o Pygame e configurações iniciais da tela de fim de jogo.
@@ -563,7 +878,7 @@ class EndScreen(Screen):
         """
         Interrompe a reprodução da música de fundo na tela de fim de jogo.
         """
-        pygame.mixer.music.stop()
+        audio_manager.stop()
 
     @property
     def running(self):
@@ -585,38 +900,24 @@ class EndScreen(Screen):
         """
         return self._running_phase
 
-    def run(self):
-        """
-        Inicia o loop principal da tela de fim de jogo.
-
-        Este método atualiza os eventos e a tela da tela de fim de jogo.
-        """
-        self._running = True
-        self._running_phase = True
-        while self.running and self.running_phase:
-            self.__update_events()
-            self.__update_screen()
-    
     def __background(self):
         """
         Define o background da tela de fim de jogo baseado no resultado (vitória ou derrota).
         """
-        self.assets = load_assets(img_dir)
         if self._result == 'lost':
-            self.background = self.assets[EndScreenSettings.GAMEOVER_IMG]
+            self.background = asset_manager.scaled(EndScreenSettings.GAMEOVER_IMG, self.screen.get_size())
             self.screen.blit(self.background, (0,0))
         elif self._result =='win':
-            self.background = self.assets[EndScreenSettings.WIN_IMG]
+            self.background = asset_manager.scaled(EndScreenSettings.WIN_IMG, self.screen.get_size())
             self.screen.blit(self.background, (0,0))
    
-    def __update_screen(self):
+    def _draw(self):
         """
-        Atualiza a tela da tela de fim de jogo.
+        Desenha a tela de fim de jogo.
 
         Este método desenha o background na tela de fim de jogo.
         """
         self.__background()
-        pygame.display.flip()
 
     def setresult(self, result):
         """
@@ -637,25 +938,26 @@ class EndScreen(Screen):
         """
         return self._phase_to_go
     
-    def __update_events(self):
+    def _handle_event(self, event):
         """
-        Atualiza os eventos da tela de fim de jogo.
+        Trata um evento da tela de fim de jogo.
+
+        Este método processa as teclas pressionadas para escolher a próxima fase.
 
-        Este método processa eventos como teclas pressionadas para escolher a próxima fase ou sair do jogo.
+        Returns:
+            bool: Sempre False, pois a tela de fim de jogo não muda.
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self._running = False
-            if self._result == 'lost':
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        self._phase_to_go = 1
-                        self._running_phase = False
-                    if event.key == pygame.K_m:
-                        self._phase_to_go = 0
-                        self._running_phase = False
-            elif self._result == 'win':
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_m:
-                        self._phase_to_go = 0
-                        self._running_phase = False
\ No newline at end of file
+        if self._result == 'lost':
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    self._phase_to_go = 1
+                    self._running_phase = False
+                if event.key == pygame.K_m:
+                    self._phase_to_go = 0
+                    self._running_phase = False
+        elif self._result == 'win':
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_m:
+                    self._phase_to_go = 0
+                    self._running_phase = False
+        return False
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Módulo responsável pelo formato binário das fases.
+
+Um arquivo de fase tem um cabeçalho fixo (dimensões, tamanho do tile, pontos de
+início e portas), seguido da grade de tiles (um byte por célula) e de uma grade
+de máscaras pré-calculadas (sólido, plataforma, lava e água). O arquivo é aberto
+com ``numpy.memmap``, então carregar ou reiniciar uma fase não copia a grade nem
+cria listas Python proporcionais ao tamanho do mapa.
+"""
+
+
+import hashlib
+import struct
+import numpy as np
+from os import path
+from .config import Map, TilesConfig, PlayerConfig, DoorConfig
+
+
+# Define o diretório que contém as fases.
+level_dir = path.join('..', 'levels')
+
+# Fase carregada quando nenhuma outra é pedida
+DEFAULT_LEVEL = 'level1'
+
+LEVEL_EXTENSION = '.fwl'
+MAGIC = b'FWLV'
+VERSION = 2
+
+# magic, versão, linhas, colunas, tamanho do tile, 2 pontos de início (linha, coluna)
+# e 2 portas (x, y, largura, altura). As portas ficam em pixels, então usam 32 bits
+# para que fases com mais de ~800 tiles de lado caibam no cabeçalho.
+_HEADER = struct.Struct('<4sHHHH4i8i')
+
+# Bits da grade de máscaras
+SOLID = 1
+PLATFORM = 2
+LAVA = 4
+WATER = 8
+_MASK_BITS = {Map.BLOCK: SOLID, Map.PLATF: PLATFORM, Map.LAVA: LAVA, Map.WATER: WATER}
+
+
+class Level:
+    """
+    Fase do jogo: grade de tiles, máscaras de colisão, pontos de início e portas.
+
+    Atributes:
+    ----------
+    name : str
+        Identificador da fase (o nome do arquivo, sem extensão).
+    tiles : numpy.ndarray
+        Matriz int8 (linhas, colunas) com os tipos de tile de ``Map``.
+    masks : numpy.ndarray
+        Matriz uint8 com os bits ``SOLID``, ``PLATFORM``, ``LAVA`` e ``WATER`` de cada célula.
+    tile_size : int
+        Tamanho, em pixels, de cada célula.
+    fireboy_spawn : tuple
+        Linha e coluna onde o Fireboy começa.
+    watergirl_spawn : tuple
+        Linha e coluna onde a Watergirl começa.
+    firedoor : tuple
+        Retângulo (x, y, largura, altura) da porta do Fireboy.
+    waterdoor : tuple
+        Retângulo (x, y, largura, altura) da porta da Watergirl.
+    """
+
+    def __init__(self, name: str, tiles: np.ndarray, masks: np.ndarray, tile_size: int,
+                 fireboy_spawn: tuple, watergirl_spawn: tuple, firedoor: tuple, waterdoor: tuple):
+        self.name = name
+        self.tiles = tiles
+        self.masks = masks
+        self.tile_size = tile_size
+        self.fireboy_spawn = tuple(fireboy_spawn)
+        self.watergirl_spawn = tuple(watergirl_spawn)
+        self.firedoor = tuple(firedoor)
+        self.waterdoor = tuple(waterdoor)
+
+    @classmethod
+    def from_map(cls, grid=Map.MAP, name: str = DEFAULT_LEVEL):
+        """
+        Cria uma fase a partir de uma matriz no formato de ``Map.MAP``, usando
+        as posições de início e de portas definidas em ``config``.
+        """
+        tiles = np.asarray(grid, dtype=np.int8)
+        return cls(name, tiles, compute_masks(tiles), TilesConfig.TILE_SIZE,
+                   PlayerConfig.FIREBOY_SPAWN, PlayerConfig.WATERGIRL_SPAWN,
+                   DoorConfig.FIREDOOR_POS + (DoorConfig.DOOR_WIDTH, DoorConfig.DOOR_HEIGHT),
+                   DoorConfig.WATERDOOR_POS + (DoorConfig.DOOR_WIDTH, DoorConfig.DOOR_HEIGHT))
+
+    @property
+    def rows(self) -> int:
+        return self.tiles.shape[0]
+
+    @property
+    def columns(self) -> int:
+        return self.tiles.shape[1]
+
+    @property
+    def solid(self) -> np.ndarray:
+        """
+        Máscara booleana das células que não podem ser atravessadas.
+        """
+        return (self.masks & SOLID) != 0
+
+    @property
+    def platform(self) -> np.ndarray:
+        """
+        Máscara booleana das plataformas, que só podem ser atravessadas por baixo.
+        """
+        return (self.masks & PLATFORM) != 0
+
+    def hazard(self, element: str) -> np.ndarray:
+        """
+        Máscara booleana das células que matam o jogador do elemento informado.
+        """
+        return (self.masks & (LAVA if element == 'water' else WATER)) != 0
+
+    def __header(self) -> bytes:
+        return _HEADER.pack(MAGIC, VERSION, self.rows, self.columns, self.tile_size,
+                            *self.fireboy_spawn, *self.watergirl_spawn,
+                            *self.firedoor, *self.waterdoor)
+
+    def digest(self) -> str:
+        """
+        Hash do conteúdo da fase (tiles, tamanho, inícios e portas), independente do nome.
+
+        Serve de chave para dados calculados a partir da fase e guardados em disco.
+        """
+        return hashlib.sha1(self.__header() + np.ascontiguousarray(self.tiles, dtype=np.int8).tobytes()).hexdigest()
+
+    def save(self, filename: str):
+        """
+        Grava a fase no formato binário.
+        """
+        with open(filename, 'wb') as file:
+            file.write(self.__header())
+            file.write(np.ascontiguousarray(self.tiles, dtype=np.int8).tobytes())
+            file.write(np.ascontiguousarray(self.masks, dtype=np.uint8).tobytes())
+
+    @classmethod
+    def load(cls, filename: str):
+        """
+        Abre uma fase gravada com ``save`` usando mapeamento de memória.
+
+        Raises
+        ------
+        ValueError
+            Se o arquivo não for uma fase válida.
+        """
+        data = np.memmap(filename, dtype=np.uint8, mode='r')
+        if len(data) < _HEADER.size:
+            raise ValueError(f'{filename} não é um arquivo de fase')
+        fields = _HEADER.unpack(data[:_HEADER.size].tobytes())
+        magic, version, rows, columns, tile_size = fields[:5]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{filename} não é um arquivo de fase (versão {VERSION})')
+        cells = rows * columns
+        if len(data) != _HEADER.size + 2 * cells:
+            raise ValueError(f'{filename} está incompleto')
+
+        tiles = data[_HEADER.size:_HEADER.size + cells].view(np.int8).reshape(rows, columns)
+        masks = data[_HEADER.size + cells:].reshape(rows, columns)
+        name = path.splitext(path.basename(filename))[0]
+        return cls(name, tiles, masks, tile_size, fields[5:7], fields[7:9], fields[9:13], fields[13:17])
+
+
+def compute_masks(tiles: np.ndarray) -> np.ndarray:
+    """
+    Calcula a grade de máscaras a partir da grade de tiles.
+    """
+    masks = np.zeros(tiles.shape, dtype=np.uint8)
+    for tile_type, bit in _MASK_BITS.items():
+        masks[tiles == tile_type] |= bit
+    return masks
+
+
+def level_path(name: str) -> str:
+    """
+    Caminho do arquivo da fase com o nome informado.
+    """
+    return path.join(path.dirname(__file__), level_dir, name + LEVEL_EXTENSION)
+
+
+def load_level(name: str = DEFAULT_LEVEL) -> Level:
+    """
+    Carrega a fase pelo nome, a partir do diretório de fases.
+    """
+    return Level.load(level_path(name))
+
+
+if __name__ == '__main__':
+    # Regrava a fase padrão a partir de Map.MAP: python -m app.level
+    Level.from_map(Map.MAP, DEFAULT_LEVEL).save(level_path(DEFAULT_LEVEL))
@@ -0,0 +1,678 @@
+"""
+Módulo responsável pelo modo em rede, com um jogador em cada máquina.
+
+O ``GameServer`` roda, com asyncio, a única ``Simulation`` que vale (a
+autoritativa): recebe as ações de cada cliente por TCP e, a cada frame, envia a
+cada um o estado dos dois jogadores. Para economizar banda, o estado é
+quantizado em coordenadas relativas ao tile (coluna e deslocamento dentro
+dela, em bytes) e, quando possível, enviado por diferença em relação ao último
+estado confirmado pelo cliente: só os jogadores e os campos que mudaram, com
+as posições como diferenças de um byte.
+
+O ``NetworkClient`` aplica a própria ação na hora, sem esperar o servidor
+(predição no cliente). Quando um estado do servidor chega, ele substitui o
+estado local e as ações que o servidor ainda não processou são reaplicadas,
+de forma que a latência não aparece no jogador local.
+
+Uso pela linha de comando::
+
+    python -m app.network serve level1
+    python -m app.network join 192.168.0.10
+    python -m app.network loopback --latency 80
+"""
+
+
+import asyncio
+import struct
+import threading
+from collections import deque
+from time import perf_counter
+import numpy as np
+from .config import Actions, NetworkConfig
+from .batch import STATE_CODES, STATE_NAMES
+from .level import load_level
+from .simulation import Simulation
+
+
+# Tipos de mensagem
+WELCOME = 1
+INPUT = 2
+SNAPSHOT = 3
+
+# Resultados da fase, na ordem em que são codificados
+RESULTS = (None, 'win', 'lost')
+
+# Tamanho de cada mensagem, antes do conteúdo
+_LENGTH = struct.Struct('<H')
+# tipo, posição do jogador, quantidade de jogadores, hash da fase, tamanho do nome da fase
+_WELCOME = struct.Struct('<BBB20sB')
+# tipo, número da ação, ação, último estado recebido
+_INPUT = struct.Struct('<BIBI')
+# tipo, frame, distância até o frame do estado base (0 se completo), última ação processada
+# do cliente e um byte com o resultado (2 bits) e a máscara dos jogadores enviados
+_SNAPSHOT = struct.Struct('<BIBIB')
+
+# Campos quantizados de um jogador: coluna, x na coluna, linha, y na linha, speedx,
+# speedy, estado/vida/saúde e highest_y relativo a y
+_FIELDS = tuple(struct.Struct('<' + code) for code in 'hBhBbbBh')
+
+# Valores de um jogador nos estados por diferença: diferença de x e de y em pixels,
+# speedx, speedy, estado/vida/saúde e diferença de highest_y
+_DELTAS = tuple(struct.Struct('<' + code) for code in 'bbbbBb')
+# Os mesmos valores, com as diferenças em dois bytes, para um jogador que se moveu muito
+_WIDE_DELTAS = tuple(struct.Struct('<' + code) for code in 'hhbbBh')
+# Posições de ``_DELTAS`` enviadas como diferença
+_DIFFERENCES = (0, 1, 5)
+# Bit da máscara de um jogador que indica as diferenças em dois bytes
+_WIDE = 1 << len(_DELTAS)
+
+
+def quantize(player, tile_size: int) -> tuple:
+    """
+    Converte o estado de um jogador nos campos enviados pela rede.
+    """
+    x, y = player.rect.x, player.rect.y
+    flags = STATE_CODES[player.state] | player.life << 2 | player.health << 3
+    return (x // tile_size, x % tile_size, y // tile_size, y % tile_size,
+            player.speedx, player.speedy, flags, player.highest_y - y)
+
+
+def dequantize(fields: tuple, tile_size: int) -> tuple:
+    """
+    Converte os campos recebidos no formato de ``Player.snapshot``.
+    """
+    column, x_offset, row, y_offset, speedx, speedy, flags, highest_y = fields
+    y = row * tile_size + y_offset
+    return (column * tile_size + x_offset, y, speedx, speedy, STATE_NAMES[flags & 3],
+            y + highest_y, bool(flags & 4), flags >> 3)
+
+
+def _delta(fields: tuple, base: tuple, tile_size: int) -> tuple:
+    """
+    Valores de um jogador em um estado por diferença, em relação ao mesmo jogador em ``base``.
+    """
+    return ((fields[0] - base[0]) * tile_size + fields[1] - base[1],
+            (fields[2] - base[2]) * tile_size + fields[3] - base[3],
+            fields[4], fields[5], fields[6], fields[7] - base[7])
+
+
+def _undelta(values: tuple, base: tuple, tile_size: int) -> tuple:
+    """
+    Campos quantizados de um jogador a partir dos valores de ``_delta``.
+    """
+    x = base[0] * tile_size + base[1] + values[0]
+    y = base[2] * tile_size + base[3] + values[1]
+    return (x // tile_size, x % tile_size, y // tile_size, y % tile_size,
+            values[2], values[3], values[4], base[7] + values[5])
+
+
+def encode_snapshot(tick: int, input_ack: int, result, state: tuple, tile_size: int,
+                    base: tuple = None, base_tick: int = 0) -> bytes:
+    """
+    Codifica o estado dos jogadores, por diferença em relação a ``base`` quando possível.
+
+    Um estado completo traz todos os campos de todos os jogadores. Um estado por
+    diferença traz só os jogadores que mudaram, marcados no cabeçalho, e cada um
+    ocupa um byte com a máscara dos valores enviados, seguido desses valores: x,
+    y e highest_y como diferença em pixels e os demais com o valor novo, todos
+    em um byte. Se alguma diferença de um jogador não couber em um byte, as
+    diferenças dele vão em dois bytes (bit ``_WIDE`` da máscara). Sem ``base``
+    o estado vai completo.
+    """
+    if base is not None and 0 < tick - base_tick <= 255:
+        deltas = [_delta(fields, previous, tile_size) for fields, previous in zip(state, base)]
+        if all(-32768 <= values[bit] <= 32767 for values in deltas for bit in _DIFFERENCES):
+            players = 0
+            body = bytearray()
+            for index, (values, previous) in enumerate(zip(deltas, base)):
+                unchanged = _delta(previous, previous, tile_size)
+                mask = 0
+                for bit, value in enumerate(values):
+                    if value != unchanged[bit]:
+                        mask |= 1 << bit
+                if mask:
+                    wide = any(not -128 <= values[bit] <= 127 for bit in _DIFFERENCES)
+                    players |= 1 << index
+                    body.append(mask | _WIDE if wide else mask)
+                    for bit, value in enumerate(values):
+                        if mask >> bit & 1:
+                            body += (_WIDE_DELTAS if wide else _DELTAS)[bit].pack(value)
+            return _SNAPSHOT.pack(SNAPSHOT, tick, tick - base_tick, input_ack,
+                                  RESULTS.index(result) | players << 2) + bytes(body)
+
+    buffer = bytearray(_SNAPSHOT.pack(SNAPSHOT, tick, 0, input_ack,
+                                      RESULTS.index(result) | ((1 << len(state)) - 1) << 2))
+    for fields in state:
+        for field, value in zip(_FIELDS, fields):
+            buffer += field.pack(value)
+    return bytes(buffer)
+
+
+def decode_snapshot(data: bytes, history: dict, tile_size: int) -> tuple:
+    """
+    Decodifica uma mensagem de ``encode_snapshot``.
+
+    Parameters
+    ----------
+    data : bytes
+        A mensagem.
+    history : dict
+        Estados já recebidos, por frame, usados como base.
+    tile_size : int
+        Tamanho dos tiles da fase, usado nas diferenças de posição.
+
+    Returns
+    -------
+    tuple
+        Frame, última ação processada do cliente, resultado e campos de cada jogador.
+
+    Raises
+    ------
+    ValueError
+        Se o estado base não estiver em ``history``.
+    """
+    _, tick, distance, input_ack, flags = _SNAPSHOT.unpack_from(data)
+    result, players = flags & 3, flags >> 2
+    offset = _SNAPSHOT.size
+    state = []
+
+    if not distance:
+        for _ in range(players.bit_length()):
+            fields = []
+            for field in _FIELDS:
+                fields.append(field.unpack_from(data, offset)[0])
+                offset += field.size
+            state.append(tuple(fields))
+        return tick, input_ack, RESULTS[result], tuple(state)
+
+    base = history.get(tick - distance)
+    if base is None:
+        raise ValueError(f'estado base {tick - distance} desconhecido')
+    for index, previous in enumerate(base):
+        # Jogadores fora da máscara do cabeçalho não mudaram
+        if not players >> index & 1:
+            state.append(previous)
+            continue
+        mask = data[offset]
+        offset += 1
+        values = list(_delta(previous, previous, tile_size))
+        for bit, field in enumerate(_WIDE_DELTAS if mask & _WIDE else _DELTAS):
+            if mask >> bit & 1:
+                values[bit] = field.unpack_from(data, offset)[0]
+                offset += field.size
+        state.append(_undelta(values, previous, tile_size))
+    return tick, input_ack, RESULTS[result], tuple(state)
+
+
+def _frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+async def _read_message(reader: asyncio.StreamReader) -> bytes:
+    size, = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return await reader.readexactly(size)
+
+
+class _Remote:
+    """
+    Um cliente conectado ao servidor.
+    """
+
+    def __init__(self, slot: int, writer: asyncio.StreamWriter, max_inputs: int):
+        self.slot = slot
+        self.writer = writer
+        self.inputs = deque(maxlen=max_inputs)
+        self.skipped_inputs = 0
+        self.action = Actions.NONE
+        self.input_ack = 0
+        self.ack = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.full_bytes = 0
+        self.snapshots = 0
+        self.full_snapshots = 0
+
+
+class GameServer:
+    """
+    Servidor que roda a simulação autoritativa e envia o estado a cada cliente.
+
+    Atributes:
+    ----------
+    simulation : Simulation
+        A simulação autoritativa.
+    tick : int
+        Quantidade de frames simulados.
+    port : int
+        Porta em que o servidor escuta (útil com a porta 0, escolhida pelo sistema).
+    """
+
+    def __init__(self, level=None, host: str = NetworkConfig.HOST, port: int = NetworkConfig.PORT,
+                 tick_rate: int = NetworkConfig.TICK_RATE, history: int = NetworkConfig.HISTORY,
+                 max_inputs: int = NetworkConfig.MAX_QUEUED_INPUTS):
+        if level is None or isinstance(level, str):
+            level = load_level(level) if level else load_level()
+        self.level = level
+        self.simulation = Simulation(level)
+        self.host = host
+        self.port = port
+        self.tick = 0
+        self._tick_rate = tick_rate
+        self._history = {}
+        self._history_size = history
+        self._max_inputs = max_inputs
+        self._remotes = [None] * len(self.simulation.players)
+        self._ready = asyncio.Event()
+        self._handlers = []
+        self._server = None
+
+    async def start(self):
+        """
+        Começa a aceitar conexões.
+        """
+        self._server = await asyncio.start_server(self.__handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Recebe as ações de um cliente, que ocupa o primeiro jogador livre.
+        """
+        if None not in self._remotes:
+            writer.close()
+            return
+        self._handlers.append(asyncio.current_task())
+        remote = _Remote(self._remotes.index(None), writer, self._max_inputs)
+        self._remotes[remote.slot] = remote
+        name = self.level.name.encode('utf-8')
+        self.__send(remote, _WELCOME.pack(WELCOME, remote.slot, len(self._remotes), bytes.fromhex(self.level.digest()),
+                                          len(name)) + name)
+        if None not in self._remotes:
+            self._ready.set()
+
+        try:
+            while True:
+                data = await _read_message(reader)
+                remote.bytes_received += _LENGTH.size + len(data)
+                _, sequence, action, ack = _INPUT.unpack(data)
+                # Com a fila cheia, a ação mais antiga é descartada e o servidor passa às mais recentes
+                if len(remote.inputs) == remote.inputs.maxlen:
+                    remote.skipped_inputs += 1
+                remote.inputs.append((sequence, action))
+                remote.ack = max(remote.ack, ack)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def __send(self, remote: _Remote, payload: bytes):
+        message = _frame(payload)
+        remote.writer.write(message)
+        remote.bytes_sent += len(message)
+
+    def __tick(self):
+        """
+        Simula um frame com a próxima ação de cada cliente e envia o novo estado.
+        """
+        # Cada ação recebida vale para um frame; sem ação nova, a direção continua, mas sem pular de novo
+        for remote in self._remotes:
+            if remote.inputs:
+                remote.input_ack, remote.action = remote.inputs.popleft()
+            else:
+                remote.action &= ~Actions.JUMP
+        self.simulation.step([remote.action for remote in self._remotes])
+        self.tick += 1
+
+        tile_size = self.level.tile_size
+        state = tuple(quantize(player, tile_size) for player in self.simulation.players)
+        self._history[self.tick] = state
+        self._history.pop(self.tick - self._history_size, None)
+
+        for remote in self._remotes:
+            base = self._history.get(remote.ack)
+            payload = encode_snapshot(self.tick, remote.input_ack, self.simulation.result, state, tile_size,
+                                      base, remote.ack)
+            full = payload if base is None else encode_snapshot(self.tick, remote.input_ack, self.simulation.result,
+                                                                state, tile_size)
+            self.__send(remote, payload)
+            remote.snapshots += 1
+            remote.full_snapshots += payload == full
+            remote.full_bytes += _LENGTH.size + len(full)
+
+    async def run(self, max_ticks: int = None) -> str:
+        """
+        Espera todos os jogadores e simula até o fim da fase (ou até ``max_ticks`` frames).
+
+        Returns
+        -------
+        str
+            O resultado da fase, ou None se ela não terminou.
+        """
+        await self._ready.wait()
+        loop = asyncio.get_running_loop()
+        period = 1 / self._tick_rate
+        deadline = loop.time()
+        while self.simulation.running_phase and (max_ticks is None or self.tick < max_ticks):
+            self.__tick()
+            deadline += period
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+        for remote in self._remotes:
+            await remote.writer.drain()
+            remote.writer.close()
+        await asyncio.gather(*self._handlers)
+        return self.simulation.result
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+    def report(self) -> list:
+        """
+        Linhas de texto com os bytes enviados a cada cliente, comparados com estados sempre completos.
+        """
+        lines = []
+        for remote in self._remotes:
+            if remote is None:
+                continue
+            seconds = max(self.tick, 1) / self._tick_rate
+            lines.append(f'servidor -> jogador {remote.slot}: {remote.snapshots} estados '
+                         f'({remote.full_snapshots} completos), {remote.bytes_sent} bytes '
+                         f'({remote.bytes_sent * 8 / seconds / 1000:.1f} kbit/s; '
+                         f'{remote.bytes_sent / max(remote.full_bytes, 1):.0%} do tamanho sem compressão); '
+                         f'{remote.skipped_inputs} ações descartadas com a fila cheia')
+        return lines
+
+
+class NetworkClient:
+    """
+    Cliente que envia as ações de um jogador e prevê o seu movimento localmente.
+
+    Atributes:
+    ----------
+    slot : int
+        Posição do jogador local em ``Simulation.players``.
+    level : Level
+        A fase, conferida com o hash enviado pelo servidor.
+    simulation : Simulation
+        Simulação local: o jogador local é previsto e o outro segue o servidor.
+    connected : bool
+        Indica se a conexão continua aberta.
+    latency_ms : float
+        Atraso artificial de ida e volta, dividido entre envio e recebimento, para testes.
+    """
+
+    def __init__(self, host: str = NetworkConfig.HOST, port: int = NetworkConfig.PORT,
+                 latency_ms: float = 0, history: int = NetworkConfig.HISTORY):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.slot = None
+        self.level = None
+        self.simulation = None
+        self.connected = False
+        self._history = {}
+        self._history_size = history
+        self._inbox = deque()
+        self._pending = deque()
+        self._sent_at = {}
+        self._sequence = 0
+        self._tick = 0
+        self._loop = None
+        self._writer = None
+        self._receiver = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.corrections = 0
+        self.round_trips = []
+
+    async def connect(self, level=None):
+        """
+        Conecta ao servidor e recebe a posição do jogador local e a fase.
+
+        Raises
+        ------
+        ValueError
+            Se a fase local for diferente da do servidor.
+        """
+        self._loop = asyncio.get_running_loop()
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        data = await _read_message(reader)
+        self.bytes_received += _LENGTH.size + len(data)
+        _, self.slot, _, digest, size = _WELCOME.unpack_from(data)
+        name = data[_WELCOME.size:_WELCOME.size + size].decode('utf-8')
+        if level is None:
+            level = load_level(name)
+        if level.digest() != digest.hex():
+            raise ValueError(f'a fase local é diferente da fase {name} do servidor')
+        self.level = level
+        if self.simulation is None:
+            self.simulation = Simulation(level)
+        self.connected = True
+        self._receiver = self._loop.create_task(self.__receive(reader))
+
+    def start(self, level=None, timeout: float = 10):
+        """
+        Conecta e recebe os estados em uma thread própria, para uso em um loop síncrono como o do ``Game``.
+        """
+        ready = threading.Event()
+        errors = []
+
+        def target():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.connect(level))
+            except (OSError, ValueError) as error:
+                errors.append(error)
+                return
+            finally:
+                ready.set()
+            loop.run_until_complete(self._receiver)
+
+        threading.Thread(target=target, name='network', daemon=True).start()
+        if not ready.wait(timeout):
+            raise TimeoutError(f'sem resposta de {self.host}:{self.port}')
+        if errors:
+            raise errors[0]
+
+    def attach(self, simulation: Simulation):
+        """
+        Passa a prever sobre outra simulação da mesma fase (por exemplo, a do ``Game``).
+        """
+        self.simulation = simulation
+
+    async def __receive(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                data = await _read_message(reader)
+                self.bytes_received += _LENGTH.size + len(data)
+                if self.latency_ms:
+                    self._loop.call_later(self.latency_ms / 2000, self._inbox.append, data)
+                else:
+                    self._inbox.append(data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        # Com atraso artificial, a conexão só termina depois de entregues os últimos estados
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 2000)
+        self.connected = False
+
+    def __send(self, message: bytes):
+        if self._writer.is_closing():
+            return
+        self._writer.write(message)
+        self.bytes_sent += len(message)
+
+    def poll(self):
+        """
+        Aplica os estados já recebidos do servidor, sem avançar o jogador local.
+        """
+        # Todos os estados recebidos são decodificados, porque servem de base aos seguintes
+        latest = None
+        while self._inbox:
+            latest = decode_snapshot(self._inbox.popleft(), self._history, self.level.tile_size)
+            self._history[latest[0]] = latest[3]
+            self._history.pop(latest[0] - self._history_size, None)
+            self._tick = latest[0]
+            self.snapshots += 1
+        if latest is not None:
+            self.__reconcile(*latest)
+
+    def step(self, action: int) -> bool:
+        """
+        Executa um frame local: aplica os estados recebidos, envia a ação e a aplica no jogador local.
+
+        Returns
+        -------
+        bool
+            True se a fase continua em andamento, False caso contrário.
+        """
+        self.poll()
+
+        self._sequence += 1
+        message = _frame(_INPUT.pack(INPUT, self._sequence, action, self._tick))
+        if self.latency_ms:
+            self._loop.call_soon_threadsafe(self._loop.call_later, self.latency_ms / 2000, self.__send, message)
+        else:
+            self._loop.call_soon_threadsafe(self.__send, message)
+        self._sent_at[self._sequence] = perf_counter()
+
+        player = self.simulation.players[self.slot]
+        player.apply_actions(action)
+        player.update()
+        self._pending.append((self._sequence, action, player.snapshot()))
+        self.simulation.frame += 1
+        return self.simulation.running_phase
+
+    def __reconcile(self, tick: int, input_ack: int, result, state: tuple):
+        """
+        Adota o estado do servidor e reaplica as ações locais que ele ainda não processou.
+        """
+        tile_size = self.level.tile_size
+        for player, fields in zip(self.simulation.players, state):
+            player.restore(dequantize(fields, tile_size))
+        self.simulation.running_phase = result is None
+        self.simulation.result = result
+
+        server_state = dequantize(state[self.slot], tile_size)
+        while self._pending and self._pending[0][0] <= input_ack:
+            sequence, _, predicted = self._pending.popleft()
+            sent_at = self._sent_at.pop(sequence)
+            if sequence == input_ack:
+                self.round_trips.append(perf_counter() - sent_at)
+                if predicted != server_state:
+                    self.corrections += 1
+
+        player = self.simulation.players[self.slot]
+        pending = self._pending
+        self._pending = deque()
+        for sequence, action, _ in pending:
+            player.apply_actions(action)
+            player.update()
+            self._pending.append((sequence, action, player.snapshot()))
+
+    def close(self):
+        if self._writer is not None:
+            self._loop.call_soon_threadsafe(self._writer.close)
+
+    def report(self) -> list:
+        """
+        Linhas de texto com a latência medida, a banda usada e as correções da predição.
+        """
+        frames = max(self.simulation.frame, 1)
+        seconds = frames / NetworkConfig.TICK_RATE
+        lines = [f'jogador {self.slot}: enviados {self.bytes_sent} bytes ({self.bytes_sent * 8 / seconds / 1000:.1f} kbit/s), '
+                 f'recebidos {self.bytes_received} bytes ({self.bytes_received * 8 / seconds / 1000:.1f} kbit/s, '
+                 f'{self.bytes_received / max(self.snapshots, 1):.1f} bytes por estado)']
+        if self.round_trips:
+            round_trips = np.array(self.round_trips) * 1000
+            lines.append(f'jogador {self.slot}: ida e volta média {round_trips.mean():.1f} ms, '
+                         f'p95 {np.percentile(round_trips, 95):.1f} ms; '
+                         f'{self.corrections} correções da predição em {len(self.round_trips)} frames confirmados')
+        return lines
+
+
+async def loopback(level=None, latency_ms: float = 0, max_frames: int = 3600) -> tuple:
+    """
+    Partida completa pela interface de rede local, com os dois jogadores controlados pelo computador.
+
+    Returns
+    -------
+    tuple
+        O resultado, o servidor e os clientes, para os relatórios.
+    """
+    from .ai import controller_for
+
+    server = GameServer(level, port=0)
+    await server.start()
+    clients = [NetworkClient(server.host, server.port, latency_ms) for _ in server.simulation.players]
+    for client in clients:
+        await client.connect(server.level)
+
+    async def drive(client):
+        player = client.simulation.players[client.slot]
+        controller = controller_for(client.level, player.element)
+        loop = asyncio.get_running_loop()
+        period = 1 / NetworkConfig.TICK_RATE
+        deadline = loop.time()
+        while client.connected and client.simulation.running_phase and client.simulation.frame < max_frames:
+            client.step(controller.act(player))
+            deadline += period
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+        client.poll()
+
+    result, *_ = await asyncio.gather(server.run(max_frames), *(drive(client) for client in clients))
+    server.close()
+    for client in clients:
+        client.close()
+    return result, server, clients
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Modo em rede.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='roda o servidor')
+    serve.add_argument('level', nargs='?', help='nome da fase (padrão: a fase padrão)')
+    serve.add_argument('--host', default=NetworkConfig.HOST)
+    serve.add_argument('--port', type=int, default=NetworkConfig.PORT)
+    join = commands.add_parser('join', help='entra em uma partida, com janela')
+    join.add_argument('host', nargs='?', default=NetworkConfig.HOST)
+    join.add_argument('--port', type=int, default=NetworkConfig.PORT)
+    join.add_argument('--latency', type=float, default=0, help='atraso artificial de ida e volta, em ms')
+    test = commands.add_parser('loopback', help='partida de teste na máquina local, sem janela')
+    test.add_argument('level', nargs='?', help='nome da fase (padrão: a fase padrão)')
+    test.add_argument('--latency', type=float, default=0, help='atraso artificial de ida e volta, em ms')
+    test.add_argument('--frames', type=int, default=3600, help='limite de frames da partida')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        async def serve_forever():
+            server = GameServer(args.level, args.host, args.port)
+            await server.start()
+            print(f'esperando os jogadores em {args.host}:{server.port}')
+            print(f'resultado: {await server.run()}')
+            print('\n'.join(server.report()))
+        asyncio.run(serve_forever())
+
+    elif args.command == 'join':
+        import pygame
+        from .config import ScreenSettings
+        from .game import Game
+
+        client = NetworkClient(args.host, args.port, args.latency)
+        client.start()
+        screen = pygame.display.set_mode((ScreenSettings.WIDTH, ScreenSettings.HEIGHT))
+        game = Game(screen, level=client.level, network=client)
+        game.set_screen()
+        game.run()
+        game.export_profile()
+        client.close()
+        print(f'resultado: {game.result}')
+        print('\n'.join(client.report()))
+
+    else:
+        start = perf_counter()
+        result, server, clients = asyncio.run(loopback(args.level, args.latency, args.frames))
+        print(f'resultado: {result} em {server.tick} frames ({perf_counter() - start:.1f} s)')
+        print('\n'.join(server.report()))
+        for client in clients:
+            print('\n'.join(client.report()))
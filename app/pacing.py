@@ -0,0 +1,191 @@
+"""
+Módulo responsável pelo ritmo do loop do jogo.
+
+A simulação avança em passos de duração fixa (``FixedTimestep``), acumulando o
+tempo real de cada frame: um frame desenhado pode ter zero, um ou vários
+passos, e a fração de passo que sobra serve para interpolar a posição dos
+jogadores no desenho. Assim a velocidade do jogo não depende de quantos frames
+por segundo a máquina consegue desenhar.
+
+O ``FramePacer`` limita os frames desenhados por segundo, dormindo ou
+esperando ativamente até o horário do próximo frame, e guarda a duração dos
+frames recentes para medir a irregularidade (jitter) do ritmo.
+
+Uso pela linha de comando (compara as formas de espera, sem janela)::
+
+    python -m app.pacing --cap 144 --frames 600
+"""
+
+
+import time
+from collections import deque
+import numpy as np
+from .config import PacingConfig
+
+
+class FixedTimestep:
+    """
+    Acumulador de tempo que converte a duração de cada frame em passos fixos da simulação.
+
+    Atributes:
+    ----------
+    dt : float
+        Duração de um passo, em segundos.
+    accumulator : float
+        Tempo acumulado ainda não simulado, em segundos.
+    dropped : float
+        Tempo descartado por exceder ``max_steps`` passos em um frame, em segundos.
+    """
+
+    def __init__(self, rate: int = PacingConfig.TICK_RATE, max_steps: int = PacingConfig.MAX_STEPS):
+        self.dt = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, elapsed: float) -> int:
+        """
+        Soma a duração do frame e devolve quantos passos devem ser simulados.
+        """
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            self.dropped += self.accumulator - self.max_steps * self.dt
+            self.accumulator = self.max_steps * self.dt
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """
+        Fração do próximo passo já decorrida, entre 0 e 1, usada na interpolação.
+        """
+        return min(self.accumulator / self.dt, 1.0)
+
+
+class FramePacer:
+    """
+    Limita os frames por segundo e mede o intervalo entre eles.
+
+    Atributes:
+    ----------
+    cap : int
+        Limite de frames por segundo (0 para não limitar).
+    mode : str
+        'sleep' ou 'busy' (ver ``PacingConfig.MODE``).
+    frames : int
+        Quantidade de frames medidos.
+    late : int
+        Quantidade de frames que começaram depois do horário previsto por mais de um intervalo.
+    """
+
+    def __init__(self, cap: int = PacingConfig.FRAME_CAP, mode: str = PacingConfig.MODE,
+                 spin_ms: float = PacingConfig.SPIN_MS, window: int = PacingConfig.WINDOW):
+        if mode not in ('sleep', 'busy'):
+            raise ValueError(f"modo de espera desconhecido: {mode!r} (use 'sleep' ou 'busy')")
+        self.cap = cap
+        self.mode = mode
+        self._spin = spin_ms / 1000
+        self._intervals = deque(maxlen=window)
+        self.frames = 0
+        self.late = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Recomeça a contagem a partir de agora, por exemplo depois de uma pausa ou troca de tela.
+        """
+        self._last = self._deadline = time.perf_counter()
+
+    def wait(self) -> float:
+        """
+        Espera o horário do próximo frame, se houver limite.
+
+        Returns
+        -------
+        float
+            Tempo real desde o frame anterior, em segundos.
+        """
+        if self.cap:
+            period = 1 / self.cap
+            self._deadline += period
+            now = time.perf_counter()
+            if now > self._deadline + period:
+                # Muito atrasado: recomeça a grade de horários em vez de tentar recuperar
+                self.late += 1
+                self._deadline = now
+            elif self.mode == 'sleep':
+                if self._deadline > now:
+                    time.sleep(self._deadline - now)
+            else:
+                if self._deadline - self._spin > now:
+                    time.sleep(self._deadline - self._spin - now)
+                while time.perf_counter() < self._deadline:
+                    pass
+
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self._intervals.append(elapsed)
+        self.frames += 1
+        return elapsed
+
+    def stats(self) -> dict:
+        """
+        Estatísticas dos intervalos entre os frames recentes, em milissegundos.
+
+        ``jitter_ms`` é o desvio padrão dos intervalos; com limite, ``error_ms`` é o
+        desvio médio absoluto em relação ao intervalo desejado.
+        """
+        if not self._intervals:
+            return {}
+        intervals = np.asarray(self._intervals) * 1000
+        stats = {
+            'mean_ms': float(intervals.mean()),
+            'jitter_ms': float(intervals.std()),
+            'p50_ms': float(np.percentile(intervals, 50)),
+            'p99_ms': float(np.percentile(intervals, 99)),
+            'max_ms': float(intervals.max()),
+            'late': self.late,
+        }
+        if self.cap:
+            stats['error_ms'] = float(np.abs(intervals - 1000 / self.cap).mean())
+        return stats
+
+    def summary(self) -> list:
+        """
+        Linhas de texto com o ritmo dos frames recentes, usadas no resumo na tela.
+        """
+        stats = self.stats()
+        if not stats:
+            return []
+        return [f'frame {stats["mean_ms"]:5.2f} ms ({1000 / stats["mean_ms"]:.0f} fps)',
+                f'jitter {stats["jitter_ms"]:5.2f} p99 {stats["p99_ms"]:5.2f} ms']
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mede a regularidade do ritmo de frames de cada forma de espera.')
+    parser.add_argument('--cap', type=int, default=PacingConfig.FRAME_CAP, help='limite de frames por segundo')
+    parser.add_argument('--frames', type=int, default=600, help='frames medidos em cada forma')
+    parser.add_argument('--work-ms', type=float, default=2.0, help='trabalho simulado em cada frame, em ms')
+    args = parser.parse_args()
+
+    for mode in ('sleep', 'busy'):
+        pacer = FramePacer(args.cap, mode, window=args.frames)
+        start = time.process_time()
+        for _ in range(args.frames):
+            pacer.wait()
+            end = time.perf_counter() + args.work_ms / 1000
+            while time.perf_counter() < end:
+                pass
+        cpu = time.process_time() - start
+        stats = pacer.stats()
+        print(f'{mode:<6} média {stats["mean_ms"]:.3f} ms, jitter {stats["jitter_ms"]:.3f} ms, '
+              f'erro médio {stats.get("error_ms", 0):.3f} ms, p99 {stats["p99_ms"]:.3f} ms, '
+              f'CPU {cpu / (stats["mean_ms"] * args.frames / 1000):.0%}')
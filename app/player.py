@@ -1,5 +1,13 @@
 import pygame
-from .config import Map, ScreenSettings, PlayerConfig,TilesConfig
+from .config import Map, PlayerConfig, Actions
+from .collision import TileGrid
+
+
+# Tipos de tile consultados em cada verificação de colisão
+_BLOCKS = (Map.BLOCK,)
+_PLATFORMS = (Map.PLATF,)
+_LAVA = (Map.LAVA,)
+_WATER = (Map.WATER,)
 
 
 class Player(pygame.sprite.Sprite):
@@ -17,17 +25,8 @@ class Player(pygame.sprite.Sprite):
     column : int
         Coluna inicial do jogador no mapa.
 
-    platforms : pygame.sprite.Group
-        Grupo de plataformas no jogo.
-
-    blocks : pygame.sprite.Group
-        Grupo de blocos no jogo.
-
-    lava : pygame.sprite.Group
-        Grupo de lava no jogo.
-
-    water : pygame.sprite.Group
-        Grupo de água no jogo.
+    tiles : TileGrid
+        Índice espacial dos tiles do mapa, usado para tratar as colisões.
 
     element : str
         Tipo do jogador, 'water' ou 'fire'.
@@ -54,27 +53,21 @@ class Player(pygame.sprite.Sprite):
         Vida do jogador.
     """
     def __init__(self, player_img : pygame.Surface, row:  int, column : int, 
-                 platforms : pygame.sprite.Group, blocks : pygame.sprite.Group, 
-                 lava : pygame.sprite.Group, water : pygame.sprite.Group, element : str):
+                 tiles : TileGrid, element : str):
         """
         Inicializa a classe Player.
 
         Parameters
         ----------
         player_img : pygame.Surface
-            Uma superfície Pygame representando a imagem do jogador.
+            Uma superfície Pygame representando a imagem do jogador. Pode ser
+            None quando o jogador só é simulado, sem ser desenhado.
         row : int
             A linha inicial do jogador.
         column : int
             A coluna inicial do jogador.
-        platforms : pygame.sprite.Group
-            Grupo de sprites representando plataformas no jogo.
-        blocks : pygame.sprite.Group
-            Grupo de sprites representando blocos no jogo.
-        lava : pygame.sprite.Group
-            Grupo de sprites representando lava no jogo.
-        water : pygame.sprite.Group
-            Grupo de sprites representando água no jogo.
+        tiles : TileGrid
+            Índice espacial com os tiles do mapa.
         element : str
             Uma string indicando o tipo de jogador (por exemplo, 'água' ou 'fogo').
         """
@@ -85,24 +78,32 @@ class Player(pygame.sprite.Sprite):
         # Usamos o estado para decidir se o jogador pode ou não pular
         self.state = PlayerConfig.STILL
 
-        # Ajusta o tamanho da imagem que representa o boneco
-        player_img = pygame.transform.scale(player_img, (PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT))
+        if player_img is None:
+            # Simulação sem tela: só o retângulo de colisão importa
+            self.image = None
+            self.rect = pygame.Rect(0, 0, PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT)
+        else:
+            # Ajusta o tamanho da imagem que representa o boneco, se ainda não estiver escalada
+            if player_img.get_size() != (PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT):
+                player_img = pygame.transform.scale(player_img, (PlayerConfig.PLAYER_WIDTH, PlayerConfig.PLAYER_HEIGHT))
+
+            # Define a imagem do sprite.
+            self.image = player_img
+            
+            # Detalhes sobre o posicionamento.
+            self.rect = self.image.get_rect()
 
-        # Define a imagem do sprite.
-        self.image = player_img
-        
-        # Detalhes sobre o posicionamento.
-        self.rect = self.image.get_rect()
+        # Guarda o índice dos tiles para tratar as colisões
+        self.tiles = tiles
 
-        # Guarda os grupos de sprites para tratar as colisões
-        self.platforms = platforms
-        self.blocks = blocks
-        self.lava = lava
-        self.water = water
+        # Maior deslocamento, em cada eixo, que ainda termina sobrepondo qualquer
+        # tile atravessado no caminho; movimentos maiores são divididos em subpassos
+        self._max_step_x = tiles.tile_size + self.rect.width - 1
+        self._max_step_y = tiles.tile_size + self.rect.height - 1
 
         # Posiciona o personagem
-        self.rect.x = column * TilesConfig.TILE_SIZE
-        self.rect.bottom = row * TilesConfig.TILE_SIZE
+        self.rect.x = column * tiles.tile_size
+        self.rect.bottom = row * tiles.tile_size
 
         # Inicializa velocidades
         self.speedx = 0
@@ -129,29 +130,60 @@ class Player(pygame.sprite.Sprite):
         """
         return self._element
 
-    def update(self):
+    def snapshot(self) -> tuple:
         """
-        Atualiza movimento, colisões e estado. Método usado por sprites
-        do pygame.
+        Guarda o estado mutável do jogador (posição, velocidades, estado, altura e vida) em uma tupla.
+        """
+        return (self.rect.x, self.rect.y, self.speedx, self.speedy, self.state,
+                self.highest_y, self.life, self.health)
+
+    def restore(self, snapshot: tuple):
+        """
+        Volta ao estado guardado por ``snapshot``.
         """
-        self.__update_movement_y()
-        self.__check_block_collision()
-        self.__check_platform_collision()
-        self.__check_lava_collision()
-        self.__update_movement_x()
-        self.__check_screen_limit()
-        self.__check_horizontal_collision()
-        self.__death()
-        self.__check_water_collision()
+        (self.rect.x, self.rect.y, self.speedx, self.speedy, self.state,
+         self.highest_y, self.life, self.health) = snapshot
 
-    def __update_movement_y(self):
+    def update(self, dt: int = 1):
         """
-        Atualiza o movimento vertical levando em consideração a gravidade
-        e o estado do jogador (se está caindo ou não).
+        Atualiza movimento, colisões e estado. Método usado por sprites
+        do pygame.
+
+        O deslocamento do passo é varrido em subpassos: cada subpasso é menor
+        que um tile somado ao tamanho do jogador, então qualquer tile no caminho
+        é encontrado pelas verificações de colisão e nunca atravessado, mesmo
+        com passos longos ou velocidades altas. Com ``dt = 1`` e velocidades
+        até ``PlayerConfig.TERMINAL_VELOCITY`` há um único subpasso.
+
+        Parameters
+        ----------
+        dt : int
+            Duração do passo, em frames de ``ScreenSettings.FPS`` (por exemplo,
+            2 para simular a 30 frames por segundo).
+        """
+        self.__update_speed_y(dt)
+        dx = self.speedx * dt
+        dy = self.speedy * dt
+        steps = max(1, -(-abs(dx) // self._max_step_x), -(-abs(dy) // self._max_step_y))
+        for step in range(steps):
+            self.__update_movement_y(dy * (step + 1) // steps - dy * step // steps)
+            self.__check_block_collision()
+            self.__check_platform_collision()
+            self.__check_lava_collision()
+            self.__update_movement_x(dx * (step + 1) // steps - dx * step // steps)
+            self.__check_screen_limit()
+            self.__check_horizontal_collision()
+            self.__death()
+            self.__check_water_collision()
+
+    def __update_speed_y(self, dt: int):
+        """
+        Atualiza a velocidade vertical levando em consideração a gravidade,
+        limitada à velocidade terminal, e o estado do jogador (se está caindo ou não).
         """
         # Atualiza a velocidade vertical do jogador adicionando a constante
-        # de gravidade definida em Map.GRAVITY.
-        self.speedy += Map.GRAVITY
+        # de gravidade definida em Map.GRAVITY, sem passar da velocidade terminal.
+        self.speedy = min(self.speedy + Map.GRAVITY * dt, PlayerConfig.TERMINAL_VELOCITY)
 
         # Verifica se a velocidade vertical (speedy) é maior que zero, 
         # indicando que o jogador está se movendo para baixo.
@@ -160,8 +192,14 @@ class Player(pygame.sprite.Sprite):
             # jogador para "FALLING" (cair).
             self.state = PlayerConfig.FALLING
 
-        # Atualiza a posição vertical do jogador com base na sua velocidade vertical.
-        self.rect.y += self.speedy
+    def __update_movement_y(self, distance: int):
+        """
+        Move o jogador verticalmente em um subpasso.
+        """
+        # Atualiza a posição vertical do jogador; depois de bater em um bloco ou
+        # pousar (velocidade zerada) ele não se move mais neste passo.
+        if self.speedy != 0:
+            self.rect.y += distance
 
         # Verifica se o estado do jogador não é "FALLING", o que significa
         # que o jogador não está atualmente caindo.
@@ -175,17 +213,17 @@ class Player(pygame.sprite.Sprite):
         Verifica e trata colisões verticais com blocos. Os blocos
         não podem ser atravessados.
         """
-        collisions = pygame.sprite.spritecollide(self, self.blocks, False)
+        collisions = self.tiles.collide(self.rect, _BLOCKS)
         
-        for collision in collisions:
+        for _, tile_rect in collisions:
             
             if self.speedy > 0:
-                self.rect.bottom = collision.rect.top
+                self.rect.bottom = tile_rect.top
                 self.speedy = 0
                 self.state = PlayerConfig.STILL
             
             elif self.speedy < 0:
-                self.rect.top = collision.rect.bottom  
+                self.rect.top = tile_rect.bottom  
                 self.speedy = 0
                 self.state = PlayerConfig.STILL
 
@@ -195,52 +233,53 @@ class Player(pygame.sprite.Sprite):
         ser atravessadas por baixo.
         """
         if self.speedy > 0: 
-            collisions = pygame.sprite.spritecollide(self, self.platforms, False)
+            collisions = self.tiles.collide(self.rect, _PLATFORMS)
             
-            for platform in collisions:
+            for _, platform in collisions:
             
-                if self.highest_y <= platform.rect.top:
-                    self.rect.bottom = platform.rect.top
+                if self.highest_y <= platform.top:
+                    self.rect.bottom = platform.top
                     self.highest_y = self.rect.bottom
                     self.speedy = 0
                     self.state = PlayerConfig.STILL
 
-    def __update_movement_x(self):
+    def __update_movement_x(self, distance: int):
         """ 
-        Atualiza o movimento horizontal usando as coordenadas do rect do sprite.
+        Atualiza o movimento horizontal de um subpasso usando as coordenadas do rect do sprite.
         """
-        self.rect.x += self.speedx
+        self.rect.x += distance
 
     def __check_screen_limit(self):
         """
-        Impede que o player passe do limite lateral da tela.
+        Impede que o player passe do limite lateral do mapa (que, nas fases
+        do tamanho da tela, coincide com a borda da tela).
         """
         if self.rect.left < 0:
             self.rect.left = 0
-        elif self.rect.right >= ScreenSettings.WIDTH:
-            self.rect.right = ScreenSettings.WIDTH - 1 
+        elif self.rect.right >= self.tiles.width:
+            self.rect.right = self.tiles.width - 1 
 
     def __check_horizontal_collision(self):
         """
         Verifica e trata colisões horizontais com blocos.
         """
-        collisions = pygame.sprite.spritecollide(self, self.blocks, False)        
+        collisions = self.tiles.collide(self.rect, _BLOCKS)
         
-        for collision in collisions:            
+        for _, tile_rect in collisions:            
             if self.speedx > 0:
-                self.rect.right = collision.rect.left
+                self.rect.right = tile_rect.left
             elif self.speedx < 0:
-                self.rect.left = collision.rect.right
+                self.rect.left = tile_rect.right
 
     def __check_lava_collision(self):
         """
         Verifica e trata colisões com elementos de lava. A watergirl morre ao
         encostar na lava e o fireboy pode nadar na lava.
         """
-        collisions = pygame.sprite.spritecollide(self, self.lava, False)
+        collisions = self.tiles.collide(self.rect, _LAVA)
         
-        for lava in collisions:
-            if self._element == 'water' and self.highest_y <= lava.rect.top:
+        for _, lava in collisions:
+            if self._element == 'water' and self.highest_y <= lava.top:
                 self.health = 0
 
     def __check_water_collision(self):
@@ -248,10 +287,10 @@ class Player(pygame.sprite.Sprite):
         Verifica e trata colisões com elementos de água. A watergirl pode 
         nadar na água e o fireboy morre ao encostar na água.
         """
-        collisions = pygame.sprite.spritecollide(self, self.water, False)
+        collisions = self.tiles.collide(self.rect, _WATER)
         
-        for water in collisions:
-            if self._element == 'fire' and self.highest_y <= water.rect.top:
+        for _, water in collisions:
+            if self._element == 'fire' and self.highest_y <= water.top:
                 self.health = 0
 
     def jump(self):
@@ -262,6 +301,17 @@ class Player(pygame.sprite.Sprite):
             self.speedy -= PlayerConfig.JUMP_SIZE
             self.state = PlayerConfig.JUMPING
 
+    def apply_actions(self, actions: int):
+        """
+        Aplica as ações de um frame, combinadas como bits de ``Actions``.
+
+        A velocidade horizontal passa a refletir as direções ativas e o pulo
+        é tentado se ``Actions.JUMP`` estiver presente.
+        """
+        self.speedx = PlayerConfig.SPEED_X * (bool(actions & Actions.RIGHT) - bool(actions & Actions.LEFT))
+        if actions & Actions.JUMP:
+            self.jump()
+
     def walk_to_left(self):
         """
         Move para a esquerda o personagem utilizando a posicao do rect dele
@@ -296,5 +346,6 @@ class Player(pygame.sprite.Sprite):
         do mapa, ou caia na água se for o fireboy, ou caia no fogo se for a
         watergirl.
         """
-        if self.rect.bottom >= 859 or self.health == 0:
+        # Morre quando o corpo inteiro passa da borda inferior do mapa
+        if self.rect.bottom >= self.tiles.height + PlayerConfig.PLAYER_HEIGHT - 1 or self.health == 0:
             self.life = False
\ No newline at end of file
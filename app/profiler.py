@@ -0,0 +1,193 @@
+"""
+Módulo responsável pela medição do tempo gasto em cada etapa de um frame.
+
+O ``FrameProfiler`` marca com ``time.perf_counter_ns`` o fim de cada etapa do
+loop do jogo, guarda uma janela móvel dos últimos frames para calcular
+percentis (p50/p95/p99) e quantos frames estouraram o orçamento, e pode
+exportar os últimos frames medidos (até ``ProfilerConfig.MAX_RECORDS``) para
+CSV ou JSON. Quando está desligado, cada
+marcação custa apenas uma verificação de atributo.
+"""
+
+
+import csv
+import json
+import numpy as np
+from collections import deque
+from time import perf_counter_ns
+from .config import ScreenSettings, ProfilerConfig
+
+
+class FrameProfiler:
+    """
+    Cronômetro das etapas de cada frame.
+
+    Atributes:
+    ----------
+    phases : tuple
+        Nomes das etapas medidas, na ordem em que acontecem no frame.
+    enabled : bool
+        Indica se as medições estão sendo feitas.
+    overlay : bool
+        Indica se o resumo das medições deve ser desenhado na tela.
+    budget_ns : int
+        Duração máxima desejada de um frame, em nanossegundos.
+    frames : int
+        Quantidade de frames medidos.
+    budget_misses : int
+        Quantidade de frames medidos que passaram do orçamento.
+    records : deque
+        Uma tupla por frame medido: número do frame, duração de cada etapa e duração total (ns).
+        Guarda apenas os ``max_records`` frames mais recentes.
+    """
+
+    def __init__(self, phases: tuple, enabled: bool = ProfilerConfig.ENABLED,
+                 window: int = ProfilerConfig.WINDOW, fps: int = ScreenSettings.FPS,
+                 max_records: int = ProfilerConfig.MAX_RECORDS):
+        """
+        Parameters
+        ----------
+        phases : tuple
+            Nomes das etapas do frame.
+        enabled : bool
+            Se as medições começam ligadas.
+        window : int
+            Quantidade de frames recentes usados nos percentis.
+        fps : int
+            Frames por segundo desejados, que definem o orçamento de cada frame.
+        max_records : int
+            Quantidade máxima de frames guardados para exportação.
+        """
+        self.phases = tuple(phases)
+        self.enabled = enabled
+        self.overlay = False
+        self._enabled_before_overlay = enabled
+        self.budget_ns = 1_000_000_000 // fps
+        self.frames = 0
+        self.budget_misses = 0
+        self.records = deque(maxlen=max_records)
+        self._window = deque(maxlen=window)
+        self._index = {phase: index for index, phase in enumerate(self.phases)}
+        self._current = None
+        self._start = self._last = 0
+
+    def begin_frame(self):
+        """
+        Marca o início de um frame.
+        """
+        if not self.enabled:
+            return
+        self._current = [0] * len(self.phases)
+        self._start = self._last = perf_counter_ns()
+
+    def mark(self, phase: str):
+        """
+        Marca o fim de uma etapa; o tempo desde a marcação anterior é somado a ela.
+        """
+        if self._current is None:
+            return
+        now = perf_counter_ns()
+        self._current[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """
+        Marca o fim do frame e guarda suas medições.
+        """
+        if self._current is None:
+            return
+        total = perf_counter_ns() - self._start
+        record = (self.frames, *self._current, total)
+        self.records.append(record)
+        self._window.append(record[1:])
+        self.frames += 1
+        if total > self.budget_ns:
+            self.budget_misses += 1
+        self._current = None
+
+    @property
+    def dropped(self) -> int:
+        """
+        Quantidade de frames medidos que já foram descartados de ``records``.
+        """
+        return self.frames - len(self.records)
+
+    def toggle_overlay(self):
+        """
+        Liga ou desliga o resumo na tela. Ligar o resumo liga as medições, e
+        desligá-lo as deixa como estavam antes.
+        """
+        self.overlay = not self.overlay
+        if self.overlay:
+            self._enabled_before_overlay = self.enabled
+            self.enabled = True
+        else:
+            self.enabled = self._enabled_before_overlay
+
+    def percentiles(self, quantiles=(50, 95, 99)) -> dict:
+        """
+        Percentis da janela recente, em milissegundos.
+
+        Returns
+        -------
+        dict
+            Associa cada etapa (e 'total') à lista de percentis pedidos.
+        """
+        if not self._window:
+            return {}
+        window = np.asarray(self._window, dtype=np.float64) / 1e6
+        values = np.percentile(window, quantiles, axis=0)
+        return {name: values[:, column].tolist() for column, name in enumerate(self.phases + ('total',))}
+
+    def summary(self) -> list:
+        """
+        Linhas de texto com os percentis de cada etapa, usadas no resumo na tela.
+        """
+        lines = [f'{"etapa":<11} p50   p95   p99 (ms)']
+        for name, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f'{name:<11}{p50:5.2f} {p95:5.2f} {p99:5.2f}')
+        lines.append(f'estouros: {self.budget_misses}/{self.frames}')
+        return lines
+
+    def export_csv(self, filename: str):
+        """
+        Grava uma linha por frame guardado, com a duração de cada etapa em nanossegundos.
+
+        Se frames antigos foram descartados, a primeira linha é um comentário
+        (``#``) com a quantidade descartada.
+        """
+        with open(filename, 'w', newline='') as file:
+            if self.dropped:
+                file.write(f'# {self.dropped} frames antigos descartados\n')
+            writer = csv.writer(file)
+            writer.writerow(('frame',) + self.phases + ('total',))
+            writer.writerows(self.records)
+
+    def export_json(self, filename: str):
+        """
+        Grava os frames guardados, a quantidade de frames descartados e os percentis da janela recente em JSON.
+        """
+        with open(filename, 'w') as file:
+            json.dump({
+                'phases': self.phases,
+                'budget_ns': self.budget_ns,
+                'budget_misses': self.budget_misses,
+                'dropped_frames': self.dropped,
+                'percentiles_ms': self.percentiles(),
+                'frames': [dict(zip(('frame',) + self.phases + ('total',), record)) for record in self.records],
+            }, file)
+
+    def export(self, filename: str) -> int:
+        """
+        Grava os frames guardados em CSV ou JSON, conforme a extensão do arquivo.
+
+        Returns
+        -------
+        int
+            Quantidade de frames antigos que foram descartados e não estão no arquivo.
+        """
+        if filename.endswith('.json'):
+            self.export_json(filename)
+        else:
+            self.export_csv(filename)
+        return self.dropped
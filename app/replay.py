@@ -0,0 +1,265 @@
+"""
+Módulo responsável pela gravação das entradas de uma partida e pela sua reprodução.
+
+Como a ``Simulation`` é determinística, basta guardar as ações de cada frame
+(junto com a fase e a semente do gerador aleatório) para reproduzir uma partida
+inteira. As ações são gravadas em execuções (run-length): cada trecho em que
+nenhum jogador mudou de ação ocupa poucos bytes, e gravar um frame custa só uma
+comparação. A reprodução roda sem tela, na velocidade máxima, e pode desenhar
+apenas os frames escolhidos.
+
+Uso pela linha de comando::
+
+    python -m app.replay partida.fwr --render 100 5000 --out frames
+"""
+
+
+import random
+import struct
+import pygame
+from os import path
+from .config import Colors, PlayerConfig
+from .simulation import Simulation
+from .level import load_level
+from .camera import Camera, ChunkCache
+
+
+MAGIC = b'FWRP'
+VERSION = 1
+REPLAY_EXTENSION = '.fwr'
+
+# magic, versão, semente, quantidade de jogadores, tamanho do nome da fase
+_HEADER = struct.Struct('<4sHQBH')
+
+
+def _write_varint(buffer: bytearray, value: int):
+    """
+    Escreve um inteiro não negativo usando 7 bits por byte.
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple:
+    """
+    Lê um inteiro escrito por ``_write_varint``. Devolve (valor, próximo offset).
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class InputRecorder:
+    """
+    Grava as ações de cada frame de uma partida em execuções (run-length).
+
+    Atributes:
+    ----------
+    level_id : str
+        Identificador da fase jogada.
+    seed : int
+        Semente do gerador aleatório usada na partida.
+    frames : int
+        Quantidade de frames gravados.
+    """
+
+    def __init__(self, level_id: str, seed: int, players: int = 2):
+        self.level_id = level_id
+        self.seed = seed
+        self.players = players
+        self.frames = 0
+        self._runs = []
+        self._current = None
+        self._count = 0
+
+    def record(self, actions):
+        """
+        Acrescenta as ações de um frame, na ordem de ``Simulation.players``.
+        """
+        actions = tuple(actions)
+        self.frames += 1
+        if actions == self._current:
+            self._count += 1
+            return
+        if self._count:
+            self._runs.append((self._count, self._current))
+        self._current = actions
+        self._count = 1
+
+    @property
+    def runs(self) -> list:
+        """
+        Lista de pares (quantidade de frames, ações), incluindo a execução atual.
+        """
+        return self._runs + ([(self._count, self._current)] if self._count else [])
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializa a gravação no formato de arquivo de replay.
+        """
+        name = self.level_id.encode('utf-8')
+        buffer = bytearray(_HEADER.pack(MAGIC, VERSION, self.seed, self.players, len(name)))
+        buffer += name
+        for count, actions in self.runs:
+            _write_varint(buffer, count)
+            buffer += bytes(actions)
+        return bytes(buffer)
+
+    def save(self, filename: str):
+        """
+        Grava o replay em disco.
+        """
+        with open(filename, 'wb') as file:
+            file.write(self.to_bytes())
+
+
+class Replay:
+    """
+    Partida gravada, que pode ser percorrida frame a frame.
+
+    Atributes:
+    ----------
+    level_id : str
+        Identificador da fase jogada.
+    seed : int
+        Semente do gerador aleatório usada na partida.
+    runs : list
+        Pares (quantidade de frames, ações de cada jogador).
+    """
+
+    def __init__(self, level_id: str, seed: int, runs: list):
+        self.level_id = level_id
+        self.seed = seed
+        self.runs = runs
+
+    @property
+    def frames(self) -> int:
+        return sum(count for count, _ in self.runs)
+
+    def __iter__(self):
+        for count, actions in self.runs:
+            for _ in range(count):
+                yield actions
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        Lê um replay serializado por ``InputRecorder.to_bytes``.
+
+        Raises
+        ------
+        ValueError
+            Se os dados não forem um replay válido.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError('dados curtos demais para um replay')
+        magic, version, seed, players, name_size = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'não é um replay (versão {VERSION})')
+        offset = _HEADER.size
+        level_id = data[offset:offset + name_size].decode('utf-8')
+        offset += name_size
+
+        runs = []
+        while offset < len(data):
+            count, offset = _read_varint(data, offset)
+            runs.append((count, tuple(data[offset:offset + players])))
+            offset += players
+        return cls(level_id, seed, runs)
+
+    @classmethod
+    def load(cls, filename: str):
+        """
+        Lê um replay gravado em disco.
+        """
+        with open(filename, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+
+def play(replay: Replay, level=None, render=None, render_frames=()) -> Simulation:
+    """
+    Reproduz um replay sem tela, o mais rápido possível.
+
+    Parameters
+    ----------
+    replay : Replay
+        A partida gravada.
+    level : Level, optional
+        A fase. Se None, é carregada pelo identificador gravado no replay.
+    render : callable, optional
+        Função chamada como ``render(simulation, frame)`` depois de cada frame escolhido.
+    render_frames : collection
+        Números dos frames (contados a partir de 1) que devem ser passados para ``render``.
+
+    Returns
+    -------
+    Simulation
+        A simulação no estado do último frame reproduzido.
+    """
+    random.seed(replay.seed)
+    simulation = Simulation(level if level is not None else load_level(replay.level_id))
+    render_frames = set(render_frames) if render is not None else ()
+
+    step = simulation.step
+    for actions in replay:
+        running = step(actions)
+        if simulation.frame in render_frames:
+            render(simulation, simulation.frame)
+        if not running:
+            break
+    return simulation
+
+
+def render_frame(simulation: Simulation, surface, assets) -> None:
+    """
+    Desenha o estado da simulação em uma superfície, com a câmera nos jogadores.
+    """
+    camera = Camera(surface.get_size(), (simulation.tile_grid.width, simulation.tile_grid.height))
+    camera.follow([player.rect for player in simulation.players])
+    chunks = ChunkCache(simulation.level, assets, [(Colors.BLUE, simulation.waterdoor), (Colors.RED, simulation.firedoor)])
+
+    surface.fill(Colors.WHITE)
+    for chunk, position in chunks.update(camera.rect):
+        surface.blit(chunk, (position[0] - camera.rect.x, position[1] - camera.rect.y))
+    images = {'fire': PlayerConfig.FIREBOY_IMG, 'water': PlayerConfig.WATERGIRL_IMG}
+    for player in simulation.players:
+        surface.blit(assets.scaled(images[player.element], player.rect.size), camera.apply(player.rect))
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description='Reproduz um replay sem tela.')
+    parser.add_argument('replay', help='arquivo .fwr gravado pelo jogo')
+    parser.add_argument('--render', type=int, nargs='*', default=[], help='frames que devem ser salvos como imagem')
+    parser.add_argument('--out', default='.', help='diretório das imagens')
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    render = None
+    if args.render:
+        from .assets import asset_manager
+        from .config import ScreenSettings
+        # Os frames são desenhados fora da tela
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        screen = pygame.display.set_mode((ScreenSettings.WIDTH, ScreenSettings.HEIGHT))
+
+        def render(simulation, frame):
+            render_frame(simulation, screen, asset_manager)
+            pygame.image.save(screen, path.join(args.out, f'frame_{frame:06d}.png'))
+
+    start = time.perf_counter()
+    simulation = play(replay, render=render, render_frames=args.render)
+    elapsed = time.perf_counter() - start
+    print(f'{simulation.frame} frames em {elapsed:.3f} s ({simulation.frame / max(elapsed, 1e-9):.0f} frames/s), '
+          f'resultado: {simulation.result}')
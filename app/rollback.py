@@ -0,0 +1,391 @@
+"""
+Módulo responsável pelo jogo em rede com rollback, sem atraso nas entradas.
+
+Cada máquina roda a própria ``Simulation`` com os dois jogadores e aplica a
+ação local na hora. A ação do outro jogador ainda não recebida é prevista (a
+última conhecida, sem repetir o pulo). Quando a ação real chega e é diferente
+da prevista, a ``RollbackSession`` volta ao estado guardado daquele frame e
+simula de novo até o frame atual. Os estados dos últimos frames ficam em um
+buffer circular e custam só uma tupla cada (``Simulation.snapshot``).
+
+As ações são enviadas junto com as dos frames anteriores ainda dentro da
+janela de rollback, então uma mensagem perdida é coberta pela seguinte e o
+transporte pode ser UDP. Para testes há um transporte local com latência,
+variação e perda simuladas, medidas em frames.
+
+Uso pela linha de comando::
+
+    python -m app.rollback --latency 6 --jitter 2 --loss 0.05
+"""
+
+
+import heapq
+import random
+import socket
+import struct
+from time import perf_counter_ns
+import numpy as np
+from .config import Actions, RollbackConfig
+from .simulation import Simulation
+
+
+# Primeiro frame e quantidade de ações da mensagem, seguidos de um byte por ação
+_INPUTS = struct.Struct('<IB')
+
+
+class LoopbackLink:
+    """
+    Ligação local entre duas sessões, com latência, variação e perda simuladas.
+
+    O tempo é medido em frames e avança com ``tick``, de forma que os testes são determinísticos.
+
+    Atributes:
+    ----------
+    now : int
+        Frame atual da ligação.
+    """
+
+    def __init__(self, latency: int = 0, jitter: int = 0, loss: float = 0.0, seed: int = 0):
+        """
+        Parameters
+        ----------
+        latency : int
+            Atraso de cada mensagem, em frames.
+        jitter : int
+            Atraso extra máximo, sorteado por mensagem (as mensagens podem chegar fora de ordem).
+        loss : float
+            Probabilidade de cada mensagem ser perdida.
+        seed : int
+            Semente do sorteio.
+        """
+        self.now = 0
+        self._latency = latency
+        self._jitter = jitter
+        self._loss = loss
+        self._random = random.Random(seed)
+        self._queues = ([], [])
+        self._count = 0
+
+    def endpoints(self) -> tuple:
+        """
+        As duas pontas da ligação, uma para cada sessão.
+        """
+        return _LoopbackEndpoint(self, 0), _LoopbackEndpoint(self, 1)
+
+    def tick(self):
+        """
+        Avança um frame.
+        """
+        self.now += 1
+
+    def _send(self, side: int, payload: bytes):
+        if self._random.random() < self._loss:
+            return
+        due = self.now + self._latency + self._random.randint(0, self._jitter)
+        self._count += 1
+        heapq.heappush(self._queues[1 - side], (due, self._count, payload))
+
+    def _receive(self, side: int) -> list:
+        queue = self._queues[side]
+        messages = []
+        while queue and queue[0][0] <= self.now:
+            messages.append(heapq.heappop(queue)[2])
+        return messages
+
+
+class _LoopbackEndpoint:
+    """
+    Uma ponta de ``LoopbackLink``.
+    """
+
+    def __init__(self, link: LoopbackLink, side: int):
+        self._link = link
+        self._side = side
+
+    def send(self, payload: bytes):
+        self._link._send(self._side, payload)
+
+    def receive(self) -> list:
+        return self._link._receive(self._side)
+
+
+class UdpTransport:
+    """
+    Transporte por UDP entre duas máquinas, sem bloquear o loop do jogo.
+    """
+
+    def __init__(self, peer: tuple, port: int = RollbackConfig.PORT):
+        """
+        Parameters
+        ----------
+        peer : tuple
+            Endereço (host, porta) da outra máquina.
+        port : int
+            Porta local.
+        """
+        self._peer = peer
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(('', port))
+        self._socket.setblocking(False)
+
+    def send(self, payload: bytes):
+        try:
+            self._socket.sendto(payload, self._peer)
+        except OSError:
+            pass
+
+    def receive(self) -> list:
+        messages = []
+        while True:
+            try:
+                messages.append(self._socket.recv(1024))
+            except (BlockingIOError, InterruptedError):
+                return messages
+            except OSError:
+                return messages
+
+    def close(self):
+        self._socket.close()
+
+
+class RollbackSession:
+    """
+    Avança uma ``Simulation`` com a ação local na hora e a remota prevista, corrigindo com rollback.
+
+    Atributes:
+    ----------
+    simulation : Simulation
+        A simulação local, com os dois jogadores.
+    slot : int
+        Posição do jogador local em ``Simulation.players``.
+    frame : int
+        Quantidade de frames simulados.
+    confirmed : int
+        Último frame até o qual todas as ações remotas já chegaram (-1 se nenhum).
+    rollbacks : list
+        Um par (frames simulados de novo, duração em nanossegundos) por rollback.
+    stalls : int
+        Frames em que a sessão esperou porque o outro jogador ficou para trás da janela de rollback.
+    mispredictions : int
+        Quantidade de vezes em que uma ação remota recebida era diferente da prevista.
+    advance_ns : list
+        Duração de cada frame avançado, incluindo os rollbacks, em nanossegundos.
+    """
+
+    def __init__(self, simulation: Simulation, slot: int, transport, max_rollback: int = RollbackConfig.MAX_ROLLBACK):
+        """
+        Parameters
+        ----------
+        simulation : Simulation
+            A simulação local.
+        slot : int
+            Posição do jogador local em ``Simulation.players``.
+        transport : object
+            Objeto com ``send(bytes)`` e ``receive() -> list``, como ``UdpTransport``.
+        max_rollback : int
+            Quantidade máxima de frames simulados de novo em um rollback.
+        """
+        self.simulation = simulation
+        self.slot = slot
+        self.transport = transport
+        self.max_rollback = max_rollback
+        self.frame = 0
+        self.confirmed = -1
+        self.rollbacks = []
+        self.stalls = 0
+        self.mispredictions = 0
+        self.advance_ns = []
+
+        # Estado no início de cada um dos últimos frames, indexado por frame % tamanho
+        self._snapshots = [None] * (max_rollback + 2)
+        self._local = {}
+        self._remote = {}
+        self._predicted = {}
+
+    def advance(self, action: int) -> bool:
+        """
+        Simula o próximo frame com a ação local.
+
+        Returns
+        -------
+        bool
+            False se o frame não pôde ser simulado porque faltam ações remotas
+            além da janela de rollback; a mesma ação deve ser tentada de novo no próximo frame.
+        """
+        start = perf_counter_ns()
+        if self.frame - self.confirmed > self.max_rollback:
+            self.synchronize()
+            if self.frame - self.confirmed > self.max_rollback:
+                self.stalls += 1
+                return False
+
+        self._local[self.frame] = action
+        self.__send()
+        self.__receive()
+
+        self.__simulate(self.frame)
+        self.frame += 1
+
+        # Ações e previsões fora da janela não são mais necessárias
+        old = self.frame - self.max_rollback - 2
+        self._local.pop(old, None)
+        self._predicted.pop(old, None)
+        if old < self.confirmed:
+            self._remote.pop(old, None)
+        self.advance_ns.append(perf_counter_ns() - start)
+        return True
+
+    def synchronize(self):
+        """
+        Reenvia as ações recentes e aplica as recebidas, sem avançar o frame.
+        """
+        self.__send()
+        self.__receive()
+
+    def __send(self):
+        """
+        Envia as ações locais da janela de rollback, até a do frame atual.
+        """
+        last = self.frame if self.frame in self._local else self.frame - 1
+        if last < 0:
+            return
+        first = max(0, last - self.max_rollback)
+        actions = bytes(self._local[frame] for frame in range(first, last + 1))
+        self.transport.send(_INPUTS.pack(first, len(actions)) + actions)
+
+    def __receive(self):
+        """
+        Guarda as ações remotas recebidas e faz rollback a partir da primeira prevista errado.
+        """
+        wrong = None
+        for message in self.transport.receive():
+            first, count = _INPUTS.unpack_from(message)
+            for offset, action in enumerate(message[_INPUTS.size:_INPUTS.size + count]):
+                frame = first + offset
+                if frame <= self.confirmed or frame in self._remote:
+                    continue
+                self._remote[frame] = action
+                if frame < self.frame and self._predicted.get(frame) != action:
+                    wrong = frame if wrong is None else min(wrong, frame)
+        while self.confirmed + 1 in self._remote:
+            self.confirmed += 1
+        if wrong is not None:
+            self.mispredictions += 1
+            self.__rollback(wrong)
+
+    def __remote_action(self, frame: int) -> int:
+        """
+        Ação remota do frame: a recebida, ou a última confirmada sem o pulo.
+        """
+        action = self._remote.get(frame)
+        if action is None:
+            action = self._remote.get(self.confirmed, Actions.NONE) & ~Actions.JUMP
+        self._predicted[frame] = action
+        return action
+
+    def __simulate(self, frame: int):
+        """
+        Guarda o estado do início do frame e o simula.
+        """
+        self._snapshots[frame % len(self._snapshots)] = self.simulation.snapshot()
+        actions = [Actions.NONE, Actions.NONE]
+        actions[self.slot] = self._local[frame]
+        actions[1 - self.slot] = self.__remote_action(frame)
+        self.simulation.step(actions)
+
+    def __rollback(self, frame: int):
+        """
+        Volta ao estado do início de ``frame`` e simula de novo até o frame atual.
+        """
+        start = perf_counter_ns()
+        current = self.frame
+        self.simulation.restore(self._snapshots[frame % len(self._snapshots)])
+        for replayed in range(frame, current):
+            self.__simulate(replayed)
+        self.rollbacks.append((current - frame, perf_counter_ns() - start))
+
+    def report(self) -> list:
+        """
+        Linhas de texto com a profundidade e o custo dos rollbacks.
+        """
+        lines = [f'jogador {self.slot}: {self.frame} frames, {len(self.rollbacks)} rollbacks, '
+                 f'{self.stalls} frames de espera']
+        if self.rollbacks:
+            depths = np.array([depth for depth, _ in self.rollbacks])
+            costs = np.array([cost for _, cost in self.rollbacks]) / 1e6
+            deepest = costs[depths == depths.max()]
+            lines.append(f'jogador {self.slot}: profundidade média {depths.mean():.1f}, máxima {depths.max()} '
+                         f'(custo {deepest.mean():.3f} ms); custo do rollback p50 {np.percentile(costs, 50):.3f} ms, '
+                         f'p99 {np.percentile(costs, 99):.3f} ms, máximo {costs.max():.3f} ms')
+        if self.advance_ns:
+            frames = np.array(self.advance_ns) / 1e6
+            lines.append(f'jogador {self.slot}: frame completo p50 {np.percentile(frames, 50):.3f} ms, '
+                         f'p99 {np.percentile(frames, 99):.3f} ms')
+        return lines
+
+
+def random_inputs(frames: int, seed: int) -> np.ndarray:
+    """
+    Ações de teste parecidas com as de uma pessoa: cada ação é mantida por alguns frames.
+    """
+    rng = np.random.default_rng(seed)
+    actions = np.empty(frames, dtype=np.uint8)
+    frame = 0
+    while frame < frames:
+        hold = int(rng.integers(5, 40))
+        actions[frame:frame + hold] = rng.choice((Actions.NONE, Actions.LEFT, Actions.RIGHT))
+        actions[frame] |= Actions.JUMP if rng.random() < 0.3 else Actions.NONE
+        frame += hold
+    return actions
+
+
+def loopback(level=None, frames: int = 3600, latency: int = 6, jitter: int = 0, loss: float = 0.0,
+             max_rollback: int = RollbackConfig.MAX_ROLLBACK, seed: int = 0) -> tuple:
+    """
+    Partida entre duas sessões pela ``LoopbackLink``, com ações de teste.
+
+    Returns
+    -------
+    tuple
+        As duas sessões e se os seus estados ficaram iguais depois de todas as ações chegarem.
+    """
+    link = LoopbackLink(latency, jitter, loss, seed)
+    sessions = [RollbackSession(Simulation(level), slot, endpoint, max_rollback)
+                for slot, endpoint in enumerate(link.endpoints())]
+    inputs = [random_inputs(frames, seed + slot + 1) for slot in range(len(sessions))]
+
+    while any(session.frame < frames for session in sessions):
+        for session, session_inputs in zip(sessions, inputs):
+            if session.frame < frames:
+                session.advance(int(session_inputs[session.frame]))
+        link.tick()
+
+    # Entrega as últimas ações e confere se as duas máquinas chegaram ao mesmo estado
+    for _ in range(4 * (latency + jitter) + 10):
+        for session in sessions:
+            session.synchronize()
+        link.tick()
+    states = [session.simulation.snapshot() for session in sessions]
+    return sessions, states[0] == states[1]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Testa o rollback com latência simulada.')
+    parser.add_argument('level', nargs='?', help='nome da fase (padrão: a fase padrão)')
+    parser.add_argument('--frames', type=int, default=3600, help='frames simulados por cada jogador')
+    parser.add_argument('--latency', type=int, default=6, help='atraso de cada mensagem, em frames')
+    parser.add_argument('--jitter', type=int, default=0, help='atraso extra máximo, em frames')
+    parser.add_argument('--loss', type=float, default=0.0, help='probabilidade de perder cada mensagem')
+    parser.add_argument('--max-rollback', type=int, default=RollbackConfig.MAX_ROLLBACK)
+    args = parser.parse_args()
+
+    level = None
+    if args.level:
+        from .level import load_level
+        level = load_level(args.level)
+    sessions, synced = loopback(level, args.frames, args.latency, args.jitter, args.loss, args.max_rollback)
+    for session in sessions:
+        print('\n'.join(session.report()))
+    print(f'estados iguais no fim: {synced}')
@@ -0,0 +1,132 @@
+"""
+Módulo responsável pela sequência de telas (cenas) do jogo.
+
+O ``SceneManager`` guarda a cena atual e decide a próxima de forma explícita
+quando ela termina: a tela inicial leva ao jogo, o jogo à tela de fim, e a
+tela de fim volta ao jogo ou à tela inicial.
+
+Enquanto uma cena roda, a cena que provavelmente vem depois (``PREDICTIONS``)
+é preparada em uma thread auxiliar com ``Screen.preload``: a fase é lida, as
+imagens são carregadas no tamanho usado e a música começa a ser decodificada.
+Assim a troca de cena só precisa montar o que depende da tela, dentro do tempo
+de um frame. Se a preparação falhar, a cena é preparada de novo, sem pressa,
+pelo próprio ``set_screen``.
+"""
+
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from .config import ScreenSettings
+
+
+# Nomes das cenas
+INITIAL = 'initial'
+GAME = 'game'
+END = 'end'
+
+# Cena de cada valor de ``phase_to_go`` devolvido pelo jogo e pela tela de fim
+PHASES = (INITIAL, GAME, END)
+
+# Cena mais provável depois de cada cena, preparada enquanto ela roda
+PREDICTIONS = {INITIAL: GAME, GAME: END, END: GAME}
+
+
+class SceneManager:
+    """
+    Sequência de cenas, com as trocas entre elas e a preparação antecipada da próxima.
+
+    Atributes:
+    ----------
+    scenes : dict
+        Associa o nome de cada cena à tela (``Screen``) correspondente.
+    current : str
+        Nome da cena que roda, ou None antes de começar e depois que a janela é fechada.
+    transitions : list
+        Uma entrada por troca de cena: cena anterior, cena seguinte, tempo
+        esperando a preparação antecipada terminar e tempo total da troca, em
+        milissegundos, e o erro da preparação antecipada (ou None).
+    """
+
+    def __init__(self, scenes: dict, predictions: dict = PREDICTIONS):
+        """
+        Parameters
+        ----------
+        scenes : dict
+            Associa o nome de cada cena à tela correspondente.
+        predictions : dict
+            Associa cada cena à cena preparada enquanto ela roda.
+        """
+        self.scenes = scenes
+        self.predictions = predictions
+        self.current = None
+        self.transitions = []
+        self._preloads = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scenes')
+
+    def preload(self, name: str):
+        """
+        Agenda a preparação de uma cena na thread auxiliar, sem esperar por ela.
+        """
+        if name not in self._preloads:
+            self._preloads[name] = self._executor.submit(self.scenes[name].preload)
+
+    def run(self, first: str = INITIAL):
+        """
+        Roda as cenas a partir de ``first`` até que a janela seja fechada.
+        """
+        self.current = first
+        previous = None
+        try:
+            while self.current is not None:
+                name = self.current
+                scene = self.scenes[name]
+
+                # Espera a preparação antecipada (se houver) e monta a cena; se a
+                # preparação falhou, ``set_screen`` carrega o que faltar
+                start = perf_counter()
+                future = self._preloads.pop(name, None)
+                error = None
+                if future is not None:
+                    try:
+                        future.result()
+                    except Exception as exception:
+                        error = exception
+                waited = perf_counter() - start
+                scene.set_screen()
+                self.transitions.append((previous, name, waited * 1000, (perf_counter() - start) * 1000, error))
+
+                if name in self.predictions:
+                    self.preload(self.predictions[name])
+                scene.run()
+                previous = name
+                self.__transition(name, scene)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __transition(self, name: str, scene):
+        """
+        Decide a próxima cena depois que ``scene`` terminou.
+        """
+        if not scene.running:
+            self.current = None
+        elif name == INITIAL:
+            self.current = GAME
+        elif name == GAME:
+            # A tela de fim mostra o resultado da partida
+            self.scenes[END].setresult(scene.result)
+            self.current = PHASES[scene.phase_to_go]
+        else:
+            self.current = PHASES[scene.phase_to_go]
+
+    def report(self) -> list:
+        """
+        Linhas de texto com o tempo de cada troca de cena, comparado ao tempo de um frame.
+        """
+        frame_ms = 1000 / ScreenSettings.FPS
+        lines = []
+        for previous, name, waited, total, error in self.transitions:
+            status = 'ok' if total <= frame_ms else 'acima de um frame'
+            if error is not None:
+                status += f'; preparação falhou ({error})'
+            lines.append(f'{previous or "-"} -> {name}: {total:.1f} ms ({waited:.1f} ms esperando a preparação, {status})')
+        return lines
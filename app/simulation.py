@@ -0,0 +1,186 @@
+"""
+Módulo responsável pela simulação da fase sem depender da tela, do relógio ou do som.
+
+A ``Simulation`` avança a lógica do jogo um frame de cada vez a partir das ações
+de cada jogador, então pode rodar tão rápido quanto a CPU permitir. A tela
+``Game`` apenas traduz o teclado em ações e desenha o estado da simulação.
+"""
+
+
+import pygame
+from math import dist
+from .tiles import TileMap
+from .level import Level, load_level
+from .player import Player
+
+
+class Simulation:
+    """
+    Estado e regras de uma fase, avançados em passos fixos de um frame.
+
+    Atributes:
+    ----------
+    level : Level
+        A fase simulada.
+    tile_grid : TileMap
+        Grade de tiles da fase, usada nas colisões e no desenho.
+    watergirl : Player
+        A personagem Watergirl.
+    fireboy : Player
+        O personagem Fireboy.
+    players : list
+        Os jogadores, na ordem em que suas ações são passadas para ``step``.
+    firedoor : pygame.Rect
+        Porta que o Fireboy precisa alcançar.
+    waterdoor : pygame.Rect
+        Porta que a Watergirl precisa alcançar.
+    frame : int
+        Quantidade de frames simulados desde o início da fase (um passo de ``dt`` conta ``dt`` frames).
+    running_phase : bool
+        Indica se a fase ainda está em andamento.
+    result : str
+        Resultado da fase ('win' ou 'lost'), ou None enquanto ela estiver em andamento.
+    """
+
+    def __init__(self, level=None, fireboy_img: pygame.Surface = None, watergirl_img: pygame.Surface = None):
+        """
+        Monta a simulação de uma fase.
+
+        Parameters
+        ----------
+        level : Level or list, optional
+            A fase, ou uma matriz no formato de ``Map.MAP``. Se None, carrega a fase padrão.
+        fireboy_img : pygame.Surface, optional
+            Imagem do Fireboy. Se None, o jogador não pode ser desenhado.
+        watergirl_img : pygame.Surface, optional
+            Imagem da Watergirl. Se None, a jogadora não pode ser desenhada.
+        """
+        if level is None:
+            level = load_level()
+        elif not isinstance(level, Level):
+            level = Level.from_map(level)
+        self.level = level
+        self.tile_grid = TileMap(level.tiles, level.tile_size)
+
+        self.fireboy = Player(fireboy_img, *level.fireboy_spawn, self.tile_grid, 'fire')
+        self.watergirl = Player(watergirl_img, *level.watergirl_spawn, self.tile_grid, 'water')
+        self.players = [self.watergirl, self.fireboy]
+
+        # Portas da vitória
+        self.firedoor = pygame.Rect(level.firedoor)
+        self.waterdoor = pygame.Rect(level.waterdoor)
+
+        self.frame = 0
+        self.running_phase = True
+        self.result = None
+        self._countwaterwin = 0
+        self._countfirewin = 0
+
+        # Estado inicial, usado para recomeçar a fase sem montá-la de novo
+        self._initial = self.snapshot()
+
+    def snapshot(self) -> tuple:
+        """
+        Guarda o estado mutável da fase (frame, resultado, contadores e jogadores) em uma tupla.
+
+        A fase, os tiles e as portas não mudam durante a simulação, então não fazem parte do estado.
+        """
+        return (self.frame, self.running_phase, self.result, self._countwaterwin, self._countfirewin,
+                tuple(player.snapshot() for player in self.players))
+
+    def restore(self, snapshot: tuple):
+        """
+        Volta ao estado guardado por ``snapshot``.
+        """
+        self.frame, self.running_phase, self.result, self._countwaterwin, self._countfirewin, players = snapshot
+        for player, player_snapshot in zip(self.players, players):
+            player.restore(player_snapshot)
+
+    def reset(self):
+        """
+        Recomeça a fase do estado inicial.
+        """
+        self.restore(self._initial)
+
+    def step(self, actions=(0, 0), dt: int = 1):
+        """
+        Avança a simulação em um passo, de um frame ou mais.
+
+        Parameters
+        ----------
+        actions : sequence
+            As ações (bits de ``Actions``) de cada jogador, na ordem de ``players``.
+        dt : int
+            Duração do passo, em frames. Passos longos são varridos em subpassos
+            pelos jogadores, então servem para simular com menos passos por segundo.
+
+        Returns
+        -------
+        bool
+            True se a fase continua em andamento, False caso contrário.
+        """
+        for player, player_actions in zip(self.players, actions):
+            player.apply_actions(player_actions)
+        for player in self.players:
+            player.update(dt)
+        self.frame += dt
+
+        self.__gameover()
+        self.__win()
+        return self.running_phase
+
+    def run(self, inputs, max_frames: int = None, dt: int = 1) -> int:
+        """
+        Simula vários passos seguidos, o mais rápido possível.
+
+        Parameters
+        ----------
+        inputs : iterable
+            Sequência com as ações de cada passo, no formato aceito por ``step``.
+        max_frames : int, optional
+            Limite de passos a simular.
+        dt : int
+            Duração de cada passo, em frames.
+
+        Returns
+        -------
+        int
+            Quantidade de passos simulados. Para antes do fim das entradas se a fase terminar.
+        """
+        frames = 0
+        for actions in inputs:
+            if max_frames is not None and frames >= max_frames:
+                break
+            frames += 1
+            if not self.step(actions, dt):
+                break
+        return frames
+
+    def __gameover(self):
+        """
+        Verifica se algum jogador morreu.
+        """
+        for player in self.players:
+            if not player.life:
+                self.running_phase = False
+                self.result = 'lost'
+
+    def __win(self):
+        """
+        Verifica se houve vitória, com base na distância euclidiana entre o
+        personagem e a porta da vitória.
+        """
+        coord_watergirl = (self.watergirl.rect.x, self.watergirl.rect.y)
+        coord_waterdoor = (self.waterdoor.x, self.waterdoor.y)
+        coord_fireboy = (self.fireboy.rect.x, self.fireboy.rect.y)
+        coord_firedoor = (self.firedoor.x, self.firedoor.y)
+
+        if dist(coord_watergirl, coord_waterdoor) < 5:
+            self._countwaterwin += 1
+        if dist(coord_fireboy, coord_firedoor) < 5:
+            self._countfirewin += 1
+        if self._countwaterwin or self._countfirewin >= 1:
+            self.running_phase = False
+            self.result = 'win'
+            self._countwaterwin = 0
+            self._countfirewin = 0
@@ -0,0 +1,291 @@
+"""
+Módulo responsável por verificar se uma fase pode ser terminada.
+
+O ``solve`` faz uma busca em largura sobre o estado de cada jogador (posição,
+velocidade vertical, estado e ``highest_y``), aplicando as mesmas regras de
+movimento de ``Player`` por meio do ``PlayerBatch``: cada camada da busca é um
+frame, e todos os estados da fronteira são expandidos de uma vez, com todas as
+ações possíveis. Estados repetidos são descartados com um conjunto de estados
+visitados, e fronteiras grandes são divididas entre processos. Como a busca é em
+largura, o primeiro estado que chega à porta usa o menor número de frames, e o
+caminho até ele vira a sequência de entradas de exemplo (que pode ser gravada
+como replay).
+
+Uso pela linha de comando::
+
+    python -m app.solver level1 --witness solucao.fwr
+"""
+
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from .config import Actions, SolverConfig
+from .batch import PlayerBatch, STILL, ELEMENT_CODES
+from .level import Level, load_level
+from .simulation import Simulation
+
+
+# Ações distintas de um frame (esquerda e direita juntas equivalem a nenhuma)
+_ACTIONS = np.array([Actions.NONE, Actions.LEFT, Actions.RIGHT,
+                     Actions.JUMP, Actions.LEFT | Actions.JUMP, Actions.RIGHT | Actions.JUMP], dtype=np.int8)
+
+# Deslocamento somado às coordenadas para que caibam, sem sinal, em 16 bits da chave
+_OFFSET = 1024
+_COORD_LIMIT = (1 << 16) - _OFFSET
+
+# Grade da fase em cada processo auxiliar, enviada uma única vez
+_worker_grid = None
+
+
+class PlayerSolution:
+    """
+    Resultado da busca para um jogador.
+
+    Atributes:
+    ----------
+    element : str
+        Elemento do jogador ('fire' ou 'water').
+    frames : int
+        Menor quantidade de frames para chegar à porta, ou None se ela não for alcançável.
+    actions : list
+        Ações do jogador em cada frame do caminho mais curto.
+    explored : int
+        Quantidade de estados distintos visitados.
+    """
+
+    def __init__(self, element: str, frames: int, actions: list, explored: int):
+        self.element = element
+        self.frames = frames
+        self.actions = actions
+        self.explored = explored
+
+    @property
+    def reachable(self) -> bool:
+        return self.frames is not None
+
+
+class SolverResult:
+    """
+    Resultado da verificação de uma fase.
+
+    Atributes:
+    ----------
+    level_id : str
+        Identificador da fase.
+    players : dict
+        ``PlayerSolution`` de cada elemento.
+    solvable : bool
+        Indica se a fase pode ser vencida pelas regras de ``Simulation``.
+    frames : int
+        Menor quantidade de frames de uma vitória, ou None.
+    witness : list
+        Ações dos dois jogadores (na ordem de ``Simulation.players``) em cada frame da vitória mais curta.
+    elapsed : float
+        Duração da busca, em segundos.
+    """
+
+    def __init__(self, level_id: str, players: dict, frames: int, witness: list, elapsed: float):
+        self.level_id = level_id
+        self.players = players
+        self.frames = frames
+        self.witness = witness
+        self.elapsed = elapsed
+
+    @property
+    def solvable(self) -> bool:
+        return self.frames is not None
+
+    def save_witness(self, filename: str, seed: int = 0):
+        """
+        Grava a vitória mais curta como um replay.
+        """
+        from .replay import InputRecorder
+
+        recorder = InputRecorder(self.level_id, seed, 2)
+        for actions in self.witness:
+            recorder.record(actions)
+        recorder.save(filename)
+
+
+def _keys(states: np.ndarray) -> np.ndarray:
+    """
+    Empacota cada estado (x, y, speedy, estado, highest_y) em um inteiro de 64 bits.
+    """
+    x, y, speedy, state, highest_y = (states[:, column].astype(np.int64) for column in range(5))
+    return ((x + _OFFSET) << 42) | ((y + _OFFSET) << 26) | ((highest_y + _OFFSET) << 10) | ((speedy + 128) << 2) | state
+
+
+def _expand(grid, element: int, tile_size: int, door: tuple, states: np.ndarray) -> tuple:
+    """
+    Aplica cada ação possível a cada estado e avança um frame.
+
+    Returns
+    -------
+    tuple
+        Estados filhos vivos, índice do estado pai de cada um, ação usada e
+        quais deles alcançaram a porta.
+    """
+    parents = np.repeat(np.arange(len(states)), len(_ACTIONS))
+    actions = np.tile(_ACTIONS, len(states))
+
+    # Pular só muda algo para quem está parado
+    useful = ((actions & Actions.JUMP) == 0) | (states[parents, 3] == STILL)
+    parents, actions = parents[useful], actions[useful]
+
+    batch = PlayerBatch(grid, np.full(len(parents), element), 0, 0, tile_size)
+    children = states[parents]
+    batch.x[:], batch.y[:], batch.speedy[:], batch.highest_y[:] = children[:, 0], children[:, 1], children[:, 2], children[:, 4]
+    batch.state[:] = children[:, 3]
+    batch.step(actions)
+
+    # Mesmo teste de vitória de Simulation: canto do jogador a menos de 5 pixels do canto da porta
+    goal = batch.life & (np.hypot(batch.x - door[0], batch.y - door[1]) < 5)
+    alive = batch.life & (batch.health > 0)
+    result = np.stack([batch.x, batch.y, batch.speedy, batch.state, batch.highest_y], axis=1).astype(np.int32)
+    return result[alive], parents[alive], actions[alive], goal[alive]
+
+
+def _init_worker(grid):
+    global _worker_grid
+    _worker_grid = grid
+
+
+def _expand_in_worker(args):
+    return _expand(_worker_grid, *args)
+
+
+def search(level: Level, element: str, max_frames: int = SolverConfig.MAX_FRAMES,
+           executor: ProcessPoolExecutor = None, chunk: int = SolverConfig.CHUNK) -> PlayerSolution:
+    """
+    Busca em largura o caminho mais curto de um jogador até a sua porta.
+
+    Parameters
+    ----------
+    level : Level
+        A fase.
+    element : str
+        Elemento do jogador ('fire' ou 'water').
+    max_frames : int
+        Profundidade máxima da busca, em frames.
+    executor : ProcessPoolExecutor, optional
+        Processos que expandem as fronteiras com mais de ``chunk`` estados.
+    chunk : int
+        Quantidade de estados enviados de uma vez a cada processo.
+    """
+    if max(level.columns, level.rows + 2) * level.tile_size >= _COORD_LIMIT:
+        raise ValueError(f'fase grande demais para o solver ({level.columns}x{level.rows})')
+
+    spawn = level.fireboy_spawn if element == 'fire' else level.watergirl_spawn
+    door = level.firedoor if element == 'fire' else level.waterdoor
+    code = ELEMENT_CODES[element]
+    start = PlayerBatch(level.tiles, [code], [spawn[0]], [spawn[1]], level.tile_size)
+    frontier = np.array([[start.x[0], start.y[0], 0, STILL, start.highest_y[0]]], dtype=np.int32)
+
+    visited = set(_keys(frontier).tolist())
+    layers = []
+    for frame in range(1, max_frames + 1):
+        if executor is not None and len(frontier) > chunk:
+            parts = [(code, level.tile_size, door, frontier[index:index + chunk])
+                     for index in range(0, len(frontier), chunk)]
+            children, parents, actions, goal = [], [], [], []
+            for index, part in zip(range(0, len(frontier), chunk), executor.map(_expand_in_worker, parts)):
+                children.append(part[0])
+                parents.append(part[1] + index)
+                actions.append(part[2])
+                goal.append(part[3])
+            children, parents, actions, goal = (np.concatenate(values) for values in (children, parents, actions, goal))
+        else:
+            children, parents, actions, goal = _expand(level.tiles, code, level.tile_size, door, frontier)
+
+        # Descarta os repetidos dentro da camada e os já visitados
+        keys = _keys(children)
+        keys, first = np.unique(keys, return_index=True)
+        new = np.fromiter((key not in visited for key in keys.tolist()), dtype=bool, count=len(keys))
+        first = first[new]
+        visited.update(keys[new].tolist())
+        children, parents, actions, goal = children[first], parents[first], actions[first], goal[first]
+
+        layers.append((parents, actions))
+        if goal.any():
+            return PlayerSolution(element, frame, _path(layers, int(goal.argmax())), len(visited))
+        if not len(children):
+            break
+        frontier = children
+    return PlayerSolution(element, None, [], len(visited))
+
+
+def _path(layers: list, index: int) -> list:
+    """
+    Reconstrói as ações desde o início até o estado ``index`` da última camada.
+    """
+    actions = []
+    for parents, layer_actions in reversed(layers):
+        actions.append(int(layer_actions[index]))
+        index = parents[index]
+    return actions[::-1]
+
+
+def solve(level=None, max_frames: int = SolverConfig.MAX_FRAMES, processes: int = SolverConfig.PROCESSES) -> SolverResult:
+    """
+    Verifica se a fase pode ser vencida e encontra a vitória mais curta.
+
+    Cada jogador é buscado separadamente, já que um não interfere no movimento
+    do outro. Pelas regras de ``Simulation`` a fase termina em vitória quando
+    qualquer jogador chega à sua porta sem que nenhum tenha morrido, então a
+    vitória mais curta é a do jogador mais rápido, com o outro parado. Ela é
+    conferida rodando a ``Simulation`` com as entradas encontradas.
+
+    Parameters
+    ----------
+    level : Level or str, optional
+        A fase ou o nome dela. Se None, a fase padrão.
+    max_frames : int
+        Profundidade máxima da busca, em frames.
+    processes : int
+        Quantidade de processos auxiliares (None para um por CPU, 0 para nenhum).
+    """
+    if level is None or isinstance(level, str):
+        level = load_level(level) if level else load_level()
+
+    start = perf_counter()
+    executor = ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(level.tiles,)) if processes != 0 else None
+    try:
+        players = {element: search(level, element, max_frames, executor) for element in ('water', 'fire')}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    frames, witness = None, []
+    for element in ('water', 'fire'):
+        solution = players[element]
+        if not solution.reachable or (frames is not None and solution.frames >= frames):
+            continue
+        # O outro jogador fica parado
+        candidate = [(actions, Actions.NONE) if element == 'water' else (Actions.NONE, actions)
+                     for actions in solution.actions]
+        simulation = Simulation(level)
+        simulation.run(candidate)
+        if simulation.result == 'win':
+            frames, witness = simulation.frame, candidate
+    return SolverResult(level.name, players, frames, witness, perf_counter() - start)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verifica se uma fase pode ser terminada.')
+    parser.add_argument('level', nargs='?', help='nome da fase (padrão: a fase padrão)')
+    parser.add_argument('--max-frames', type=int, default=SolverConfig.MAX_FRAMES, help='profundidade máxima da busca')
+    parser.add_argument('--processes', type=int, default=SolverConfig.PROCESSES, help='processos auxiliares (0 para nenhum)')
+    parser.add_argument('--witness', help='arquivo .fwr onde gravar a vitória mais curta')
+    args = parser.parse_args()
+
+    result = solve(args.level, args.max_frames, args.processes)
+    for element, solution in result.players.items():
+        frames = solution.frames if solution.reachable else 'inalcançável'
+        print(f'{element}: {frames} frames até a porta ({solution.explored} estados visitados)')
+    print(f'{"possível" if result.solvable else "impossível"} de vencer'
+          + (f' em {result.frames} frames' if result.solvable else '') + f' ({result.elapsed:.2f} s)')
+    if args.witness and result.solvable:
+        result.save_witness(args.witness)
@@ -1,5 +1,7 @@
+import numpy as np
 import pygame
-from .config import TilesConfig
+from .config import Map, TilesConfig
+from .collision import TileGrid
 
 
 class Tiles(pygame.sprite.Sprite):
@@ -26,8 +28,10 @@ class Tiles(pygame.sprite.Sprite):
         # Construtor da classe pai (Sprite).
         pygame.sprite.Sprite.__init__(self)
 
-        # Define a imagem do tile.
-        self.image = pygame.transform.scale(tile_img, (tile_size, tile_size))
+        # Define a imagem do tile. Imagens já no tamanho certo (vindas do atlas) são compartilhadas.
+        if tile_img.get_size() != (tile_size, tile_size):
+            tile_img = pygame.transform.scale(tile_img, (tile_size, tile_size))
+        self.image = tile_img
         
         # Detalhes sobre o tile para tratar colisão.
         self.rect = self.image.get_rect()
@@ -46,4 +50,134 @@ class Tiles(pygame.sprite.Sprite):
         Returns:
         - bool: True se houver colisão e False se não houver colisão.
         """
-        return self.rect.colliderect(other_sprite.rect)
\ No newline at end of file
+        return self.rect.colliderect(other_sprite.rect)
+
+class TileMap(TileGrid):
+    """
+    Mapa de tiles guardado apenas como a grade de tipos, sem um sprite por tile.
+
+    Substitui os objetos ``Tiles`` e seus grupos: as colisões vêm de ``TileGrid``,
+    os retângulos são calculados só quando pedidos e o desenho percorre apenas as
+    células visíveis. Cada célula ocupa um byte, então um mapa 1000x1000 cabe em 1 MB.
+
+    Atributes:
+    ----------
+    grid : numpy.ndarray
+        Matriz int8 (linhas, colunas) com o tipo de cada célula, sem cópia da grade original.
+    """
+
+    def __init__(self, grid, tile_size: int = TilesConfig.TILE_SIZE):
+        """
+        Parameters
+        ----------
+        grid : list or numpy.ndarray
+            Matriz no formato de ``Map.MAP``, ou matriz int8 contígua (como ``Level.tiles``).
+        tile_size : int
+            Tamanho, em pixels, de cada célula.
+        """
+        super().__init__(grid, tile_size)
+        self.grid = np.frombuffer(self._cells, dtype=np.int8).reshape(self.rows, self.columns)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memória ocupada pela grade, em bytes.
+        """
+        return self.grid.nbytes
+
+    def rect(self, row: int, column: int) -> pygame.Rect:
+        """
+        Retângulo da célula, em coordenadas do mundo.
+        """
+        return pygame.Rect(column * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size)
+
+    def cells(self, tile_type: int = None, area: pygame.Rect = None) -> tuple:
+        """
+        Linhas e colunas das células não vazias, em ordem linha a linha.
+
+        Parameters
+        ----------
+        tile_type : int, optional
+            Se informado, só as células deste tipo.
+        area : pygame.Rect, optional
+            Se informada, só as células que tocam esta área do mundo.
+
+        Returns
+        -------
+        tuple
+            Dois arrays: as linhas e as colunas das células.
+        """
+        first_row = first_column = 0
+        grid = self.grid
+        if area is not None:
+            size = self.tile_size
+            first_row = max(area.top // size, 0)
+            first_column = max(area.left // size, 0)
+            grid = grid[first_row:max((area.bottom - 1) // size + 1, first_row),
+                        first_column:max((area.right - 1) // size + 1, first_column)]
+        rows, columns = ((grid != Map.EMPTY) if tile_type is None else (grid == tile_type)).nonzero()
+        return rows + first_row, columns + first_column
+
+    def count(self, tile_type: int) -> int:
+        """
+        Quantidade de tiles do tipo informado.
+        """
+        return int(np.count_nonzero(self.grid == tile_type))
+
+    def layer(self, tile_type: int):
+        """
+        Visão dos tiles de um tipo, usada no lugar de um grupo de sprites.
+        """
+        return TileLayer(self, tile_type)
+
+    def draw(self, surface: pygame.Surface, assets, area: pygame.Rect = None):
+        """
+        Desenha os tiles que aparecem na área do mundo informada.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            Onde desenhar; o canto superior esquerdo de ``area`` vai para a origem da superfície.
+        assets : AssetManager
+            De onde vêm as imagens dos tiles, já escaladas para o tamanho da célula.
+        area : pygame.Rect, optional
+            Área do mundo desenhada. Se None, a do tamanho da superfície a partir da origem do mundo.
+        """
+        if area is None:
+            area = surface.get_rect()
+        size = self.tile_size
+        rows, columns = self.cells(area=area)
+        types = self.grid[rows, columns].tolist()
+        surface.blits([(assets.scaled(tile_type, (size, size)), (column * size - area.x, row * size - area.y))
+                       for tile_type, row, column in zip(types, rows.tolist(), columns.tolist())], doreturn=False)
+
+
+class TileLayer:
+    """
+    Tiles de um único tipo de um ``TileMap``, com os retângulos calculados sob demanda.
+
+    Atributes:
+    ----------
+    tile_map : TileMap
+        O mapa de onde os tiles vêm.
+    tile_type : int
+        O tipo de tile (por exemplo ``Map.BLOCK``).
+    """
+
+    def __init__(self, tile_map: TileMap, tile_type: int):
+        self.tile_map = tile_map
+        self.tile_type = tile_type
+
+    def __len__(self) -> int:
+        return self.tile_map.count(self.tile_type)
+
+    def __iter__(self):
+        rows, columns = self.tile_map.cells(self.tile_type)
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            yield self.tile_map.rect(row, column)
+
+    def collide(self, rect: pygame.Rect) -> list:
+        """
+        Retângulos dos tiles deste tipo que colidem com o retângulo.
+        """
+        return [tile_rect for _, tile_rect in self.tile_map.collide(rect, (self.tile_type,))]